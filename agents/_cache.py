@@ -0,0 +1,343 @@
+"""
+Response caching.
+
+ResponseCache serves the coordinator, with two tiers, both scoped to a
+session and to its history epoch:
+1. Exact match on sha256(session_id + epoch + normalized query), held in
+   a bounded in-memory LRU and persisted in the session store so hits
+   survive restarts.
+2. Semantic match (opt-in, RESPONSE_CACHE_EMBEDDINGS): on an exact miss
+   the query is embedded and compared (cosine) against the queries cached
+   in the same session since the epoch began.
+
+Only questions are cached. Statements ("my name is Bob") and queries that
+look like tool actions ("review PR #42", "triage issue 7") always reach
+the agent, since their answer depends on, or changes, the conversation.
+Every such turn starts a new history epoch, so answers cached before it
+are never replayed after it.
+
+LLMCache is the deterministic answer cache of the triage and PR review
+helpers: entries are keyed on the inputs that fully determine an answer
+(item identity, its revision, and the prompt version), so a hit can be
+returned without running the agent at all.
+
+SingleFlight covers the window before an answer is cached: concurrent
+calls for the same key (e.g. two webhooks for one issue) share the first
+call's result instead of each running the agent.
+"""
+
+import asyncio
+import hashlib
+import math
+import re
+import time
+from array import array
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+
+from config.settings import get_settings
+from observability.logger import get_logger
+from agents._llm import embed_text
+from agents._store import SessionStore, get_session_store
+
+settings = get_settings()
+logger = get_logger("ResponseCache")
+
+T = TypeVar("T")
+
+
+# Anything referencing an issue/PR number or an action verb goes to the agent
+_TOOL_INTENT_RE = re.compile(
+    r"#\s*\d+"
+    r"|\b(?:review|triage|label|labels|comment|post|apply|update|improve)\b",
+    re.IGNORECASE
+)
+
+# Questions: a trailing "?" or a leading interrogative
+_QUESTION_RE = re.compile(
+    r"\?\s*$"
+    r"|^\s*(?:what|which|who|whose|when|where|why|how|can|could|do|does|is|are)\b",
+    re.IGNORECASE
+)
+
+# Expired rows are deleted from the store at most this often
+_PURGE_INTERVAL_S = 600.0
+
+
+class CacheLookup(NamedTuple):
+    """Result of a cache lookup; carries what `put` needs on a miss."""
+    key: str
+    response: Optional[str]
+    embedding: Optional[List[float]]
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case and collapse whitespace so trivial variants share a key."""
+    return " ".join(query.lower().split())
+
+
+def _unit(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class ResponseCache:
+    """
+    Session-scoped exact + semantic response cache.
+
+    Store reads and writes run in a worker thread so the SQLite round trip
+    never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        ttl_seconds: Optional[float] = None,
+        similarity_threshold: Optional[float] = None,
+        use_embeddings: Optional[bool] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            store: Session store used for persistence
+            ttl_seconds: Entry lifetime (defaults to RESPONSE_CACHE_TTL_S)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            use_embeddings: Whether to enable the semantic tier
+            max_entries: In-memory entry limit (defaults to RESPONSE_CACHE_MAXSIZE)
+        """
+        self.store = store
+        self.enabled = settings.RESPONSE_CACHE_ENABLED
+        self.ttl_seconds = (
+            settings.RESPONSE_CACHE_TTL_S if ttl_seconds is None else ttl_seconds
+        )
+        self.similarity_threshold = (
+            settings.RESPONSE_CACHE_SIMILARITY
+            if similarity_threshold is None else similarity_threshold
+        )
+        self.use_embeddings = (
+            settings.RESPONSE_CACHE_EMBEDDINGS
+            if use_embeddings is None else use_embeddings
+        )
+        self.max_entries = (
+            settings.RESPONSE_CACHE_MAXSIZE if max_entries is None else max_entries
+        )
+        # key -> (response, expires_at), least recently used first
+        self._exact: Dict[str, Tuple[str, float]] = {}
+        self._next_purge = 0.0
+
+    @staticmethod
+    def is_cacheable(query: str) -> bool:
+        """Return True only for questions that cannot trigger a side effect."""
+        return bool(_QUESTION_RE.search(query)) and not _TOOL_INTENT_RE.search(query)
+
+    @staticmethod
+    def make_key(session_id: str, epoch: int, query: str) -> str:
+        """Build the exact-match cache key."""
+        raw = f"{session_id}\x00{epoch}\x00{normalize_query(query)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, response: str, expires_at: float) -> None:
+        self._exact.pop(key, None)
+        while len(self._exact) >= self.max_entries:
+            del self._exact[next(iter(self._exact))]
+        self._exact[key] = (response, expires_at)
+
+    async def get(self, session_id: str, query: str) -> CacheLookup:
+        """
+        Look up a cached response.
+
+        Args:
+            session_id: Session identifier
+            query: User query
+
+        Returns:
+            CacheLookup; `response` is None on a miss
+        """
+        epoch, epoch_started = await asyncio.to_thread(
+            self.store.get_history_epoch, session_id
+        )
+        key = self.make_key(session_id, epoch, query)
+        now = time.time()
+
+        # Tier 1: exact match (memory, then disk)
+        hit = self._exact.pop(key, None)
+        if hit and hit[1] > now:
+            self._exact[key] = hit  # re-insert as most recently used
+            return CacheLookup(key, hit[0], None)
+
+        row = await asyncio.to_thread(self.store.get_cached_response, key)
+        if row and row["ts"] + self.ttl_seconds > now:
+            self._remember(key, row["response"], row["ts"] + self.ttl_seconds)
+            return CacheLookup(key, row["response"], None)
+
+        if not self.use_embeddings:
+            return CacheLookup(key, None, None)
+
+        # Tier 2: semantic match within the session's current epoch
+        try:
+            embedding = _unit(await embed_text(normalize_query(query)))
+        except Exception as e:
+            logger.warning(f"Query embedding failed, skipping semantic tier: {e}")
+            return CacheLookup(key, None, None)
+
+        candidates = await asyncio.to_thread(
+            self.store.get_cached_embeddings,
+            session_id, max(now - self.ttl_seconds, epoch_started)
+        )
+        best_score, best_response = 0.0, None
+        for blob, response in candidates:
+            candidate = array("f")
+            candidate.frombytes(blob)
+            score = sum(a * b for a, b in zip(embedding, candidate))
+            if score > best_score:
+                best_score, best_response = score, response
+
+        if best_response is not None and best_score >= self.similarity_threshold:
+            logger.debug("Semantic cache hit", session_id=session_id, score=best_score)
+            return CacheLookup(key, best_response, embedding)
+
+        return CacheLookup(key, None, embedding)
+
+    async def put(self, session_id: str, lookup: CacheLookup, response: str) -> None:
+        """
+        Store a response for a previously missed lookup.
+
+        Args:
+            session_id: Session identifier
+            lookup: The miss returned by `get`
+            response: Response text to cache
+        """
+        now = time.time()
+        self._remember(lookup.key, response, now + self.ttl_seconds)
+
+        blob = None
+        if lookup.embedding is not None:
+            blob = array("f", lookup.embedding).tobytes()
+        await asyncio.to_thread(
+            self.store.put_cached_response, lookup.key, session_id, blob, response
+        )
+
+        if now >= self._next_purge:
+            self._next_purge = now + _PURGE_INTERVAL_S
+            await asyncio.to_thread(self.store.purge_response_cache, now - self.ttl_seconds)
+
+
+class LLMCache:
+    """
+    Persistent answer cache keyed on sha256 of the request inputs.
+
+    Lookups run in a worker thread so the SQLite round trip never blocks
+    the event loop.
+    """
+
+    def __init__(
+        self,
+        prompt_version: str,
+        store: Optional[SessionStore] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            prompt_version: Version of the prompts producing the answers;
+                bump it whenever the instructions change
+            store: Session store used for persistence (defaults to the global one)
+            ttl_seconds: Entry lifetime (defaults to LLM_CACHE_TTL_S)
+        """
+        self.prompt_version = prompt_version
+        self.store = store
+        self.enabled = settings.LLM_CACHE_ENABLED
+        self.ttl_seconds = (
+            settings.LLM_CACHE_TTL_S if ttl_seconds is None else ttl_seconds
+        )
+        self._next_purge = 0.0
+
+    def make_key(self, *parts: Any) -> str:
+        """Build the cache key from the inputs and the prompt version."""
+        raw = "|".join(str(part) for part in (*parts, self.prompt_version))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _get_store(self) -> SessionStore:
+        if self.store is None:
+            self.store = get_session_store()
+        return self.store
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached answer.
+
+        Args:
+            key: Key from `make_key`
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        return await asyncio.to_thread(self._get_store().get_llm_cache, key)
+
+    async def set(self, key: str, response: str) -> None:
+        """
+        Store an answer.
+
+        Args:
+            key: Key from `make_key`
+            response: Response text
+        """
+        await asyncio.to_thread(
+            self._get_store().put_llm_cache,
+            key, self.prompt_version, response, self.ttl_seconds
+        )
+
+        now = time.time()
+        if now >= self._next_purge:
+            self._next_purge = now + _PURGE_INTERVAL_S
+            await asyncio.to_thread(self._get_store().purge_llm_cache)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._inflight: Dict[Any, asyncio.Future] = {}
+
+    async def do(self, key: Any, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `func`, or wait for the in-flight call with the same key.
+
+        The lookup and registration happen without an await in between,
+        so no lock is needed on the event loop. Waiters are shielded: a
+        cancelled waiter does not cancel the shared call.
+
+        Args:
+            key: Identity of the call, e.g. (repo, issue_number)
+            func: Zero-argument coroutine function doing the actual work
+
+        Returns:
+            Result of `func` (shared by all coalesced callers)
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            logger.debug("Joined in-flight call", key=str(key))
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
@@ -0,0 +1,273 @@
+"""
+Three-pass context trimming for the coordinator.
+
+Installed as the coordinator's `before_model_callback`, so it shapes what
+is sent to Gemini without touching the stored session history:
+
+1. Stale tool outputs: function responses older than
+   CONTEXT_TOOL_OUTPUT_TURNS turns are replaced by a short stub.
+2. Summary: when the history still exceeds CONTEXT_MAX_TOKENS, the turns
+   before the verbatim tail are folded into one summary written by a cheap
+   model. Summaries are persisted per turn range and extended
+   incrementally, so re-trimming the same prefix never calls the model
+   twice.
+3. Tail: the last CONTEXT_KEEP_TURNS turns are always sent verbatim.
+
+Facts extracted from earlier turns (see agents/_facts.py) stand in, with
+the summary, for the turns that are no longer sent. Neither goes into the
+system instruction: Gemini reuses the KV state of a repeated prompt
+prefix (implicit caching), so everything in front of a change is lost to
+the cache. The summary is sent as the first message, where it replaces
+the turns it covers and only changes when the summarized range moves.
+Facts change after most turns, so they are sent right before the latest
+user message, which keeps the whole earlier history a byte-identical
+prefix from one turn to the next. `record_cache_usage` persists how much
+of each session's last prompt was served from that cache.
+"""
+
+import asyncio
+from typing import List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from config.settings import get_settings
+from observability.logger import get_logger
+from agents._facts import format_facts
+from agents._llm import get_genai_client
+from agents._store import estimate_tokens, get_session_store
+
+settings = get_settings()
+logger = get_logger("ContextTrimmer")
+
+
+_STALE_TOOL_OUTPUT = {"status": "elided", "note": "stale tool output removed from context"}
+
+_SUMMARY_PROMPT = """Summarize the following conversation between a user and the GitHub
+coordinator agent in at most 200 tokens. Keep names, repositories, issue/PR
+numbers, decisions and open questions; drop pleasantries.
+
+{previous}{transcript}"""
+
+
+Turn = List[types.Content]
+
+
+def _starts_turn(content: types.Content) -> bool:
+    return content.role == "user" and any(part.text for part in content.parts or [])
+
+
+def _split_turns(contents: List[types.Content]) -> List[Turn]:
+    """Group contents into turns, each starting at a user text message."""
+    turns: List[Turn] = []
+    for content in contents:
+        if _starts_turn(content) or not turns:
+            turns.append([content])
+        else:
+            turns[-1].append(content)
+    return turns
+
+
+def _content_tokens(content: types.Content) -> int:
+    tokens = 0
+    for part in content.parts or []:
+        if part.text:
+            tokens += estimate_tokens(part.text)
+        elif part.function_response is not None:
+            tokens += estimate_tokens(str(part.function_response.response))
+        elif part.function_call is not None:
+            tokens += estimate_tokens(str(part.function_call.args))
+    return tokens
+
+
+def _strip_tool_outputs(content: types.Content) -> types.Content:
+    """Return a copy of `content` with function response payloads stubbed."""
+    if not any(part.function_response for part in content.parts or []):
+        return content
+
+    parts = []
+    for part in content.parts:
+        if part.function_response is not None:
+            part = types.Part(function_response=types.FunctionResponse(
+                id=part.function_response.id,
+                name=part.function_response.name,
+                response=_STALE_TOOL_OUTPUT
+            ))
+        parts.append(part)
+    return types.Content(role=content.role, parts=parts)
+
+
+def _transcript(turns: List[Turn]) -> str:
+    lines = []
+    for turn in turns:
+        for content in turn:
+            text = " ".join(part.text for part in content.parts or [] if part.text)
+            if text:
+                lines.append(f"{content.role}: {text}")
+    return "\n".join(lines)
+
+
+async def _summarize(session_id: str, turns: List[Turn], end: int) -> Optional[str]:
+    """
+    Get a summary of turns [0, end), extending the latest stored one.
+
+    Returns:
+        Summary text, or None if summarization failed
+    """
+    store = get_session_store()
+    latest = await asyncio.to_thread(store.get_latest_summary, session_id, max_end=end)
+    if latest and latest["turn_end"] == end:
+        return latest["summary"]
+
+    start = latest["turn_end"] if latest else 0
+    previous = f"Earlier summary:\n{latest['summary']}\n\n" if latest else ""
+    prompt = _SUMMARY_PROMPT.format(
+        previous=previous,
+        transcript=_transcript(turns[start:end])
+    )
+
+    try:
+        response = await get_genai_client().aio.models.generate_content(
+            model=settings.CONTEXT_SUMMARY_MODEL,
+            contents=prompt
+        )
+        summary = (response.text or "").strip()
+    except Exception as e:
+        logger.warning(f"Context summarization failed, sending full history: {e}")
+        return None
+
+    if not summary:
+        return None
+
+    await asyncio.to_thread(store.put_summary, session_id, 0, end, summary)
+    return summary
+
+
+def _context_message(text: str) -> types.Content:
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def _latest_user_turn(contents: List[types.Content]) -> int:
+    """Index of the user text message starting the latest turn."""
+    for i in range(len(contents) - 1, -1, -1):
+        if _starts_turn(contents[i]):
+            return i
+    return len(contents)
+
+
+async def _trim(session_id: str, llm_request: LlmRequest) -> Optional[str]:
+    """
+    Trim `llm_request.contents` in place.
+
+    Returns:
+        Summary block standing in for the dropped turns, or None
+    """
+    keep = max(settings.CONTEXT_KEEP_TURNS, 1)
+    turns = _split_turns(llm_request.contents)
+    original_tokens = sum(_content_tokens(c) for turn in turns for c in turn)
+
+    # Pass 1: stub out tool outputs outside the recent window
+    stale_before = len(turns) - settings.CONTEXT_TOOL_OUTPUT_TURNS
+    for i in range(max(stale_before, 0)):
+        turns[i] = [_strip_tool_outputs(content) for content in turns[i]]
+
+    total_tokens = sum(_content_tokens(c) for turn in turns for c in turn)
+
+    # Pass 2: summarize everything before the tail when still over budget.
+    # The cut is rounded down to a multiple of `keep` so the summarized
+    # range only moves every `keep` turns.
+    cut = ((len(turns) - keep) // keep) * keep
+    summary = None
+    if total_tokens > settings.CONTEXT_MAX_TOKENS and cut > 0:
+        summary = await _summarize(session_id, turns, cut)
+
+    # Pass 3: the tail (and anything not summarized) stays verbatim
+    if summary is not None:
+        summary = f"Summary of the earlier conversation (turns 1-{cut}):\n{summary}"
+        turns = turns[cut:]
+
+    llm_request.contents = [content for turn in turns for content in turn]
+
+    trimmed_tokens = sum(_content_tokens(c) for c in llm_request.contents)
+    if trimmed_tokens < original_tokens:
+        logger.debug(
+            "Context trimmed",
+            original_tokens=original_tokens,
+            trimmed_tokens=trimmed_tokens,
+            summarized_turns=cut if summary is not None else 0
+        )
+
+    return summary
+
+
+async def trim_context(
+    callback_context: CallbackContext,
+    llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """
+    before_model_callback that trims the outgoing history in place.
+
+    Also sends the summary of the trimmed turns ahead of the history, and
+    the session's known facts right before the latest user message.
+
+    Args:
+        callback_context: ADK callback context
+        llm_request: Request about to be sent to the model
+
+    Returns:
+        None, so the (trimmed) request proceeds to the model
+    """
+    session_id = callback_context.session.id
+
+    if settings.CONTEXT_TRIM_ENABLED and llm_request.contents:
+        summary = await _trim(session_id, llm_request)
+        if summary is not None:
+            llm_request.contents.insert(0, _context_message(summary))
+
+    if settings.FACTS_ENABLED and llm_request.contents:
+        facts = format_facts(await asyncio.to_thread(
+            get_session_store().get_facts, session_id, settings.FACTS_TOP_K
+        ))
+        if facts:
+            llm_request.contents.insert(
+                _latest_user_turn(llm_request.contents), _context_message(facts)
+            )
+
+    return None
+
+
+async def record_cache_usage(
+    callback_context: CallbackContext,
+    llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """
+    after_model_callback that persists the provider prompt-cache usage.
+
+    Args:
+        callback_context: ADK callback context
+        llm_response: Response returned by the model
+
+    Returns:
+        None, so the response is passed through unchanged
+    """
+    usage = llm_response.usage_metadata
+    if usage is None or llm_response.partial:
+        return None
+
+    session_id = callback_context.session.id
+    prompt_tokens = usage.prompt_token_count or 0
+    cached_tokens = usage.cached_content_token_count or 0
+    await asyncio.to_thread(
+        get_session_store().put_cache_state, session_id, prompt_tokens, cached_tokens
+    )
+
+    if prompt_tokens:
+        logger.debug(
+            "Model prompt cache usage",
+            session_id=session_id,
+            prompt_tokens=prompt_tokens,
+            cached_tokens=cached_tokens,
+            hit_ratio=round(cached_tokens / prompt_tokens, 3)
+        )
+    return None
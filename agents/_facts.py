@@ -0,0 +1,119 @@
+"""
+Per-session fact memory for the coordinator.
+
+After each answered turn a cheap model extracts durable
+(subject, predicate, object) facts from the exchange ("user", "name",
+"Ramaswamy") and stores them in the session store. Before every model
+call the top facts are sent ahead of the history (see agents/_context.py),
+so recall questions ("What's my name?") keep working once the turn that
+stated the fact has been summarized or trimmed away, at a cost of
+O(facts) rather than O(turns) tokens.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.genai import types
+
+from config.settings import get_settings
+from observability.logger import get_logger
+from agents._llm import get_genai_client
+from agents._store import get_session_store
+
+settings = get_settings()
+logger = get_logger("FactMemory")
+
+
+_EXTRACTION_PROMPT = """Extract durable facts about the user and their work from this exchange
+between a user and a GitHub assistant: names, roles, repositories, preferences,
+decisions. Ignore questions, greetings and anything only relevant to this turn.
+
+Answer with a JSON list of objects with keys "subject", "predicate", "object"
+and "confidence" (0-1). Use "user" as the subject for facts about the user.
+Answer [] if there is nothing worth remembering.
+
+User: {query}
+Assistant: {response}"""
+
+Fact = Tuple[str, str, str, float]
+
+
+def _parse_facts(text: str) -> List[Fact]:
+    """Parse the extractor output, dropping malformed entries."""
+    try:
+        items = json.loads(text)
+    except ValueError:
+        return []
+    if not isinstance(items, list):
+        return []
+
+    facts = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        subject, predicate, obj = (
+            str(item.get(key, "")).strip() for key in ("subject", "predicate", "object")
+        )
+        if not (subject and predicate and obj):
+            continue
+        try:
+            confidence = float(item.get("confidence", 1.0))
+        except (TypeError, ValueError):
+            confidence = 1.0
+        facts.append((subject.lower(), predicate.lower(), obj, confidence))
+    return facts
+
+
+async def extract_facts(session_id: str, query: str, response: str) -> int:
+    """
+    Extract facts from one exchange and store them.
+
+    Meant to run as a background task: failures are logged, never raised.
+
+    Args:
+        session_id: Session identifier
+        query: User query
+        response: Coordinator response
+
+    Returns:
+        Number of facts stored
+    """
+    prompt = _EXTRACTION_PROMPT.format(query=query, response=response)
+    try:
+        result = await get_genai_client().aio.models.generate_content(
+            model=settings.FACTS_MODEL,
+            contents=prompt,
+            config=types.GenerateContentConfig(response_mime_type="application/json")
+        )
+        facts = _parse_facts(result.text or "")
+        if facts:
+            await asyncio.to_thread(get_session_store().put_facts, session_id, facts)
+    except Exception as e:
+        logger.warning(f"Fact extraction failed: {e}", session_id=session_id)
+        return 0
+
+    if facts:
+        logger.debug("Facts extracted", session_id=session_id, count=len(facts))
+    return len(facts)
+
+
+def format_facts(facts: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Render stored facts as a context block.
+
+    Facts are listed in a fixed (subject, predicate) order rather than by
+    rank, so the block only changes when a fact does and Gemini's prefix
+    cache stays valid across turns.
+
+    Args:
+        facts: Fact dicts from `SessionStore.get_facts`
+
+    Returns:
+        Block text, or None if there are no facts
+    """
+    if not facts:
+        return None
+    ordered = sorted(facts, key=lambda f: (f["subject"], f["predicate"]))
+    lines = [f"- {f['subject']} {f['predicate']}: {f['object']}" for f in ordered]
+    return "Known facts from this conversation:\n" + "\n".join(lines)
@@ -0,0 +1,84 @@
+"""
+Shared Google GenAI client helpers.
+
+Every agent gets its model from `get_gemini`, so agents using the same
+model share one `Gemini` instance (and its HTTP client) instead of each
+opening their own. Auxiliary calls made outside the ADK agent tree
+(embeddings, cheap summaries, fact extraction) reuse that same client,
+so the whole process shares one connection pool, TLS session and set of
+credentials.
+"""
+
+from functools import lru_cache
+from typing import List
+
+from google import genai
+from google.adk.models.google_llm import Gemini
+from google.genai import types
+
+from config.settings import get_settings
+
+settings = get_settings()
+
+
+DEFAULT_MODEL = "gemini-2.0-flash-exp"
+
+# Retry configuration shared by all agent models: 0.5, 1, 2s between
+# attempts, so a dead upstream fails within seconds (agents/_resilience.py
+# then fails fast for everyone else). Jitter spreads the retries of a
+# concurrent batch that hit the same 429 instead of retrying in lockstep.
+retry_config = types.HttpRetryOptions(
+    attempts=4,
+    exp_base=2,
+    initial_delay=0.5,
+    max_delay=4,
+    jitter=1,
+    http_status_codes=[429, 500, 503, 504]
+)
+
+
+@lru_cache(maxsize=None)
+def get_gemini(model: str = DEFAULT_MODEL) -> Gemini:
+    """
+    Get the shared Gemini model instance for `model`.
+
+    Agents only hold a reference to their model, so one instance can
+    back any number of agents.
+
+    Args:
+        model: Gemini model name
+
+    Returns:
+        Gemini model configured with the shared retry options
+    """
+    return Gemini(model=model, retry_options=retry_config)
+
+
+def get_genai_client() -> genai.Client:
+    """
+    Get the process-wide GenAI client.
+
+    This is the client backing the default agent model, so auxiliary
+    calls share its connection pool and retry options.
+
+    Returns:
+        genai.Client configured from GOOGLE_API_KEY
+    """
+    return get_gemini().api_client
+
+
+async def embed_text(text: str) -> List[float]:
+    """
+    Embed a piece of text with the configured embedding model.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        Embedding vector
+    """
+    response = await get_genai_client().aio.models.embed_content(
+        model=settings.EMBEDDING_MODEL,
+        contents=text
+    )
+    return list(response.embeddings[0].values)
@@ -0,0 +1,133 @@
+"""
+On-disk cache for PDF → markdown conversions.
+
+Entries are keyed by a SHA-256 hash of the PDF bytes, so an unchanged
+file is never converted twice while an edited one (even under the same
+path) always is. Each entry is a `<key>.md` file holding the markdown plus
+a `<key>.json` sidecar with the conversion metadata (page count, extracted
+key information). Both are written to a temporary file first and moved
+into place with `os.replace`, so concurrent readers never see a partial
+entry.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import get_settings
+from observability.logger import get_logger
+
+settings = get_settings()
+logger = get_logger("PDFCache")
+
+
+_CHUNK_SIZE = 1 << 20  # hash in 1 MiB chunks so large PDFs are not read at once
+
+
+def file_key(path: str) -> Optional[str]:
+    """
+    Hash a file's contents into a cache key.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    # OpenSSL's SHA-256 uses the CPU's SHA extensions where present, which
+    # hashes large PDFs about twice as fast as hashlib's software blake2b
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb", buffering=0) as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    # mkstemp gives every writer (thread or process) its own temporary file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class PDFConversionCache:
+    """
+    Content-addressed store of converted PDFs.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the entries (defaults to PDF_CACHE_DIR)
+        """
+        self.cache_dir = Path(cache_dir or settings.PDF_CACHE_DIR)
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Load a cached conversion.
+
+        Args:
+            key: Cache key from `file_key`
+
+        Returns:
+            (markdown, metadata) tuple, or None on a miss
+        """
+        md_path = self.cache_dir / f"{key}.md"
+        meta_path = self.cache_dir / f"{key}.json"
+        try:
+            markdown = md_path.read_text(encoding="utf-8")
+            metadata = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return markdown, metadata
+
+    def put(self, key: str, markdown: str, metadata: Dict[str, Any]) -> None:
+        """
+        Store a conversion.
+
+        The sidecar is written last: an entry only counts as present once
+        both files exist, so a crash in between leaves a harmless miss.
+
+        Args:
+            key: Cache key from `file_key`
+            markdown: Converted markdown
+            metadata: JSON-serializable conversion metadata
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self.cache_dir / f"{key}.md", markdown)
+            _atomic_write(self.cache_dir / f"{key}.json", json.dumps(metadata))
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not cache PDF conversion: {e}", key=key)
+
+
+# Global cache instance
+_pdf_cache = None
+
+
+def get_pdf_cache() -> PDFConversionCache:
+    """
+    Get or create the global PDF conversion cache.
+
+    Returns:
+        PDFConversionCache instance
+    """
+    global _pdf_cache
+
+    if _pdf_cache is None:
+        _pdf_cache = PDFConversionCache()
+
+    return _pdf_cache
@@ -0,0 +1,181 @@
+"""
+Fast-fail and rate limiting around Gemini calls.
+
+HttpRetryOptions (see agents/_llm.py) retries individual requests with a
+short, bounded backoff. The helpers here work one level up, around whole
+agent runs:
+
+- CircuitBreaker: after `fail_threshold` consecutive failures, calls are
+  refused for `reset_after` seconds instead of each one waiting out its
+  own retries against a degraded upstream. After that window the circuit
+  is half-open: exactly one call is let through as a probe while the
+  others keep being refused. Its success closes the circuit, its failure
+  re-opens it (as does a probe that reports nothing for `reset_after`).
+- TokenBucket: caps the sustained request rate while allowing short
+  bursts, so a large batch does not trip upstream 429s.
+
+`guarded_call` applies both to one agent run; every runner that talks to
+Gemini (coordinator, triage, batch triage, PR review, docs) goes through
+it, so they share one view of upstream health.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from config.settings import get_settings
+from observability.logger import get_logger
+
+settings = get_settings()
+logger = get_logger("Resilience")
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Gemini while its circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    """
+
+    def __init__(self, name: str, fail_threshold: int = 5, reset_after: float = 30.0):
+        """
+        Initialize the breaker (closed).
+
+        Args:
+            name: Name used in log messages
+            fail_threshold: Consecutive failures that open the circuit
+            reset_after: Seconds the circuit stays open before a probe call
+        """
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being refused."""
+        return (
+            self._opened_at is not None
+            and time.monotonic() - self._opened_at < self.reset_after
+        )
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed.
+
+        Once the open window has passed, the first caller is admitted as
+        the half-open probe and the window restarts, so concurrent callers
+        are refused until the probe reports back.
+
+        Returns:
+            False while the circuit is open (or its probe is in flight)
+        """
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_after:
+            return False
+        self._opened_at = now
+        logger.info(f"Circuit half-open, sending probe: {self.name}")
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self._opened_at is not None:
+            logger.info(f"Circuit closed: {self.name}")
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._failures >= self.fail_threshold:
+            if not self.is_open:
+                logger.warning(
+                    f"Circuit opened: {self.name}",
+                    failures=self._failures,
+                    reset_after=self.reset_after
+                )
+            self._opened_at = time.monotonic()
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second; <= 0 disables limiting
+            capacity: Maximum burst size (defaults to `rate`, at least 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None  # created on first use, inside the loop
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        if self.rate <= 0:
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Shared by every agent run in the process (see `guarded_call`)
+gemini_circuit = CircuitBreaker(
+    "gemini",
+    fail_threshold=settings.CIRCUIT_FAIL_THRESHOLD,
+    reset_after=settings.CIRCUIT_RESET_S
+)
+gemini_rate_limit = TokenBucket(settings.GEMINI_MAX_RPS)
+
+
+async def guarded_call(func: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run one Gemini-backed agent call behind the shared breaker and rate limit.
+
+    Only exceptions raised by `func` count as failures; cancellation
+    (e.g. a caller's timeout) does not.
+
+    Args:
+        func: Zero-argument coroutine function making the call
+
+    Returns:
+        Result of `func`
+
+    Raises:
+        CircuitOpenError: If the circuit is open
+    """
+    if not gemini_circuit.allow():
+        raise CircuitOpenError("gemini_unavailable")
+
+    await gemini_rate_limit.acquire()
+    try:
+        result = await func()
+    except Exception:
+        gemini_circuit.record_failure()
+        raise
+    gemini_circuit.record_success()
+    return result
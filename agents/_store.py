@@ -0,0 +1,585 @@
+"""
+SQLite sidecar store for session-indexed agent state.
+
+ADK's DatabaseSessionService owns the raw event history. This store keeps
+the lightweight, queryable records the coordinator maintains alongside it:
+one row per session and one row per conversation turn (with a token
+estimate), indexed on (session_id, turn_idx), plus the coordinator's
+response cache and the history epoch its keys are scoped to, context
+summaries, extracted session facts, the provider prompt-cache usage of
+each session's last model call, and the answer cache of the triage / PR
+review helpers.
+
+The store lives in the same SQLite file as the ADK tables and switches it
+to WAL mode, so readers never block the writer between turns.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import get_settings
+from observability.logger import get_logger
+
+settings = get_settings()
+logger = get_logger("SessionStore")
+
+
+# Table names are prefixed so they never collide with the ADK-owned
+# `sessions` / `events` tables living in the same database file.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS coordinator_sessions (
+    session_id TEXT PRIMARY KEY,
+    app_name   TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS coordinator_messages (
+    session_id TEXT NOT NULL REFERENCES coordinator_sessions(session_id),
+    turn_idx   INTEGER NOT NULL,
+    role       TEXT NOT NULL,
+    content    TEXT NOT NULL,
+    tokens     INTEGER NOT NULL,
+    ts         REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_coordinator_messages_turn
+    ON coordinator_messages (session_id, turn_idx);
+
+CREATE TABLE IF NOT EXISTS response_cache (
+    hash       TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    embedding  BLOB,
+    response   TEXT NOT NULL,
+    ts         REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_response_cache_session
+    ON response_cache (session_id, ts);
+
+-- Bumped on every turn that may change what the agent knows about the
+-- session; cached responses are only valid within one epoch
+CREATE TABLE IF NOT EXISTS session_history (
+    session_id TEXT PRIMARY KEY,
+    epoch      INTEGER NOT NULL,
+    ts         REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS context_summaries (
+    session_id TEXT NOT NULL,
+    turn_start INTEGER NOT NULL,
+    turn_end   INTEGER NOT NULL,
+    summary    TEXT NOT NULL,
+    ts         REAL NOT NULL,
+    PRIMARY KEY (session_id, turn_start, turn_end)
+);
+
+CREATE TABLE IF NOT EXISTS session_facts (
+    session_id TEXT NOT NULL,
+    subject    TEXT NOT NULL,
+    predicate  TEXT NOT NULL,
+    object     TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    ts         REAL NOT NULL,
+    PRIMARY KEY (session_id, subject, predicate)
+);
+
+CREATE TABLE IF NOT EXISTS llm_cache (
+    input_hash     TEXT PRIMARY KEY,
+    prompt_version TEXT NOT NULL,
+    response       TEXT NOT NULL,
+    created_at     REAL NOT NULL,
+    expires_at     REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS model_cache_state (
+    session_id    TEXT PRIMARY KEY,
+    prompt_tokens INTEGER NOT NULL,
+    cached_tokens INTEGER NOT NULL,
+    ts            REAL NOT NULL
+);
+"""
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token).
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return len(text) // 4
+
+
+class SessionStore:
+    """
+    Thread-safe wrapper around a single SQLite connection.
+
+    All statements are short, so a lock around one shared connection is
+    cheaper than opening a connection per call.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the sidecar database.
+
+        Args:
+            db_path: SQLite file path, or ":memory:" for an ephemeral store
+        """
+        if db_path != ":memory:":
+            settings.ensure_dirs()
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            isolation_level=None  # autocommit; explicit transactions below
+        )
+        self._conn.row_factory = sqlite3.Row
+
+        for pragma in _PRAGMAS:
+            self._conn.execute(pragma)
+        self._conn.executescript(_SCHEMA)
+
+        logger.info("Session store ready", db_path=db_path)
+
+    def create_session(self, session_id: str, app_name: str) -> None:
+        """
+        Register a brand-new session.
+
+        Unlike `touch_session`, this refuses to reuse an existing ID, so an
+        ID collision surfaces as an error instead of merging two sessions.
+
+        Args:
+            session_id: Freshly generated session identifier
+            app_name: Application name the session belongs to
+
+        Raises:
+            sqlite3.IntegrityError: If the session ID already exists
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO coordinator_sessions (session_id, app_name, updated_at) "
+                "VALUES (?, ?, ?)",
+                (session_id, app_name, time.time())
+            )
+
+    def touch_session(self, session_id: str, app_name: str) -> None:
+        """
+        Create the session row if needed and bump its timestamp.
+
+        Args:
+            session_id: Session identifier
+            app_name: Application name the session belongs to
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO coordinator_sessions (session_id, app_name, updated_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET updated_at = excluded.updated_at",
+                (session_id, app_name, time.time())
+            )
+
+    def append_turn(self, session_id: str, role: str, content: str) -> int:
+        """
+        Append one conversation turn to a session.
+
+        Args:
+            session_id: Session identifier (must already exist)
+            role: "user" or "model"
+            content: Turn text
+
+        Returns:
+            The turn index assigned to this message
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT COALESCE(MAX(turn_idx), -1) + 1 FROM coordinator_messages "
+                    "WHERE session_id = ?",
+                    (session_id,)
+                ).fetchone()
+                turn_idx = row[0]
+                self._conn.execute(
+                    "INSERT INTO coordinator_messages "
+                    "(session_id, turn_idx, role, content, tokens, ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (session_id, turn_idx, role, content,
+                     estimate_tokens(content), time.time())
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return turn_idx
+
+    def get_messages(
+        self,
+        session_id: str,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the stored turns of a session, oldest first.
+
+        Args:
+            session_id: Session identifier
+            limit: Optional cap on the number of most recent turns returned
+
+        Returns:
+            List of message dicts
+        """
+        query = (
+            "SELECT turn_idx, role, content, tokens, ts FROM coordinator_messages "
+            "WHERE session_id = ? ORDER BY turn_idx DESC"
+        )
+        params: tuple = (session_id,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (session_id, limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [dict(row) for row in reversed(rows)]
+
+    def get_cached_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response by its exact-match key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Dict with `response` and `ts`, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, ts FROM response_cache WHERE hash = ?",
+                (key,)
+            ).fetchone()
+
+        return dict(row) if row else None
+
+    def get_cached_embeddings(
+        self,
+        session_id: str,
+        since: float
+    ) -> List[Tuple[bytes, str]]:
+        """
+        Get (embedding, response) pairs cached for a session.
+
+        Args:
+            session_id: Session identifier
+            since: Only entries written after this timestamp
+
+        Returns:
+            List of (embedding blob, response) tuples
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, response FROM response_cache "
+                "WHERE session_id = ? AND ts > ? AND embedding IS NOT NULL",
+                (session_id, since)
+            ).fetchall()
+
+        return [(row["embedding"], row["response"]) for row in rows]
+
+    def put_cached_response(
+        self,
+        key: str,
+        session_id: str,
+        embedding: Optional[bytes],
+        response: str
+    ) -> None:
+        """
+        Insert or refresh a cached response.
+
+        Args:
+            key: Cache key
+            session_id: Session identifier
+            embedding: Packed float32 query embedding, if computed
+            response: Response text
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(hash, session_id, embedding, response, ts) VALUES (?, ?, ?, ?, ?)",
+                (key, session_id, embedding, response, time.time())
+            )
+
+    def purge_response_cache(self, older_than: float) -> int:
+        """
+        Delete cached responses written before a timestamp.
+
+        Args:
+            older_than: Cutoff timestamp (entries at or after it are kept)
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM response_cache WHERE ts < ?",
+                (older_than,)
+            )
+
+        return cursor.rowcount
+
+    def get_history_epoch(self, session_id: str) -> Tuple[int, float]:
+        """
+        Get a session's history epoch and when it last changed.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            (epoch, timestamp); (0, 0.0) for a session with no recorded change
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT epoch, ts FROM session_history WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+
+        return (row["epoch"], row["ts"]) if row else (0, 0.0)
+
+    def bump_history_epoch(self, session_id: str) -> None:
+        """
+        Start a new history epoch, invalidating the session's cached responses.
+
+        Args:
+            session_id: Session identifier
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO session_history (session_id, epoch, ts) VALUES (?, 1, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET "
+                "epoch = epoch + 1, ts = excluded.ts",
+                (session_id, time.time())
+            )
+
+    def get_llm_cache(self, input_hash: str) -> Optional[str]:
+        """
+        Get an unexpired answer-cache entry.
+
+        Args:
+            input_hash: Cache key
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_cache WHERE input_hash = ? AND expires_at > ?",
+                (input_hash, time.time())
+            ).fetchone()
+
+        return row["response"] if row else None
+
+    def put_llm_cache(
+        self,
+        input_hash: str,
+        prompt_version: str,
+        response: str,
+        ttl_seconds: float
+    ) -> None:
+        """
+        Insert or refresh an answer-cache entry.
+
+        Args:
+            input_hash: Cache key
+            prompt_version: Prompt version the response was produced with
+            response: Response text
+            ttl_seconds: Entry lifetime
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(input_hash, prompt_version, response, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (input_hash, prompt_version, response, now, now + ttl_seconds)
+            )
+
+    def purge_llm_cache(self) -> int:
+        """
+        Delete expired answer-cache entries.
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM llm_cache WHERE expires_at <= ?",
+                (time.time(),)
+            )
+
+        return cursor.rowcount
+
+    def get_latest_summary(
+        self,
+        session_id: str,
+        max_end: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored summary covering the most turns, up to `max_end`.
+
+        Args:
+            session_id: Session identifier
+            max_end: Exclusive upper bound of the summarized turn range
+
+        Returns:
+            Dict with `turn_start`, `turn_end` and `summary`, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT turn_start, turn_end, summary FROM context_summaries "
+                "WHERE session_id = ? AND turn_start = 0 AND turn_end <= ? "
+                "ORDER BY turn_end DESC LIMIT 1",
+                (session_id, max_end)
+            ).fetchone()
+
+        return dict(row) if row else None
+
+    def put_summary(
+        self,
+        session_id: str,
+        turn_start: int,
+        turn_end: int,
+        summary: str
+    ) -> None:
+        """
+        Store the summary of turns [turn_start, turn_end).
+
+        Args:
+            session_id: Session identifier
+            turn_start: First summarized turn
+            turn_end: Exclusive end of the summarized range
+            summary: Summary text
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO context_summaries "
+                "(session_id, turn_start, turn_end, summary, ts) VALUES (?, ?, ?, ?, ?)",
+                (session_id, turn_start, turn_end, summary, time.time())
+            )
+
+    def put_facts(
+        self,
+        session_id: str,
+        facts: List[Tuple[str, str, str, float]]
+    ) -> None:
+        """
+        Store extracted facts; a newer fact replaces the same (subject, predicate).
+
+        Args:
+            session_id: Session identifier
+            facts: (subject, predicate, object, confidence) tuples
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO session_facts "
+                "(session_id, subject, predicate, object, confidence, ts) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(session_id, s, p, o, c, now) for s, p, o, c in facts]
+            )
+
+    def get_facts(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the most confident, most recent facts of a session.
+
+        Args:
+            session_id: Session identifier
+            limit: Maximum number of facts
+
+        Returns:
+            List of fact dicts
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT subject, predicate, object, confidence FROM session_facts "
+                "WHERE session_id = ? ORDER BY confidence DESC, ts DESC LIMIT ?",
+                (session_id, limit)
+            ).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def put_cache_state(
+        self,
+        session_id: str,
+        prompt_tokens: int,
+        cached_tokens: int
+    ) -> None:
+        """
+        Record the prompt-cache usage of a session's latest model call.
+
+        Args:
+            session_id: Session identifier
+            prompt_tokens: Prompt tokens sent
+            cached_tokens: Prompt tokens served from the provider cache
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO model_cache_state "
+                "(session_id, prompt_tokens, cached_tokens, ts) VALUES (?, ?, ?, ?)",
+                (session_id, prompt_tokens, cached_tokens, time.time())
+            )
+
+    def checkpoint(self) -> None:
+        """
+        Fold the WAL back into the main database file.
+
+        PASSIVE mode never waits on readers or writers, so this is safe to
+        call periodically while sessions are in use.
+        """
+        if self.db_path == ":memory:":
+            return
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Global store instance
+_session_store = None
+
+
+def get_session_store() -> SessionStore:
+    """
+    Get or create the global session store.
+
+    The store shares the SQLite file of the session backend; with the
+    in-memory backend it is ephemeral as well.
+
+    Returns:
+        SessionStore instance
+    """
+    global _session_store
+
+    if _session_store is None:
+        if settings.SESSION_BACKEND == "memory":
+            _session_store = SessionStore(":memory:")
+        else:
+            _session_store = SessionStore(settings.SESSIONS_DB_PATH)
+
+    return _session_store
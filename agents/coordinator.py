@@ -9,51 +9,82 @@ Key features:
 - Session management for persistent conversations
 - Delegation to specialized agents (PR Review, Issue Triage, Docs)
 - Memory access across sessions
+- Context trimming before each model call (see agents/_context.py)
 - Integration with A2A services
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import sys
+import uuid
+from typing import AsyncIterator, Dict, Any, List, Optional, Set, Tuple
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.runners import Runner
 from google.adk.tools import AgentTool
-from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService
 from google.genai import types
 from pathlib import Path
 
 from config.settings import get_settings
 from observability.logger import get_logger
+from agents._llm import get_gemini
 from agents.pr_review import create_pr_review_agent
 from agents.issue_triage import create_issue_triage_agent
 from agents.docs_agent import create_documentation_agent
 from tools.custom_tools import CUSTOM_GITHUB_TOOLS
+from agents._store import get_session_store
+from agents._cache import ResponseCache
+from agents._facts import extract_facts
+from agents._resilience import (
+    CircuitOpenError,
+    gemini_circuit,
+    gemini_rate_limit,
+    guarded_call
+)
+from agents._context import record_cache_usage, trim_context
+from agents.prompts import load_prompt
 
 settings = get_settings()
 logger = get_logger("CoordinatorAgent")
 
+# User ID under which coordinator sessions are stored
+DEFAULT_USER_ID = "user"
 
-# Retry configuration
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504]
-)
+# Loaded once; see agents/prompts/coordinator.md
+_COORDINATOR_INSTRUCTION = load_prompt("coordinator")
 
 
 def create_session_service():
     """
     Create the session service for maintaining conversation state.
     
-    For capstone demonstration, we use InMemorySessionService.
-    In production, this would be DatabaseSessionService with SQLite/PostgreSQL.
+    The backend is selected by SESSION_BACKEND:
+    - "sqlite": DatabaseSessionService on a local SQLite file in WAL mode
+    - "database": DatabaseSessionService on DATABASE_URL (e.g. PostgreSQL)
+    - "memory": InMemorySessionService (tests, throwaway demos)
     
     Returns:
         Session service instance
     """
-    # For now, using InMemorySessionService for simplicity
-    # In production: DatabaseSessionService(db_url=settings.DATABASE_URL)
-    session_service = InMemorySessionService()
-    logger.info("Session service created (InMemory)")
+    backend = settings.SESSION_BACKEND
+    
+    if backend == "memory":
+        session_service = InMemorySessionService()
+        logger.info("Session service created (InMemory)")
+        return session_service
+    
+    if backend == "sqlite":
+        # Opening the sidecar store first creates the file and switches it
+        # to WAL; the journal mode is persistent, so ADK's engine inherits it.
+        get_session_store()
+        db_url = f"sqlite:///{settings.SESSIONS_DB_PATH}"
+    else:
+        settings.ensure_dirs()  # the default DATABASE_URL lives in data/
+        db_url = settings.DATABASE_URL
+    
+    session_service = DatabaseSessionService(db_url=db_url)
+    logger.info(f"Session service created (Database, {backend})")
     return session_service
 
 
@@ -95,60 +126,11 @@ def create_coordinator_agent(
     # Create coordinator
     coordinator = Agent(
         name="GitHubCoordinator",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are the GitHub Enterprise AI Coordinator. Your job is to help users
-with GitHub operations by coordinating specialized agents and tools.
-
-**Your Capabilities:**
-
-1. **PR Review** (PRReviewAgent):
-   - Review pull requests for code quality and security
-   - Identify vulnerabilities and bugs
-   - Provide constructive feedback
-   - Use this for: "review PR", "check pull request", "analyze code changes"
-
-2. **Issue Triage** (IssueTriageAgent):
-   - Classify and prioritize GitHub issues
-   - Apply appropriate labels
-   - Assess urgency and impact
-   - Use this for: "triage issue", "classify bug", "prioritize issues"
-
-3. **Documentation** (DocumentationAgent):
-   - Create and improve documentation
-   - Learn from PDF files
-   - Ensure documentation quality
-   - Use this for: "improve docs", "create documentation", "update README"
-
-4. **Direct GitHub Operations**:
-   - Get PR details, issue details, repository info
-   - Use these for quick information lookups
-
-**How to work:**
-
-1. **Understand the request**: What does the user want to do?
-2. **Choose the right tool**: Which agent or tool is best for this task?
-3. **Delegate**: Call the appropriate agent/tool
-4. **Summarize**: Provide clear, helpful response to the user
-
-**Remember:**
-- Ask for clarification if the request is unclear
-- Provide specific, actionable information
-- Be helpful and constructive
-- Remember context from previous messages in this session
-
-**Example interactions:**
-
-User: "Review PR #42 in my-repo/project"
-You: Call PRReviewAgent with the repo and PR number
-
-User: "Triage issues 10, 11, and 12"
-You: Call IssueTriageAgent for each issue
-
-User: "Help me understand our architecture"
-You: Check if there's a PDF to learn from, then explain
-
-Always be helpful, clear, and efficient!""",
-        tools=tools
+        model=get_gemini(),
+        instruction=_COORDINATOR_INSTRUCTION,
+        tools=tools,
+        before_model_callback=trim_context,
+        after_model_callback=record_cache_usage
     )
     
     logger.info("✅ Coordinator Agent created with all specialized agents")
@@ -173,9 +155,110 @@ class CoordinatorRunner:
         """
         self.app_name = app_name
         self.session_service = create_session_service()
+        self.store = get_session_store()
+        self.response_cache = ResponseCache(self.store)
         self.coordinator = create_coordinator_agent()
+        
+        # Fire-and-forget work (fact extraction); referenced here so the
+        # tasks are not garbage-collected before they finish
+        self._background_tasks: Set[asyncio.Task] = set()
+        
+        # One runner serves every query; it is scoped per call by session_id
+        # rather than holding per-query state, so concurrent use is safe.
+        self._runner = Runner(
+            agent=self.coordinator,
+            app_name=self.app_name,
+            session_service=self.session_service
+        )
         logger.info(f"Coordinator Runner initialized: {app_name}")
     
+    def _new_session_id(self) -> str:
+        """Generate and register a fresh session ID."""
+        session_id = uuid.uuid4().hex
+        self.store.create_session(session_id, self.app_name)
+        logger.info(f"Generated new session ID: {session_id}")
+        return session_id
+    
+    async def _record_turn(
+        self,
+        session_id: str,
+        query: str,
+        response_text: str,
+        lookup=None
+    ) -> None:
+        """
+        Append a completed turn to the turn log and the response cache,
+        and start extracting facts from it in the background.
+        
+        A turn that is not a cacheable question may change what the agent
+        knows, so it starts a new history epoch of the response cache.
+        The store writes run in a worker thread.
+        """
+        cacheable = ResponseCache.is_cacheable(query)
+        
+        def write_turn():
+            self.store.touch_session(session_id, self.app_name)
+            self.store.append_turn(session_id, "user", query)
+            self.store.append_turn(session_id, "model", response_text)
+            if not cacheable:
+                self.store.bump_history_epoch(session_id)
+        
+        await asyncio.to_thread(write_turn)
+        
+        if cacheable and lookup is not None and response_text:
+            await self.response_cache.put(session_id, lookup, response_text)
+        
+        if settings.FACTS_ENABLED and response_text:
+            task = asyncio.get_running_loop().create_task(
+                extract_facts(session_id, query, response_text)
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+    
+    async def _ensure_session(self, session_id: str):
+        """Get the ADK session, creating it on first use."""
+        session = await self.session_service.get_session(
+            app_name=self.app_name,
+            user_id=DEFAULT_USER_ID,
+            session_id=session_id
+        )
+        if session is None:
+            session = await self.session_service.create_session(
+                app_name=self.app_name,
+                user_id=DEFAULT_USER_ID,
+                session_id=session_id
+            )
+        return session
+    
+    async def _record_cached_turn(
+        self,
+        session_id: str,
+        query: str,
+        response_text: str
+    ) -> None:
+        """
+        Record a turn answered from the response cache.
+        
+        The question and its answer are appended to the ADK session as if
+        the agent had produced them, so later turns see them in context,
+        and to the turn log like any other turn.
+        """
+        session = await self._ensure_session(session_id)
+        invocation_id = f"e-{uuid.uuid4()}"
+        for author, role, text in (
+            ("user", "user", query),
+            (self.coordinator.name, "model", response_text),
+        ):
+            await self.session_service.append_event(
+                session=session,
+                event=Event(
+                    invocation_id=invocation_id,
+                    author=author,
+                    content=types.Content(role=role, parts=[types.Part(text=text)])
+                )
+            )
+        await self._record_turn(session_id, query, response_text)
+    
     async def run(
         self,
         query: str,
@@ -191,11 +274,9 @@ class CoordinatorRunner:
         Returns:
             Response from the coordinator
         """
-        from google.adk.runners import Runner
-        
         # Use session ID or create new one
         if not session_id:
-            session_id = f"session_{hash(query) % 10000}"
+            session_id = self._new_session_id()
         
         logger.info(
             f"Processing query in session {session_id}",
@@ -203,15 +284,34 @@ class CoordinatorRunner:
         )
         
         try:
-            # Create runner with session service
-            runner = Runner(
-                agent=self.coordinator,
-                app_name=self.app_name,
-                session_service=self.session_service
-            )
+            # Serve repeated (or near-identical) questions from the cache
+            lookup = None
+            if self.response_cache.enabled and ResponseCache.is_cacheable(query):
+                lookup = await self.response_cache.get(session_id, query)
+                if lookup.response is not None:
+                    logger.info("Response served from cache", session_id=session_id)
+                    await self._record_cached_turn(session_id, query, lookup.response)
+                    return {
+                        "status": "success",
+                        "query": query,
+                        "response": lookup.response,
+                        "session_id": session_id,
+                        "cached": True
+                    }
             
-            # Run the query
-            response = await runner.run(query, session_id=session_id)
+            # Run the query, failing fast while Gemini is known to be down
+            try:
+                response = await guarded_call(
+                    lambda: self._runner.run(query, session_id=session_id)
+                )
+            except CircuitOpenError:
+                logger.warning("Gemini circuit open, rejecting query", session_id=session_id)
+                return {
+                    "status": "error",
+                    "error_message": "gemini_unavailable",
+                    "query": query,
+                    "session_id": session_id
+                }
             
             # Extract response content
             response_text = ""
@@ -220,6 +320,9 @@ class CoordinatorRunner:
             elif isinstance(response, str):
                 response_text = response
             
+            # Keep the queryable turn log in sync with the session
+            await self._record_turn(session_id, query, response_text, lookup)
+            
             result = {
                 "status": "success",
                 "query": query,
@@ -244,26 +347,174 @@ class CoordinatorRunner:
                 "session_id": session_id
             }
     
+    async def run_stream(
+        self,
+        query: str,
+        session_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Run a query and yield the response text as it is generated.
+        
+        Uses ADK's SSE streaming mode, so the first tokens arrive while the
+        model is still generating. Errors are logged and re-raised.
+        
+        Args:
+            query: User query
+            session_id: Optional session ID for maintaining context
+            
+        Yields:
+            Response text chunks
+        """
+        if not session_id:
+            session_id = self._new_session_id()
+        
+        lookup = None
+        if self.response_cache.enabled and ResponseCache.is_cacheable(query):
+            lookup = await self.response_cache.get(session_id, query)
+            if lookup.response is not None:
+                logger.info("Response served from cache", session_id=session_id)
+                await self._record_cached_turn(session_id, query, lookup.response)
+                yield lookup.response
+                return
+        
+        try:
+            await self._ensure_session(session_id)
+            
+            if not gemini_circuit.allow():
+                raise CircuitOpenError("gemini_unavailable")
+            await gemini_rate_limit.acquire()
+            
+            message = types.Content(role="user", parts=[types.Part(text=query)])
+            chunks: List[str] = []
+            streamed = False
+            
+            # Only failures of the model run itself count against the circuit
+            try:
+                async for event in self._runner.run_async(
+                    user_id=DEFAULT_USER_ID,
+                    session_id=session_id,
+                    new_message=message,
+                    run_config=RunConfig(streaming_mode=StreamingMode.SSE)
+                ):
+                    if not event.content or not event.content.parts:
+                        continue
+                    text = "".join(part.text for part in event.content.parts if part.text)
+                    
+                    # Partial events carry the deltas; the closing aggregated
+                    # event repeats them, so only emit it if nothing streamed.
+                    if event.partial:
+                        if text:
+                            streamed = True
+                            chunks.append(text)
+                            yield text
+                    else:
+                        if text and not streamed and event.is_final_response():
+                            chunks.append(text)
+                            yield text
+                        streamed = False
+            except Exception:
+                gemini_circuit.record_failure()
+                raise
+            
+            gemini_circuit.record_success()
+            await self._record_turn(session_id, query, "".join(chunks), lookup)
+        
+        except Exception as e:
+            logger.error(f"Streaming query failed: {e}", error=e, query=query)
+            raise
+    
+    async def run_batch(
+        self,
+        queries: List[Tuple[str, Optional[str]]],
+        max_concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Run independent queries concurrently.
+        
+        Queries that depend on each other's answers (same session, later
+        turn referring to an earlier one) must not be batched together.
+        
+        Args:
+            queries: List of (query, session_id) pairs; session_id may be None
+            max_concurrency: Maximum number of queries in flight at once
+            
+        Returns:
+            List of responses, in the same order as `queries`
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_bounded(query: str, session_id: Optional[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.run(query, session_id=session_id)
+        
+        results = await asyncio.gather(
+            *(run_bounded(query, session_id) for query, session_id in queries),
+            return_exceptions=True
+        )
+        
+        # Convert exceptions to error dicts
+        processed_results = []
+        for (query, session_id), result in zip(queries, results):
+            if isinstance(result, Exception):
+                processed_results.append({
+                    "status": "error",
+                    "error_message": str(result),
+                    "query": query,
+                    "session_id": session_id
+                })
+            else:
+                processed_results.append(result)
+        
+        return processed_results
+    
+    async def _autosave(self, session_id: str, interval: float) -> None:
+        """Periodically persist session state while the user is typing."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.store.touch_session, session_id, self.app_name)
+                await asyncio.to_thread(self.store.checkpoint)
+            except Exception as e:
+                logger.warning(f"Session autosave failed: {e}")
+    
     async def run_interactive(self):
         """
         Run interactive session with the coordinator.
         
         This allows continuous conversation with context maintained
-        across multiple queries.
+        across multiple queries. Input is read in a worker thread so the
+        event loop stays free for the background autosave task.
         """
-        import uuid
-        
-        session_id = str(uuid.uuid4())
+        session_id = self._new_session_id()
+        loop = asyncio.get_running_loop()
+        autosave = asyncio.create_task(
+            self._autosave(session_id, settings.SESSION_AUTOSAVE_INTERVAL_S)
+        )
         
         print("🤖 GitHub Enterprise AI Agent System")
         print("=" * 50)
         print(f"Session ID: {session_id}")
         print("Type 'exit' or 'quit' to end the session.\n")
         
+        try:
+            await self._interactive_loop(session_id, loop)
+        finally:
+            autosave.cancel()
+            try:
+                await autosave
+            except asyncio.CancelledError:
+                pass
+    
+    async def _interactive_loop(
+        self,
+        session_id: str,
+        loop: asyncio.AbstractEventLoop
+    ) -> None:
+        """Prompt/response loop of `run_interactive`."""
         while True:
             try:
-                # Get user input
-                query = input("You: ").strip()
+                # Get user input without blocking the event loop
+                query = (await loop.run_in_executor(None, input, "You: ")).strip()
                 
                 if not query:
                     continue
@@ -272,16 +523,18 @@ class CoordinatorRunner:
                     print("\n👋 Goodbye! Session ended.")
                     break
                 
-                # Process query
-                result = await self.run(query, session_id=session_id)
-                
-                # Display response
-                if result["status"] == "success":
-                    print(f"\n🤖 Agent: {result['response']}\n")
-                else:
-                    print(f"\n❌ Error: {result['error_message']}\n")
+                # Stream the response as it is generated
+                sys.stdout.write("\n🤖 Agent: ")
+                sys.stdout.flush()
+                try:
+                    async for chunk in self.run_stream(query, session_id=session_id):
+                        sys.stdout.write(chunk)
+                        sys.stdout.flush()
+                    print("\n")
+                except Exception as e:
+                    print(f"\n❌ Error: {e}\n")
             
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n\n👋 Session interrupted. Goodbye!")
                 break
             except Exception as e:
@@ -308,25 +561,23 @@ def get_coordinator_runner() -> CoordinatorRunner:
     return _coordinator_runner
 
 
-if __name__ == "__main__":
-    import asyncio
-    
-    print("Testing Coordinator Agent...\n")
-    
-    # Test 1: Simple query
-    print("1. Testing simple query:")
+async def _main():
+    """Self-test: batched independent queries, then a multi-turn session."""
+    # Test 1: Independent queries, batched concurrently
+    print("1. Testing batched independent queries:")
     runner = get_coordinator_runner()
-    result = asyncio.run(runner.run(
-        "What can you help me with?",
-        session_id="test_session_1"
-    ))
+    results = await runner.run_batch([
+        ("What can you help me with?", "test_session_1"),
+        ("Which specialized agents do you coordinate?", "test_session_1b"),
+    ])
     
-    if result["status"] == "success":
-        print(f"✅ Response: {result['response'][:150]}...")
-    else:
-        print(f"❌ Error: {result['error_message']}")
+    for result in results:
+        if result["status"] == "success":
+            print(f"✅ Response: {result['response'][:150]}...")
+        else:
+            print(f"❌ Error: {result['error_message']}")
     
-    # Test 2: Multi-turn conversation
+    # Test 2: Multi-turn conversation (dependent queries stay sequential)
     print("\n2. Testing multi-turn conversation:")
     session_id = "test_session_2"
     
@@ -337,9 +588,16 @@ if __name__ == "__main__":
     
     for i, query in enumerate(queries, 1):
         print(f"\nQuery {i}: {query}")
-        result = asyncio.run(runner.run(query, session_id=session_id))
+        result = await runner.run(query, session_id=session_id)
         if result["status"] == "success":
             print(f"Response: {result['response'][:100]}...")
+
+
+if __name__ == "__main__":
+    print("Testing Coordinator Agent...\n")
+    
+    # One event loop for the whole self-test, so ADK's HTTP client and
+    # its connections are reused across queries
+    asyncio.run(_main())
     
     print("\n✅ Coordinator test complete!")
-
@@ -9,27 +9,73 @@ This agent improves documentation through iterative refinement:
 This demonstrates the Loop Agent pattern in ADK.
 """
 
-from typing import Dict, Any
-from google.adk.agents import Agent, LoopAgent, SequentialAgent
-from google.adk.models.google_llm import Gemini
+import asyncio
+import hashlib
+import re
+from functools import lru_cache
+from typing import AsyncGenerator, Dict, Any, List, Optional
+from google.adk.agents import Agent, BaseAgent, LoopAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
 from google.adk.tools import FunctionTool
 from google.genai import types
 
 from config.settings import get_settings
 from observability.logger import get_logger
+from agents._llm import get_gemini
+from agents._resilience import guarded_call
 from tools.markitdown_mcp import get_markitdown_client
+from agents.prompts import load_instruction, load_prompt
+from agents._pdf_cache import file_key, get_pdf_cache
 
 settings = get_settings()
 logger = get_logger("DocsAgent")
 
 
-# Retry configuration
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504]
-)
+# Instruction prompts, loaded once; see agents/prompts/
+_INITIAL_WRITER_INSTRUCTION = load_prompt("initial_writer")
+_CRITIC_INSTRUCTION = load_instruction("documentation_critic")
+_REFINER_INSTRUCTION = load_instruction("documentation_refiner")
+
+# Critic verdict that ends the loop, and a tolerant matcher for it: models
+# often wrap the verdict in markdown or add punctuation ("**Approved.**").
+APPROVED = "APPROVED"
+_APPROVED_RE = re.compile(r'^[\s*_`"\']*APPROVED[\s*_`"\'.!]*$', re.IGNORECASE)
+
+
+def _is_approved(critique: Optional[str]) -> bool:
+    """
+    Check whether a critique is an approval verdict.
+    
+    Args:
+        critique: Critic output
+        
+    Returns:
+        True if the critique approves the documentation
+    """
+    return bool(critique) and _APPROVED_RE.match(critique) is not None
+
+
+def normalize_critique(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Canonicalize an approval verdict after the critic runs.
+    
+    The refiner is told to exit only on the exact string "APPROVED";
+    normalizing variants here keeps the loop from running an extra
+    refinement round on "Approved." or "**APPROVED**".
+    
+    Args:
+        callback_context: ADK callback context of the critic
+        
+    Returns:
+        None, leaving the critic's own output in place
+    """
+    critique = callback_context.state.get("critique")
+    if critique != APPROVED and _is_approved(critique):
+        callback_context.state["critique"] = APPROVED
+    return None
 
 
 def exit_loop() -> Dict[str, Any]:
@@ -48,6 +94,130 @@ def exit_loop() -> Dict[str, Any]:
     }
 
 
+async def _collect_events(agent: BaseAgent, ctx: InvocationContext, sink: List[Event]) -> None:
+    """Run `agent` to completion, buffering its events instead of yielding them."""
+    async for event in agent.run_async(ctx):
+        sink.append(event)
+
+
+async def _replay(events: List[Event]) -> AsyncGenerator[Event, None]:
+    """Yield events buffered by `_collect_events`."""
+    for event in events:
+        yield event
+
+
+def _event_tokens(event: Event) -> int:
+    """Total tokens reported for the model call behind `event`, if any."""
+    usage = getattr(event, "usage_metadata", None)
+    return (usage.total_token_count or 0) if usage else 0
+
+
+def _doc_digest(doc: Optional[str]) -> bytes:
+    return hashlib.blake2b((doc or "").encode("utf-8"), digest_size=16).digest()
+
+
+class DocumentationImprovementLoop(LoopAgent):
+    """
+    Critic → refiner loop with optional speculative refinement.
+    
+    Sequentially, each iteration runs the critic and then the refiner,
+    both yielding their events live, stopping as soon as the critic
+    approves. With `speculative_refiner` the refiner starts at the same
+    time as the critic, working from the previous critique; its events
+    are buffered and only emitted if the critic does not approve,
+    otherwise it is cancelled. This hides the critic latency at the cost
+    of a wasted refiner call on approval.
+    
+    The loop also stops early, treating the documentation as final, when
+    a refinement leaves it unchanged (same blake2b digest), changes its
+    length by less than `min_change_ratio`, or when the loop has used
+    more than `max_tokens` tokens (0 disables the cap).
+    """
+    
+    speculative_refiner: bool = False
+    max_tokens: int = 0
+    min_change_ratio: float = 0.01
+    
+    def _converged(self, previous: Optional[str], current: Optional[str]) -> bool:
+        """Check whether a refinement left the documentation (nearly) as it was."""
+        if previous is None or current is None:
+            return False
+        if _doc_digest(previous) == _doc_digest(current):
+            return True
+        return abs(len(current) - len(previous)) < self.min_change_ratio * len(previous)
+    
+    async def _run_async_impl(
+        self,
+        ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        critic, refiner = self.sub_agents
+        iterations = 0
+        tokens_used = 0
+        
+        while not self.max_iterations or iterations < self.max_iterations:
+            previous_doc = ctx.session.state.get("current_documentation")
+            refiner_events: List[Event] = []
+            refiner_task = None
+            if self.speculative_refiner:
+                refiner_task = asyncio.create_task(
+                    _collect_events(refiner, ctx, refiner_events)
+                )
+            
+            try:
+                escalated = False
+                async for event in critic.run_async(ctx):
+                    tokens_used += _event_tokens(event)
+                    yield event
+                    escalated = escalated or bool(event.actions and event.actions.escalate)
+                
+                if escalated or _is_approved(ctx.session.state.get("critique")):
+                    logger.info(
+                        "Documentation approved - exiting improvement loop",
+                        iterations=iterations + 1,
+                        speculative=self.speculative_refiner
+                    )
+                    return
+                
+                if refiner_task is not None:
+                    await refiner_task
+            finally:
+                if refiner_task is not None and not refiner_task.done():
+                    refiner_task.cancel()
+                    try:
+                        await refiner_task
+                    except asyncio.CancelledError:
+                        pass
+            
+            # Buffered speculative output, or the refiner running live
+            if refiner_task is not None:
+                refiner_stream = _replay(refiner_events)
+            else:
+                refiner_stream = refiner.run_async(ctx)
+            async for event in refiner_stream:
+                tokens_used += _event_tokens(event)
+                yield event
+                if event.actions and event.actions.escalate:
+                    return
+            
+            iterations += 1
+            
+            if self._converged(previous_doc, ctx.session.state.get("current_documentation")):
+                logger.info(
+                    "Documentation unchanged by refinement - exiting improvement loop",
+                    iterations=iterations
+                )
+                return
+            
+            if self.max_tokens and tokens_used > self.max_tokens:
+                logger.warning(
+                    "Documentation token budget exhausted - exiting improvement loop",
+                    iterations=iterations,
+                    tokens_used=tokens_used,
+                    max_tokens=self.max_tokens
+                )
+                return
+
+
 def create_initial_writer() -> Agent:
     """
     Create an agent that writes the initial documentation draft.
@@ -57,29 +227,8 @@ def create_initial_writer() -> Agent:
     """
     return Agent(
         name="InitialWriter",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are a technical documentation writer. Your job is to:
-
-1. Create clear, comprehensive documentation based on the user's request
-2. Include:
-   - Overview/Introduction
-   - Prerequisites or requirements
-   - Step-by-step instructions
-   - Code examples where relevant
-   - Troubleshooting tips
-   - Additional resources
-
-3. Follow documentation best practices:
-   - Clear headings and structure
-   - Concise but complete information
-   - Examples that work
-   - Proper markdown formatting
-   - Accessible language
-
-Write the initial draft. It doesn't need to be perfect - it will be
-improved through iteration.
-
-Output ONLY the documentation content.""",
+        model=get_gemini(),
+        instruction=_INITIAL_WRITER_INSTRUCTION,
         output_key="current_documentation"
     )
 
@@ -93,29 +242,10 @@ def create_documentation_critic() -> Agent:
     """
     return Agent(
         name="DocumentationCritic",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are a documentation quality reviewer. Your job is to:
-
-Review this documentation: {current_documentation}
-
-Evaluate on these criteria:
-1. **Clarity**: Is it easy to understand?
-2. **Completeness**: Does it cover all necessary information?
-3. **Accuracy**: Is the information correct?
-4. **Structure**: Is it well-organized?
-5. **Examples**: Are there helpful code examples?
-6. **Accessibility**: Can beginners follow it?
-
-If the documentation meets ALL quality standards:
-- Respond with EXACTLY: "APPROVED"
-
-Otherwise, provide 2-3 specific, actionable suggestions:
-- What needs improvement
-- Why it's important
-- How to fix it
-
-Be constructive and specific.""",
-        output_key="critique"
+        model=get_gemini(),
+        instruction=_CRITIC_INSTRUCTION,
+        output_key="critique",
+        after_agent_callback=normalize_critique
     )
 
 
@@ -128,30 +258,14 @@ def create_documentation_refiner() -> Agent:
     """
     return Agent(
         name="DocumentationRefiner",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are a documentation improvement specialist. Your job is to:
-
-1. Review the current documentation:
-   {current_documentation}
-
-2. Review the critique:
-   {critique}
-
-3. Your task:
-   - IF the critique is EXACTLY "APPROVED": 
-     Call the exit_loop() function immediately
-   
-   - OTHERWISE:
-     Rewrite the documentation to address ALL feedback points
-     Make it better while keeping what works
-     Output the improved documentation
-
-Be thorough in addressing feedback.""",
+        model=get_gemini(),
+        instruction=_REFINER_INSTRUCTION,
         tools=[FunctionTool(exit_loop)],
         output_key="current_documentation"  # Overwrites with improved version
     )
 
 
+@lru_cache(maxsize=1)
 def create_documentation_agent() -> SequentialAgent:
     """
     Create the main Documentation Agent with loop workflow.
@@ -161,6 +275,8 @@ def create_documentation_agent() -> SequentialAgent:
     2. Loops: Critic reviews → Refiner improves
     3. Exits when documentation is approved
     
+    The agent tree is built once per process and shared by all callers.
+    
     Returns:
         Agent configured for iterative documentation improvement
     """
@@ -174,10 +290,13 @@ def create_documentation_agent() -> SequentialAgent:
     refiner = create_documentation_refiner()
     
     # Create loop with max iterations
-    documentation_loop = LoopAgent(
+    documentation_loop = DocumentationImprovementLoop(
         name="DocumentationImprovementLoop",
         sub_agents=[critic, refiner],
-        max_iterations=3  # Prevents infinite loops
+        max_iterations=3,  # Prevents infinite loops
+        speculative_refiner=settings.SPECULATIVE_REFINER,
+        max_tokens=settings.DOCS_MAX_TOKENS,
+        min_change_ratio=settings.DOCS_MIN_CHANGE_RATIO
     )
     
     # Sequential agent coordinates the workflow
@@ -206,8 +325,6 @@ async def improve_documentation(
     Returns:
         Improved documentation
     """
-    from google.adk.runners import InMemoryRunner
-    
     logger.agent_started(
         "DocumentationAgent",
         "Loop",
@@ -229,7 +346,7 @@ async def improve_documentation(
             query = f"Improve this documentation: {content}"
         
         # Run the improvement process
-        response = await runner.run(query)
+        response = await guarded_call(lambda: runner.run(query))
         
         # Extract final documentation
         final_docs = None
@@ -258,17 +375,22 @@ async def improve_documentation(
 
 async def document_from_pdf(
     pdf_path: str,
-    extract_sections: bool = True
+    extract_sections: bool = True,
+    llm_semaphore: Optional[asyncio.Semaphore] = None
 ) -> Dict[str, Any]:
     """
     Create documentation by learning from PDF files.
     
     This uses Markitdown MCP to convert PDFs to markdown,
     then uses the documentation agent to structure it properly.
+    Conversions are cached by file content (see agents/_pdf_cache.py),
+    so re-documenting an unchanged PDF skips the conversion.
     
     Args:
         pdf_path: Path to PDF file
         extract_sections: Whether to extract specific sections
+        llm_semaphore: Optional semaphore held only around the
+            documentation agent run (see `document_from_pdfs`)
         
     Returns:
         Generated documentation from PDF
@@ -276,25 +398,49 @@ async def document_from_pdf(
     logger.info(f"Creating documentation from PDF: {pdf_path}")
     
     try:
-        # Convert PDF to markdown using Markitdown MCP
-        mcp_client = get_markitdown_client()
-        conversion_result = mcp_client.convert_pdf_to_markdown(pdf_path)
-        
-        if conversion_result["status"] != "success":
-            return conversion_result
-        
-        markdown_content = conversion_result["markdown_content"]
+        pdf_cache = get_pdf_cache()
+        key = await asyncio.to_thread(file_key, pdf_path)
+        cached = await asyncio.to_thread(pdf_cache.get, key) if key else None
         
-        # Extract key information
-        key_info = mcp_client.extract_key_information(markdown_content)
+        if cached is not None:
+            markdown_content, metadata = cached
+            page_count = metadata.get("page_count")
+            key_info = metadata.get("key_information")
+            logger.info("Using cached PDF conversion", pdf_path=pdf_path, key=key)
+        else:
+            # Convert PDF to markdown using Markitdown MCP
+            mcp_client = get_markitdown_client()
+            conversion_result = mcp_client.convert_pdf_to_markdown(pdf_path)
+            
+            if conversion_result["status"] != "success":
+                return conversion_result
+            
+            markdown_content = conversion_result["markdown_content"]
+            page_count = conversion_result.get("page_count")
+            
+            # Extract key information
+            key_info = mcp_client.extract_key_information(
+                markdown_content, conversion_result.get("sections")
+            )
+            
+            if key:
+                await asyncio.to_thread(pdf_cache.put, key, markdown_content, {
+                    "source_file": pdf_path,
+                    "page_count": page_count,
+                    "key_information": key_info
+                })
         
         # Use documentation agent to structure it properly
         context = f"Convert this PDF content into well-structured documentation"
-        result = await improve_documentation(markdown_content, context)
+        if llm_semaphore is None:
+            result = await improve_documentation(markdown_content, context)
+        else:
+            async with llm_semaphore:
+                result = await improve_documentation(markdown_content, context)
         
         if result["status"] == "success":
             result["pdf_source"] = pdf_path
-            result["page_count"] = conversion_result.get("page_count")
+            result["page_count"] = page_count
             result["key_information"] = key_info
         
         return result
@@ -308,11 +454,48 @@ async def document_from_pdf(
         }
 
 
-if __name__ == "__main__":
-    import asyncio
+async def document_from_pdfs(
+    pdf_paths: List[str],
+    concurrency: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    Create documentation for several PDFs concurrently.
     
-    print("Testing Documentation Agent (Loop Workflow)...\n")
+    Conversion and key-information extraction for every PDF proceed
+    freely; only the LLM-bound documentation loop is limited to
+    `concurrency` PDFs at a time.
     
+    Args:
+        pdf_paths: Paths to PDF files
+        concurrency: Maximum number of documentation agent runs in flight
+        
+    Returns:
+        List of results, in the same order as `pdf_paths`
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    results = await asyncio.gather(
+        *(document_from_pdf(path, llm_semaphore=semaphore) for path in pdf_paths),
+        return_exceptions=True
+    )
+    
+    # Convert exceptions to error dicts
+    processed_results = []
+    for path, result in zip(pdf_paths, results):
+        if isinstance(result, Exception):
+            processed_results.append({
+                "status": "error",
+                "error_message": str(result),
+                "pdf_path": path
+            })
+        else:
+            processed_results.append(result)
+    
+    return processed_results
+
+
+async def _main():
+    """Self-test: improve a short document, then document a PDF."""
     # Test 1: Improve existing documentation
     print("1. Testing documentation improvement:")
     sample_doc = """
@@ -321,10 +504,10 @@ if __name__ == "__main__":
 Install it. Run it. Done.
 """
     
-    result = asyncio.run(improve_documentation(
+    result = await improve_documentation(
         content=sample_doc,
         context="Setup guide for GitHub Agents project"
-    ))
+    )
     
     if result["status"] == "success":
         print("✅ Documentation improved through iterative refinement")
@@ -336,10 +519,16 @@ Install it. Run it. Done.
     
     # Test 2: Document from PDF
     print("\n2. Testing PDF to documentation:")
-    pdf_result = asyncio.run(document_from_pdf("docs/architecture.pdf"))
+    pdf_result = await document_from_pdf("docs/architecture.pdf")
     
     if pdf_result["status"] == "success":
         print(f"✅ Documentation created from PDF ({pdf_result.get('page_count')} pages)")
     else:
         print(f"ℹ️  PDF test skipped (mock implementation)")
 
+
+if __name__ == "__main__":
+    print("Testing Documentation Agent (Loop Workflow)...\n")
+    
+    # One event loop for both tests, so ADK's HTTP client is reused
+    asyncio.run(_main())
@@ -10,62 +10,83 @@ Both sub-agents run in parallel, then results are combined.
 This demonstrates the Parallel Agent pattern in ADK.
 """
 
-from typing import Dict, Any, List
-from google.adk.agents import Agent, ParallelAgent, SequentialAgent
-from google.adk.models.google_llm import Gemini
+import asyncio
+import json
+import re
+from functools import lru_cache
+from typing import AsyncGenerator, Dict, Any, List, Literal, Optional, Tuple, get_args
+from google.adk.agents import Agent, BaseAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.runners import InMemoryRunner
 from google.genai import types
+from pydantic import BaseModel
 
 from config.settings import get_settings
 from observability.logger import get_logger
-from tools.custom_tools import get_issue_details, update_issue_labels
+from agents._cache import LLMCache, SingleFlight
+from agents._llm import get_gemini
+from agents._resilience import guarded_call
+from agents.prompts import load_prompt
+from tools._github_http import close_github_http
+from tools._serialize import dumps
+from tools.custom_tools import get_issue_details, get_issues_details, update_issue_labels
 
 settings = get_settings()
 logger = get_logger("IssueTriageAgent")
 
 
-# Retry configuration
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504]
-)
+# Bump whenever the triage instructions change, to invalidate cached answers
+PROMPT_VERSION = "triage-v2"
+
+_answer_cache = LLMCache(PROMPT_VERSION)
+_inflight = SingleFlight()
+
+# Instruction prompts, loaded once; see agents/prompts/
+_CATEGORY_CLASSIFIER_INSTRUCTION = load_prompt("category_classifier")
+_PRIORITY_ASSESSOR_INSTRUCTION = load_prompt("priority_assessor")
+_BATCH_ISSUE_TRIAGE_INSTRUCTION = load_prompt("batch_issue_triage")
+
+
+# Structured outputs of the analyzers (Gemini JSON mode). The category
+# enum is the label vocabulary of every triage path (fast, batch, agents).
+Category = Literal[
+    "bug", "feature", "enhancement", "docs", "security",
+    "performance", "question", "infrastructure"
+]
+CATEGORIES = get_args(Category)
+
+
+class CategoryClassification(BaseModel):
+    """Output of the CategoryClassifier."""
+    primary_category: Category
+    secondary: List[str] = []
+    reasoning: Optional[str] = None
+
+
+class PriorityAssessment(BaseModel):
+    """Output of the PriorityAssessor."""
+    priority: Literal["critical", "high", "medium", "low"]
+    urgency_labels: List[Literal["urgent", "needs-review", "good-first-issue"]] = []
+    impact: Optional[str] = None
+    recommendation: Optional[str] = None
 
 
 def create_category_classifier() -> Agent:
     """
     Create an agent that classifies issue categories.
     
+    The issue is passed in the query, so the agent needs no tools and can
+    answer in JSON mode against `CategoryClassification`.
+    
     Returns:
         Agent configured for category classification
     """
     return Agent(
         name="CategoryClassifier",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are an issue categorization specialist. Your job is to:
-
-1. Read the issue title and description
-2. Classify the issue into ONE primary category:
-   - bug: Something is broken or not working correctly
-   - feature: Request for new functionality
-   - enhancement: Improvement to existing functionality
-   - docs: Documentation update or fix
-   - security: Security vulnerability or concern
-   - performance: Performance issue or optimization
-   - question: User question or help request
-   - infrastructure: DevOps, CI/CD, deployment issues
-
-3. Optionally suggest secondary categories if applicable
-
-4. Provide reasoning for your classification
-
-Output format:
-- Primary Category: [category]
-- Secondary Categories: [list if any]
-- Reasoning: [your explanation]
-
-Be precise and consistent in your classifications.""",
-        tools=[get_issue_details],
+        model=get_gemini(),
+        instruction=_CATEGORY_CLASSIFIER_INSTRUCTION,
+        output_schema=CategoryClassification,
         output_key="category_classification"
     )
 
@@ -74,87 +95,101 @@ def create_priority_assessor() -> Agent:
     """
     Create an agent that assesses issue priority.
     
+    Like the classifier, it answers in JSON mode (`PriorityAssessment`).
+    
     Returns:
         Agent configured for priority assessment
     """
     return Agent(
         name="PriorityAssessor",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are a priority assessment specialist. Your job is to:
-
-1. Read the issue title and description
-2. Assess the priority level:
-   - critical: System down, data loss, security breach
-   - high: Major functionality broken, affects many users
-   - medium: Important but not urgent, workaround exists
-   - low: Nice to have, minor issue, cosmetic
-
-3. Consider factors:
-   - Impact: How many users are affected?
-   - Severity: How serious is the problem?
-   - Workaround: Is there a temporary solution?
-   - Business value: How important is this?
-
-4. Suggest urgency labels:
-   - urgent: Needs immediate attention
-   - needs-review: Requires further investigation
-   - good-first-issue: Suitable for new contributors
-
-Output format:
-- Priority: [critical/high/medium/low]
-- Urgency Labels: [list]
-- Impact Assessment: [your analysis]
-- Recommendation: [next steps]
-
-Be objective and consider user impact.""",
-        tools=[get_issue_details],
+        model=get_gemini(),
+        instruction=_PRIORITY_ASSESSOR_INSTRUCTION,
+        output_schema=PriorityAssessment,
         output_key="priority_assessment"
     )
 
 
-def create_label_applicator() -> Agent:
+def _as_dict(value: Any) -> Dict[str, Any]:
+    """Decode an analyzer output (JSON text or already-parsed dict)."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+def build_labels(category: Any, priority: Any) -> Dict[str, Any]:
     """
-    Create an agent that applies labels based on classification and priority.
+    Combine the analyzers' outputs into the final triage result.
     
+    Args:
+        category: CategoryClassifier output (`CategoryClassification`)
+        priority: PriorityAssessor output (`PriorityAssessment`)
+        
     Returns:
-        Agent configured for label application
+        Dictionary with category, priority, labels and reasoning
     """
-    return Agent(
-        name="LabelApplicator",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are a label application specialist. Your job is to:
-
-1. Review the classification and priority assessment:
-   - Category: {category_classification}
-   - Priority: {priority_assessment}
-
-2. Determine the complete set of labels to apply:
-   - Include the primary category
-   - Add priority level
-   - Add urgency labels if applicable
-   - Add relevant tags (frontend, backend, api, etc.)
-
-3. Create a concise summary for the issue triage:
-   - What type of issue this is
-   - How urgent it is
-   - Who should handle it
-   - Recommended next steps
-
-Output the final label set and summary.
-
-Be comprehensive but avoid over-labeling.""",
-        tools=[update_issue_labels],
-        output_key="final_labels"
-    )
+    category = _as_dict(category)
+    priority = _as_dict(priority)
+    
+    primary = category.get("primary_category")
+    level = priority.get("priority")
+    
+    labels = []
+    for label in (
+        [primary, level]
+        + list(category.get("secondary") or [])
+        + list(priority.get("urgency_labels") or [])
+    ):
+        if label and label not in labels:
+            labels.append(label)
+    
+    return {
+        "category": primary,
+        "priority": level,
+        "labels": labels,
+        "reasoning": category.get("reasoning"),
+        "recommendation": priority.get("recommendation")
+    }
+
+
+class LabelBuilder(BaseAgent):
+    """
+    Final triage step: builds the label set from the analyzer outputs.
+    
+    Pure Python, so the sequence costs two model calls (run in parallel)
+    instead of three.
+    """
+    
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        result = build_labels(
+            state.get("category_classification"),
+            state.get("priority_assessment")
+        )
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=dumps(result))]),
+            actions=EventActions(state_delta={"final_labels": result})
+        )
 
 
+@lru_cache(maxsize=1)
 def create_issue_triage_agent() -> SequentialAgent:
     """
     Create the main Issue Triage agent with parallel workflow.
     
     This agent:
     1. Runs category classification and priority assessment in PARALLEL
-    2. Then applies labels based on combined results (sequential)
+    2. Then builds the labels from the combined results (sequential,
+       no model call)
+    
+    The agent tree is built once per process and shared by all callers.
     
     Returns:
         Agent configured for issue triage
@@ -171,13 +206,13 @@ def create_issue_triage_agent() -> SequentialAgent:
         sub_agents=[category_classifier, priority_assessor]
     )
     
-    # Label applicator runs after parallel analysis
-    label_applicator = create_label_applicator()
+    # Label builder runs after parallel analysis
+    label_builder = LabelBuilder(name="LabelBuilder")
     
     # Sequential agent coordinates the workflow
     issue_triage_agent = SequentialAgent(
         name="IssueTriageAgent",
-        sub_agents=[parallel_analyzers, label_applicator]
+        sub_agents=[parallel_analyzers, label_builder]
     )
     
     logger.info("✅ Issue Triage Agent created with parallel analysis")
@@ -185,25 +220,154 @@ def create_issue_triage_agent() -> SequentialAgent:
     return issue_triage_agent
 
 
+@lru_cache(maxsize=1)
+def create_batch_triage_agent() -> Agent:
+    """
+    Create an agent that triages a whole batch of issues in one call.
+    
+    The agent is built once per process and shared by all callers.
+    
+    Returns:
+        Agent configured for batched issue triage
+    """
+    return Agent(
+        name="BatchIssueTriageAgent",
+        model=get_gemini(),
+        instruction=_BATCH_ISSUE_TRIAGE_INSTRUCTION,
+        generate_content_config=types.GenerateContentConfig(
+            response_mime_type="application/json"
+        ),
+        output_key="batch_triage"
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_batch_triage_runner() -> InMemoryRunner:
+    """Get the runner shared by all batched triage calls in this process."""
+    return InMemoryRunner(agent=create_batch_triage_agent())
+
+
+@lru_cache(maxsize=1)
+def _get_triage_runner() -> InMemoryRunner:
+    """Get the runner shared by all triage calls in this process."""
+    return InMemoryRunner(agent=create_issue_triage_agent())
+
+
+# Fast path: issues that follow a template are labelled without the agents
+_TITLE_TAG_RE = re.compile(
+    r"^\s*\[(bug|feature|feature request|enhancement|docs?|documentation"
+    r"|question|security|performance)\]",
+    re.IGNORECASE
+)
+_TITLE_TAG_CATEGORIES = {
+    "bug": "bug",
+    "feature": "feature",
+    "feature request": "feature",
+    "enhancement": "enhancement",
+    "doc": "docs",
+    "docs": "docs",
+    "documentation": "docs",
+    "question": "question",
+    "security": "security",
+    "performance": "performance",
+}
+_BUG_BODY_RE = re.compile(
+    r"^#+\s*steps to reproduce|traceback \(most recent call last\)",
+    re.IGNORECASE | re.MULTILINE
+)
+_FEATURE_BODY_RE = re.compile(
+    r"feature request|would be nice|^#+\s*(?:proposed solution|describe the solution)",
+    re.IGNORECASE | re.MULTILINE
+)
+_URGENT_RE = re.compile(
+    r"\b(?:crash(?:es|ed)?|data loss|outage|production is down|security vulnerability)\b",
+    re.IGNORECASE
+)
+_DEFAULT_PRIORITIES = {"security": "high", "docs": "low", "question": "low"}
+
+
+def fast_classify(title: str, body: str) -> Optional[Dict[str, Any]]:
+    """
+    Classify an issue that matches a known template, without an LLM call.
+    
+    A category tag in the title (``[BUG] ...``) is trusted most; otherwise
+    template sections in the body ("## Steps to Reproduce", a Python
+    traceback, "feature request"). Bodies matching both bug and feature
+    templates are ambiguous and left to the agents.
+    
+    Args:
+        title: Issue title
+        body: Issue description
+        
+    Returns:
+        Dictionary with category, priority, labels and confidence,
+        or None if the issue needs the full triage pipeline
+    """
+    body = body or ""
+    tag = _TITLE_TAG_RE.match(title or "")
+    if tag:
+        category = _TITLE_TAG_CATEGORIES[tag.group(1).lower()]
+        confidence = 0.95
+    else:
+        is_bug = _BUG_BODY_RE.search(body) is not None
+        is_feature = _FEATURE_BODY_RE.search(body) is not None
+        if is_bug == is_feature:
+            return None
+        category = "bug" if is_bug else "feature"
+        confidence = 0.9
+    
+    if _URGENT_RE.search(f"{title}\n{body}"):
+        priority = "high"
+    else:
+        priority = _DEFAULT_PRIORITIES.get(category, "medium")
+    
+    return {
+        "category": category,
+        "priority": priority,
+        "labels": [category, priority],
+        "confidence": confidence
+    }
+
+
 # Helper function to triage issues
 async def triage_issue(
     repo: str,
     issue_number: int,
-    apply_labels: bool = False
+    apply_labels: bool = False,
+    runner: Optional[InMemoryRunner] = None
 ) -> Dict[str, Any]:
     """
     Triage a GitHub issue.
     
+    Answers are cached on (repo, issue number, issue `updated_at`,
+    PROMPT_VERSION), so re-triaging an unchanged issue skips the agent.
+    Issues that `fast_classify` labels with at least
+    FAST_TRIAGE_MIN_CONFIDENCE skip it too. A call made while the same
+    issue is already being triaged waits for that run and returns its
+    result.
+    
     Args:
         repo: Repository name (owner/repo)
         issue_number: Issue number
         apply_labels: Whether to apply labels to the issue
+        runner: Runner to use (defaults to the shared triage runner)
         
     Returns:
         Triage results
     """
-    from google.adk.runners import InMemoryRunner
-    
+    return await _inflight.do(
+        (repo, issue_number, apply_labels),
+        lambda: _triage_issue(repo, issue_number, apply_labels, runner)
+    )
+
+
+async def _triage_issue(
+    repo: str,
+    issue_number: int,
+    apply_labels: bool,
+    runner: Optional[InMemoryRunner]
+) -> Dict[str, Any]:
+    """Run (or answer from cache) a single triage; see `triage_issue`."""
     logger.agent_started(
         "IssueTriageAgent",
         "Parallel",
@@ -212,27 +376,75 @@ async def triage_issue(
     )
     
     try:
-        # Create agent
-        agent = create_issue_triage_agent()
+        # The analyzers get the issue in the query instead of fetching it
+        details = await get_issue_details(repo, issue_number)
+        if details.get("status") != "success":
+            return _error_result(
+                repo, issue_number, details.get("error_message", "Issue not found")
+            )
         
-        # Create runner
-        runner = InMemoryRunner(agent=agent)
+        # Template-matching issues skip the agents entirely
+        fast = None
+        if settings.FAST_TRIAGE_ENABLED:
+            fast = fast_classify(details.get("title", ""), details.get("description", ""))
+            if fast and fast["confidence"] < settings.FAST_TRIAGE_MIN_CONFIDENCE:
+                fast = None
+        if fast:
+            if apply_labels:
+                update_issue_labels(repo, issue_number, fast["labels"])
+            logger.info("Issue triaged by fast path", issue_number=issue_number, **fast)
+            return {
+                "status": "success",
+                "repo": repo,
+                "issue_number": issue_number,
+                "triage_result": fast,
+                "labels_applied": apply_labels,
+                "cached": False,
+                "fast_path": True
+            }
         
-        # Run the triage
-        query = f"Triage issue #{issue_number} in repository {repo}"
-        response = await runner.run(query)
+        # Unchanged issues are answered from the cache
+        cache_key = None
+        if _answer_cache.enabled and details.get("updated_at"):
+            cache_key = _answer_cache.make_key(repo, issue_number, details["updated_at"])
+        
+        cached = await _answer_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            final_labels = json.loads(cached)
+        else:
+            if runner is None:
+                runner = _get_triage_runner()
+            
+            # Run the triage
+            issue = {
+                "title": details.get("title"),
+                "description": details.get("description"),
+                "labels": details.get("labels", [])
+            }
+            query = (
+                f"Triage issue #{issue_number} in repository {repo}:\n"
+                f"{dumps(issue)}"
+            )
+            response = await guarded_call(lambda: runner.run(query))
+            
+            # Extract results
+            final_labels = None
+            if hasattr(response, 'content'):
+                final_labels = _as_dict(response.content) or response.content
+            
+            if cache_key and final_labels:
+                await _answer_cache.set(cache_key, dumps(final_labels))
         
-        # Extract results
-        final_labels = None
-        if hasattr(response, 'content'):
-            final_labels = response.content
+        if apply_labels and isinstance(final_labels, dict) and final_labels.get("labels"):
+            update_issue_labels(repo, issue_number, final_labels["labels"])
         
         result = {
             "status": "success",
             "repo": repo,
             "issue_number": issue_number,
             "triage_result": final_labels,
-            "labels_applied": apply_labels
+            "labels_applied": apply_labels,
+            "cached": cached is not None
         }
         
         logger.agent_completed("IssueTriageAgent", 3.0)
@@ -254,26 +466,52 @@ async def triage_issue(
         }
 
 
+def _error_result(repo: str, issue_number: int, message: str) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "error_message": message,
+        "repo": repo,
+        "issue_number": issue_number
+    }
+
+
 async def triage_multiple_issues(
     repo: str,
     issue_numbers: List[int],
-    apply_labels: bool = False
+    apply_labels: bool = False,
+    semaphore: Optional[asyncio.Semaphore] = None
 ) -> List[Dict[str, Any]]:
     """
     Triage multiple issues efficiently.
     
     This demonstrates how parallel agents can process
-    multiple items concurrently.
+    multiple items concurrently. All issues share one runner, and at
+    most MAX_PARALLEL_TRIAGE triages are in flight at once. Results are
+    processed as they complete; an issue that takes longer than
+    TRIAGE_ISSUE_TIMEOUT_S, or is still pending when the whole batch
+    exceeds TRIAGE_TIMEOUT_S, gets an error result instead of stalling
+    the others.
     
     Args:
         repo: Repository name (owner/repo)
         issue_numbers: List of issue numbers
         apply_labels: Whether to apply labels
+        semaphore: Concurrency limit shared with the caller (defaults to a
+            new one of MAX_PARALLEL_TRIAGE slots)
         
     Returns:
-        List of triage results
+        List of triage results, in the same order as `issue_numbers`
     """
-    import asyncio
+    if len(issue_numbers) == 1 and semaphore is None:
+        # No task/semaphore machinery for a single issue
+        try:
+            result = await asyncio.wait_for(
+                triage_issue(repo, issue_numbers[0], apply_labels),
+                timeout=settings.TRIAGE_ISSUE_TIMEOUT_S
+            )
+        except asyncio.TimeoutError:
+            result = _error_result(repo, issue_numbers[0], "Triage timed out")
+        return [result]
     
     logger.info(
         f"Triaging {len(issue_numbers)} issues in parallel",
@@ -281,26 +519,61 @@ async def triage_multiple_issues(
         issue_count=len(issue_numbers)
     )
     
+    runner = _get_triage_runner()
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.MAX_PARALLEL_TRIAGE)
+    
+    async def triage_bounded(idx: int, issue_num: int) -> Tuple[int, Dict[str, Any]]:
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(
+                    triage_issue(repo, issue_num, apply_labels, runner=runner),
+                    timeout=settings.TRIAGE_ISSUE_TIMEOUT_S
+                )
+            except asyncio.TimeoutError:
+                result = _error_result(repo, issue_num, "Triage timed out")
+            except Exception as e:
+                result = _error_result(repo, issue_num, str(e))
+        return idx, result
+    
     # Create tasks for parallel execution
     tasks = [
-        triage_issue(repo, issue_num, apply_labels)
-        for issue_num in issue_numbers
+        asyncio.ensure_future(triage_bounded(idx, issue_num))
+        for idx, issue_num in enumerate(issue_numbers)
     ]
     
-    # Run all triages in parallel
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Convert exceptions to error dicts
-    processed_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            processed_results.append({
-                "status": "error",
-                "error_message": str(result),
-                "issue_number": issue_numbers[i]
-            })
-        else:
-            processed_results.append(result)
+    # Process each result as soon as it is ready
+    processed_results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+    done = 0
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=settings.TRIAGE_TIMEOUT_S):
+            idx, result = await next_done
+            processed_results[idx] = result
+            done += 1
+            logger.info(
+                "Triage progress",
+                issue_number=issue_numbers[idx],
+                status=result.get("status"),
+                done=done,
+                total=len(tasks)
+            )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "Triage batch timed out",
+            done=done,
+            total=len(tasks),
+            timeout=settings.TRIAGE_TIMEOUT_S
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    # Anything still pending when the batch timed out
+    for idx, result in enumerate(processed_results):
+        if result is None:
+            processed_results[idx] = _error_result(
+                repo, issue_numbers[idx], "Triage batch timed out"
+            )
     
     logger.info(
         f"Completed triaging {len(issue_numbers)} issues",
@@ -310,32 +583,179 @@ async def triage_multiple_issues(
     return processed_results
 
 
-if __name__ == "__main__":
-    import asyncio
+def _parse_batch_triage(text: Any, issue_numbers: List[int]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse the batch agent's answer, or return None if it is unusable.
     
-    print("Testing Issue Triage Agent (Parallel Workflow)...\n")
+    The answer must be a JSON array covering exactly `issue_numbers`.
+    """
+    try:
+        items = json.loads(text) if isinstance(text, str) else text
+    except ValueError:
+        return None
+    if not isinstance(items, list):
+        return None
     
-    # Test single issue
-    print("1. Testing single issue triage:")
-    result = asyncio.run(triage_issue(
-        repo="RamaswamyGCP/KaggleAgentTestRepo",
-        issue_number=1,
-        apply_labels=False
-    ))
+    by_number = {}
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get("issue_number"), int):
+            by_number[item["issue_number"]] = item
+    if set(by_number) != set(issue_numbers):
+        return None
+    return [by_number[number] for number in issue_numbers]
+
+
+async def _triage_chunk(
+    repo: str,
+    issues: List[Dict[str, Any]],
+    apply_labels: bool
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Triage one chunk of issues with a single batch-agent call.
     
-    if result["status"] == "success":
-        print(f"✅ Issue #{result['issue_number']} triaged successfully")
-    else:
-        print(f"❌ Triage failed: {result['error_message']}")
+    Returns None if the batch answer is unusable, so the caller can
+    re-triage the chunk issue by issue.
+    """
+    issue_numbers = [issue["issue_number"] for issue in issues]
+    payload = [
+        {
+            "issue_number": issue["issue_number"],
+            "title": issue.get("title"),
+            "description": issue.get("description"),
+            "labels": issue.get("labels", [])
+        }
+        for issue in issues
+    ]
+    
+    parsed = None
+    try:
+        query = f"Triage these issues from repository {repo}:\n{dumps(payload)}"
+        response = await guarded_call(lambda: _get_batch_triage_runner().run(query))
+        parsed = _parse_batch_triage(getattr(response, "content", None), issue_numbers)
+    except Exception as e:
+        logger.warning(f"Batch triage call failed: {e}", repo=repo, issues=issue_numbers)
+    
+    if parsed is None:
+        logger.warning("Falling back to per-issue triage", repo=repo, issues=issue_numbers)
+        return None
+    
+    if apply_labels:
+        for item in parsed:
+            if item.get("labels"):
+                update_issue_labels(repo, item["issue_number"], item["labels"])
+    
+    return [
+        {
+            "status": "success",
+            "repo": repo,
+            "issue_number": item["issue_number"],
+            "triage_result": {
+                "category": item.get("category"),
+                "priority": item.get("priority"),
+                "labels": item.get("labels", [])
+            },
+            "labels_applied": apply_labels,
+            "batched": True
+        }
+        for item in parsed
+    ]
+
+
+async def triage_issues_batched(
+    repo: str,
+    issue_numbers: List[int],
+    apply_labels: bool = False,
+    chunk_size: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Triage many issues with one model call per chunk of issues.
+    
+    Compared to `triage_multiple_issues`, the system prompt and HTTP round
+    trip are paid once per `chunk_size` issues instead of once per issue.
+    Issue details are fetched in one bulk call. Chunks run concurrently,
+    bounded by MAX_PARALLEL_TRIAGE; a chunk whose answer cannot be parsed
+    is re-triaged issue by issue.
+    
+    Args:
+        repo: Repository name (owner/repo)
+        issue_numbers: List of issue numbers
+        apply_labels: Whether to apply labels
+        chunk_size: Issues per model call
+        
+    Returns:
+        List of triage results, in the same order as `issue_numbers`
+    """
+    logger.info(
+        f"Triaging {len(issue_numbers)} issues in batches of {chunk_size}",
+        repo=repo,
+        issue_count=len(issue_numbers)
+    )
+    
+    details = await get_issues_details(repo, issue_numbers)
+    if details.get("status") != "success":
+        return await triage_multiple_issues(repo, issue_numbers, apply_labels)
+    
+    issues = details["issues"]
+    chunks = [issues[i:i + chunk_size] for i in range(0, len(issues), chunk_size)]
+    semaphore = asyncio.Semaphore(settings.MAX_PARALLEL_TRIAGE)
+    
+    async def triage_bounded(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            results = await _triage_chunk(repo, chunk, apply_labels)
+        if results is None:
+            # Unusable batch answer: one run per issue, in the same slots
+            results = await triage_multiple_issues(
+                repo,
+                [issue["issue_number"] for issue in chunk],
+                apply_labels,
+                semaphore=semaphore
+            )
+        return results
     
-    # Test multiple issues in parallel
-    print("\n2. Testing multiple issues in parallel:")
-    results = asyncio.run(triage_multiple_issues(
-        repo="RamaswamyGCP/KaggleAgentTestRepo",
-        issue_numbers=[1, 2, 3],
-        apply_labels=False
-    ))
+    chunk_results = await asyncio.gather(*(triage_bounded(chunk) for chunk in chunks))
+    results = [result for chunk in chunk_results for result in chunk]
     
-    successful = sum(1 for r in results if r.get("status") == "success")
-    print(f"✅ {successful}/{len(results)} issues triaged successfully")
+    logger.info(
+        f"Completed triaging {len(issue_numbers)} issues",
+        successful=sum(1 for r in results if r.get("status") == "success"),
+        model_calls=len(chunks)
+    )
+    
+    return results
+
 
+async def _main():
+    """Self-test: triage one issue, then several in parallel."""
+    try:
+        # Test single issue
+        print("1. Testing single issue triage:")
+        result = await triage_issue(
+            repo="RamaswamyGCP/KaggleAgentTestRepo",
+            issue_number=1,
+            apply_labels=False
+        )
+        
+        if result["status"] == "success":
+            print(f"✅ Issue #{result['issue_number']} triaged successfully")
+        else:
+            print(f"❌ Triage failed: {result['error_message']}")
+        
+        # Test multiple issues in parallel
+        print("\n2. Testing multiple issues in parallel:")
+        results = await triage_multiple_issues(
+            repo="RamaswamyGCP/KaggleAgentTestRepo",
+            issue_numbers=[1, 2, 3],
+            apply_labels=False
+        )
+        
+        successful = sum(1 for r in results if r.get("status") == "success")
+        print(f"✅ {successful}/{len(results)} issues triaged successfully")
+    finally:
+        await close_github_http()
+
+
+if __name__ == "__main__":
+    print("Testing Issue Triage Agent (Parallel Workflow)...\n")
+    
+    # One event loop for both tests: the shared GitHub client belongs to it
+    asyncio.run(_main())
@@ -2,34 +2,49 @@
 PR Review Agent with Sequential workflow.
 
 This agent reviews pull requests using a sequential workflow:
-1. Code Analysis - Analyzes code changes
-2. Security Check - Identifies security vulnerabilities  
-3. Generate Review - Creates comprehensive review comments
+1. Scan - Code Analysis and Security Check run in parallel, since the
+   security scan of the diff does not depend on the quality analysis
+2. Generate Review - Combines both into comprehensive review comments
 
 This demonstrates the Sequential Agent pattern in ADK.
 """
 
-from typing import Dict, Any
-from google.adk.agents import Agent, SequentialAgent
-from google.adk.models.google_llm import Gemini
-from google.genai import types
+import asyncio
+import json
+from functools import lru_cache
+from typing import Dict, Any, Optional
+from google.adk.agents import Agent, ParallelAgent, SequentialAgent
+from google.adk.runners import InMemoryRunner
 
 from config.settings import get_settings
 from observability.logger import get_logger
-from tools.custom_tools import get_pr_details, get_pr_diff, add_review_comment
+from agents._cache import LLMCache, SingleFlight
+from agents._llm import get_gemini
+from agents._resilience import guarded_call
+from agents.prompts import load_instruction, load_prompt
+from tools._serialize import dumps
+from tools.custom_tools import (
+    get_pr_details,
+    get_pr_diff_compact,
+    get_pr_security_diff,
+    add_review_comments
+)
 from tools.github_mcp import get_github_mcp_client
 
 settings = get_settings()
 logger = get_logger("PRReviewAgent")
 
 
-# Retry configuration for API calls
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504]
-)
+# Bump whenever the review instructions change, to invalidate cached reviews
+PROMPT_VERSION = "pr-review-v2"
+
+_answer_cache = LLMCache(PROMPT_VERSION)
+_inflight = SingleFlight()
+
+# Instruction prompts, loaded once; see agents/prompts/
+_CODE_ANALYSIS_INSTRUCTION = load_prompt("code_analysis")
+_SECURITY_CHECK_INSTRUCTION = load_prompt("security_check")
+_REVIEW_GENERATOR_INSTRUCTION = load_instruction("review_generator")
 
 
 def create_code_analysis_agent() -> Agent:
@@ -41,28 +56,9 @@ def create_code_analysis_agent() -> Agent:
     """
     return Agent(
         name="CodeAnalysisAgent",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are a code analysis specialist. Your job is to:
-
-1. Review the code changes in the pull request
-2. Identify code quality issues:
-   - Complexity problems
-   - Missing error handling
-   - Poor naming conventions
-   - Code duplication
-   - Performance issues
-3. Check for best practice violations
-4. Note any missing tests
-
-Provide your analysis in a structured format with:
-- File name
-- Line number
-- Issue type
-- Description
-- Recommendation
-
-Be constructive and specific in your feedback.""",
-        tools=[get_pr_details, get_pr_diff],
+        model=get_gemini(),
+        instruction=_CODE_ANALYSIS_INSTRUCTION,
+        tools=[get_pr_details, get_pr_diff_compact],
         output_key="code_analysis"
     )
 
@@ -76,30 +72,9 @@ def create_security_check_agent() -> Agent:
     """
     return Agent(
         name="SecurityCheckAgent",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are a security analysis specialist. Your job is to:
-
-1. Review the code changes for security vulnerabilities:
-   - SQL Injection risks
-   - Cross-Site Scripting (XSS)
-   - Hardcoded secrets/credentials
-   - Insecure authentication
-   - Missing input validation
-   - Insecure data storage
-   - Exposure of sensitive information
-
-2. Rate each vulnerability by severity:
-   - CRITICAL: Immediate security risk
-   - HIGH: Significant security concern
-   - MEDIUM: Should be addressed
-   - LOW: Minor security improvement
-
-3. Provide specific remediation steps for each issue
-
-Access the code analysis from the previous step: {code_analysis}
-
-Focus ONLY on security issues. Be thorough and specific.""",
-        tools=[get_pr_diff],
+        model=get_gemini(),
+        instruction=_SECURITY_CHECK_INSTRUCTION,
+        tools=[get_pr_security_diff],
         output_key="security_analysis"
     )
 
@@ -113,42 +88,22 @@ def create_review_generator_agent() -> Agent:
     """
     return Agent(
         name="ReviewGeneratorAgent",
-        model=Gemini(model="gemini-2.0-flash-exp", retry_options=retry_config),
-        instruction="""You are a PR review specialist. Your job is to:
-
-1. Combine the code analysis and security analysis:
-   - Code Analysis: {code_analysis}
-   - Security Analysis: {security_analysis}
-
-2. Create a comprehensive, well-structured PR review with:
-   - Summary of changes
-   - Critical issues that MUST be fixed
-   - Important suggestions for improvement
-   - Minor recommendations
-   - Positive feedback on good practices
-
-3. Format your review professionally:
-   - Start with an overview
-   - Group issues by severity
-   - Provide actionable recommendations
-   - Be constructive and helpful
-
-4. Include specific file names and line numbers for each issue
-
-Your review should help the developer improve their code while being 
-encouraging and constructive.""",
+        model=get_gemini(),
+        instruction=_REVIEW_GENERATOR_INSTRUCTION,
         output_key="final_review"
     )
 
 
+@lru_cache(maxsize=1)
 def create_pr_review_agent() -> SequentialAgent:
     """
     Create the main PR Review agent with sequential workflow.
     
-    This agent coordinates three sub-agents in sequence:
-    1. Code Analysis
-    2. Security Check
-    3. Review Generation
+    This agent coordinates three sub-agents:
+    1. Code Analysis and Security Check, in parallel
+    2. Review Generation, once both have finished
+    
+    The agent tree is built once per process and shared by all callers.
     
     Returns:
         SequentialAgent configured for PR review
@@ -160,74 +115,112 @@ def create_pr_review_agent() -> SequentialAgent:
     security_checker = create_security_check_agent()
     review_generator = create_review_generator_agent()
     
+    # Independent scans run side by side
+    parallel_scan = ParallelAgent(
+        name="PRScan",
+        sub_agents=[code_analyzer, security_checker]
+    )
+    
     # Create sequential workflow
     pr_review_agent = SequentialAgent(
         name="PRReviewAgent",
-        sub_agents=[
-            code_analyzer,
-            security_checker,
-            review_generator
-        ]
+        sub_agents=[parallel_scan, review_generator]
     )
     
-    logger.info("✅ PR Review Agent created with 3 sequential sub-agents")
+    logger.info("✅ PR Review Agent created with parallel scan and review generation")
     
     return pr_review_agent
 
 
+@lru_cache(maxsize=1)
+def _get_pr_runner() -> InMemoryRunner:
+    """Get the runner shared by all PR reviews in this process."""
+    return InMemoryRunner(agent=create_pr_review_agent())
+
+
 # Helper function to run PR review
 async def review_pull_request(
     repo: str,
     pr_number: int,
-    post_comments: bool = False
+    post_comments: bool = False,
+    runner: Optional[InMemoryRunner] = None
 ) -> Dict[str, Any]:
     """
     Review a pull request using the PR Review Agent.
     
+    Reviews are cached on (repo, PR number, head SHA, PROMPT_VERSION);
+    the head SHA is immutable, so a hit is always still accurate. When
+    the PR details carry no head SHA, `updated_at` is used instead.
+    A call made while the same PR is already being reviewed waits for
+    that run and returns its result.
+    
     Args:
         repo: Repository name (owner/repo)
         pr_number: Pull request number
         post_comments: Whether to post comments to GitHub
+        runner: Runner to use (defaults to the shared PR review runner)
         
     Returns:
         Review results
     """
-    from google.adk.runners import InMemoryRunner
-    
+    return await _inflight.do(
+        (repo, pr_number, post_comments),
+        lambda: _review_pull_request(repo, pr_number, post_comments, runner)
+    )
+
+
+async def _review_pull_request(
+    repo: str,
+    pr_number: int,
+    post_comments: bool,
+    runner: Optional[InMemoryRunner]
+) -> Dict[str, Any]:
+    """Run (or answer from cache) a single review; see `review_pull_request`."""
     logger.agent_started("PRReviewAgent", "Sequential", repo=repo, pr_number=pr_number)
     
     try:
-        # Create agent
-        agent = create_pr_review_agent()
-        
-        # Create runner
-        runner = InMemoryRunner(agent=agent)
+        # Unchanged PRs are answered from the cache
+        cache_key = None
+        if _answer_cache.enabled:
+            details = await get_pr_details(repo, pr_number)
+            revision = details.get("head_sha") or details.get("updated_at")
+            if details.get("status") == "success" and revision:
+                cache_key = _answer_cache.make_key(repo, pr_number, revision)
         
-        # Run the review
-        query = f"Review pull request #{pr_number} in repository {repo}"
-        response = await runner.run(query)
-        
-        # Extract the final review
-        final_review = None
-        if hasattr(response, 'content'):
-            final_review = response.content
+        cached = await _answer_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            final_review = json.loads(cached)
+        else:
+            if runner is None:
+                runner = _get_pr_runner()
+            
+            # Run the review
+            query = f"Review pull request #{pr_number} in repository {repo}"
+            response = await guarded_call(lambda: runner.run(query))
+            
+            # Extract the final review
+            final_review = None
+            if hasattr(response, 'content'):
+                final_review = response.content
+            
+            if cache_key and final_review:
+                await _answer_cache.set(cache_key, dumps(final_review))
         
         result = {
             "status": "success",
             "repo": repo,
             "pr_number": pr_number,
             "review": final_review,
-            "comments_posted": post_comments
+            "comments_posted": post_comments,
+            "cached": cached is not None
         }
         
-        # Optionally post comments
+        # Optionally post comments, as one review
         if post_comments and final_review:
-            comment_result = add_review_comment(
-                repo=repo,
-                pr_number=pr_number,
-                comment=final_review
+            review_result = await add_review_comments(
+                repo, pr_number, [{"comment": final_review}]
             )
-            result["comment_posted"] = comment_result.get("status") == "success"
+            result["comment_posted"] = review_result.get("status") == "success"
         
         logger.agent_completed("PRReviewAgent", 5.0)
         
@@ -244,8 +237,6 @@ async def review_pull_request(
 
 
 if __name__ == "__main__":
-    import asyncio
-    
     print("Testing PR Review Agent (Sequential Workflow)...\n")
     
     # Test with mock data
@@ -0,0 +1,89 @@
+"""
+Agent instruction prompts.
+
+Prompts live next to this module as markdown files so they can be edited
+without touching agent code. Each file is read once per process; the
+cached string is passed to every agent built from it, which keeps the
+system prompt byte-identical across requests (a stable prefix is what
+Gemini's implicit prompt caching keys on).
+
+Prompts with `{state_key}` placeholders are loaded with `load_instruction`
+instead: the template is split into literal and placeholder segments once,
+and the returned instruction provider only joins segments per request,
+rather than ADK re-scanning the whole template with a regex every turn.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from google.adk.agents.readonly_context import ReadonlyContext
+
+PROMPTS_DIR = Path(__file__).parent
+
+# `{key}` or `{key?}` (optional: empty when missing), as in ADK templates
+_PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)(\?)?\}")
+
+
+@lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """
+    Load an instruction prompt by name.
+    
+    Line endings are normalized so the text is identical regardless of
+    how the repository was checked out.
+    
+    Args:
+        name: Prompt file name without the .md extension
+        
+    Returns:
+        Prompt text
+    """
+    text = (PROMPTS_DIR / f"{name}.md").read_text(encoding="utf-8")
+    return text.replace("\r\n", "\n").rstrip("\n")
+
+
+def compile_instruction(template: str) -> Callable[[ReadonlyContext], str]:
+    """
+    Pre-parse a `{state_key}` template into an ADK instruction provider.
+    
+    Args:
+        template: Instruction text with `{key}` / `{key?}` placeholders
+        
+    Returns:
+        Callable filling the placeholders from the session state
+        
+    Raises:
+        KeyError: At run time, if a required key is missing from the state
+    """
+    segments = _PLACEHOLDER_RE.split(template)
+    literals = segments[0::3]
+    keys = list(zip(segments[1::3], segments[2::3]))
+    
+    def provider(context: ReadonlyContext) -> str:
+        state = context.state
+        parts = [literals[0]]
+        for (key, optional), literal in zip(keys, literals[1:]):
+            if key in state:
+                parts.append(str(state[key]))
+            elif not optional:
+                raise KeyError(f"Context variable not found: `{key}`.")
+            parts.append(literal)
+        return "".join(parts)
+    
+    return provider
+
+
+@lru_cache(maxsize=None)
+def load_instruction(name: str) -> Callable[[ReadonlyContext], str]:
+    """
+    Load a templated instruction prompt by name, pre-compiled.
+    
+    Args:
+        name: Prompt file name without the .md extension
+        
+    Returns:
+        Instruction provider for `Agent(instruction=...)`
+    """
+    return compile_instruction(load_prompt(name))
@@ -3,55 +3,147 @@ Configuration management for GitHub Enterprise AI Agents.
 
 This module loads configuration from environment variables and provides
 a centralized settings object for the entire application.
+
+Settings is a frozen dataclass: every field is read (and cast) from the
+environment when the instance is created, not when the module is
+imported, so `get_settings.cache_clear()` picks up a changed environment.
 """
 
 import os
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file, once per process tree: forked
+# or spawned workers inherit the environment and skip re-parsing the file
 env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(dotenv_path=env_path)
+if not os.getenv("_DOTENV_LOADED"):
+    load_dotenv(dotenv_path=env_path)
+    os.environ["_DOTENV_LOADED"] = "1"
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+_dirs_ready = False  # set by Settings.ensure_dirs
+
+# __slots__ keeps attribute reads off the instance dict (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _as_bool(value: str) -> bool:
+    return value.lower() == "true"
+
 
+def _env(name: str, default: Optional[str], cast: Callable[[str], Any] = str) -> Any:
+    """Declare a field read from environment variable `name` at construction."""
+    def read() -> Any:
+        value = os.getenv(name, default)
+        return None if value is None else cast(value)
+    return field(default_factory=read)
 
+
+@dataclass(frozen=True, repr=False, **_DATACLASS_OPTIONS)
 class Settings:
     """Application settings loaded from environment variables."""
     
     # Google Gemini API Configuration
-    GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
+    GOOGLE_API_KEY: str = _env("GOOGLE_API_KEY", "")
     
     # GitHub Configuration
-    GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN")
+    GITHUB_TOKEN: Optional[str] = _env("GITHUB_TOKEN", None)
+    # Call the GitHub REST API from the custom tools instead of returning mock data
+    GITHUB_LIVE_API: bool = _env("GITHUB_LIVE_API", "false", _as_bool)
+    GITHUB_API_URL: str = _env("GITHUB_API_URL", "https://api.github.com")
+    GITHUB_CACHE_TTL_S: int = _env("GITHUB_CACHE_TTL_S", "60", int)
+    GITHUB_CACHE_MAXSIZE: int = _env("GITHUB_CACHE_MAXSIZE", "512", int)
     
     # Google Cloud Configuration
-    GCP_PROJECT_ID: str = os.getenv("GCP_PROJECT_ID", "KaggleStudy2025")
-    GCP_REGION: str = os.getenv("GCP_REGION", "us-central1")
+    GCP_PROJECT_ID: str = _env("GCP_PROJECT_ID", "KaggleStudy2025")
+    GCP_REGION: str = _env("GCP_REGION", "us-central1")
     
     # Service Configuration
-    MAIN_SERVICE_PORT: int = int(os.getenv("MAIN_SERVICE_PORT", "8000"))
-    KNOWLEDGE_SERVICE_PORT: int = int(os.getenv("KNOWLEDGE_SERVICE_PORT", "8001"))
-    DASHBOARD_PORT: int = int(os.getenv("DASHBOARD_PORT", "3000"))
+    MAIN_SERVICE_PORT: int = _env("MAIN_SERVICE_PORT", "8000", int)
+    KNOWLEDGE_SERVICE_PORT: int = _env("KNOWLEDGE_SERVICE_PORT", "8001", int)
+    DASHBOARD_PORT: int = _env("DASHBOARD_PORT", "3000", int)
     
     # Database Configuration
-    DATABASE_URL: str = os.getenv(
-        "DATABASE_URL", 
-        "sqlite:///data/sessions.db"
-    )
+    DATABASE_URL: str = _env("DATABASE_URL", "sqlite:///data/sessions.db")
+    
+    # Session Configuration
+    # "sqlite" (local WAL-mode file), "database" (DATABASE_URL) or "memory"
+    SESSION_BACKEND: str = _env("SESSION_BACKEND", "sqlite", str.lower)
+    SESSIONS_DB_PATH: str = _env("SESSIONS_DB_PATH", "data/sessions.db")
+    SESSION_AUTOSAVE_INTERVAL_S: float = _env("SESSION_AUTOSAVE_INTERVAL_S", "5", float)
+    
+    # Response Cache Configuration
+    RESPONSE_CACHE_ENABLED: bool = _env("RESPONSE_CACHE_ENABLED", "true", _as_bool)
+    RESPONSE_CACHE_TTL_S: float = _env("RESPONSE_CACHE_TTL_S", "3600", float)
+    RESPONSE_CACHE_SIMILARITY: float = _env("RESPONSE_CACHE_SIMILARITY", "0.95", float)
+    RESPONSE_CACHE_EMBEDDINGS: bool = _env("RESPONSE_CACHE_EMBEDDINGS", "false", _as_bool)
+    RESPONSE_CACHE_MAXSIZE: int = _env("RESPONSE_CACHE_MAXSIZE", "1024", int)
+    EMBEDDING_MODEL: str = _env("EMBEDDING_MODEL", "text-embedding-004")
+    
+    # Triage / PR Review Answer Cache Configuration
+    LLM_CACHE_ENABLED: bool = _env("LLM_CACHE_ENABLED", "true", _as_bool)
+    LLM_CACHE_TTL_S: float = _env("LLM_CACHE_TTL_S", "604800", float)  # 7 days
+    
+    # Context Trimming Configuration
+    CONTEXT_TRIM_ENABLED: bool = _env("CONTEXT_TRIM_ENABLED", "true", _as_bool)
+    CONTEXT_MAX_TOKENS: int = _env("CONTEXT_MAX_TOKENS", "8000", int)
+    CONTEXT_KEEP_TURNS: int = _env("CONTEXT_KEEP_TURNS", "4", int)
+    CONTEXT_TOOL_OUTPUT_TURNS: int = _env("CONTEXT_TOOL_OUTPUT_TURNS", "2", int)
+    CONTEXT_SUMMARY_MODEL: str = _env("CONTEXT_SUMMARY_MODEL", "gemini-2.0-flash-lite")
+    
+    # Gemini Resilience Configuration
+    CIRCUIT_FAIL_THRESHOLD: int = _env("CIRCUIT_FAIL_THRESHOLD", "5", int)
+    CIRCUIT_RESET_S: float = _env("CIRCUIT_RESET_S", "30", float)
+    GEMINI_MAX_RPS: float = _env("GEMINI_MAX_RPS", "0", float)  # 0 = unlimited
+    
+    # Issue Triage Configuration
+    MAX_PARALLEL_TRIAGE: int = _env("MAX_PARALLEL_TRIAGE", "8", int)
+    TRIAGE_ISSUE_TIMEOUT_S: float = _env("TRIAGE_ISSUE_TIMEOUT_S", "120", float)
+    TRIAGE_TIMEOUT_S: float = _env("TRIAGE_TIMEOUT_S", "600", float)
+    # Label template-matching issues by regex instead of running the agents
+    FAST_TRIAGE_ENABLED: bool = _env("FAST_TRIAGE_ENABLED", "true", _as_bool)
+    FAST_TRIAGE_MIN_CONFIDENCE: float = _env("FAST_TRIAGE_MIN_CONFIDENCE", "0.9", float)
+    
+    # Session Fact Memory Configuration
+    FACTS_ENABLED: bool = _env("FACTS_ENABLED", "true", _as_bool)
+    FACTS_MODEL: str = _env("FACTS_MODEL", "gemini-2.0-flash-lite")
+    FACTS_TOP_K: int = _env("FACTS_TOP_K", "20", int)
+    
+    # Documentation Agent Configuration
+    # Start the refiner alongside the critic; trades tokens for latency
+    SPECULATIVE_REFINER: bool = _env("SPECULATIVE_REFINER", "false", _as_bool)
+    # Stop refining once a pass changes the length by less than this ratio
+    DOCS_MIN_CHANGE_RATIO: float = _env("DOCS_MIN_CHANGE_RATIO", "0.01", float)
+    DOCS_MAX_TOKENS: int = _env("DOCS_MAX_TOKENS", "0", int)  # 0 = no cap
     
     # Logging Configuration
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "logs/agents.log")
+    LOG_LEVEL: str = _env("LOG_LEVEL", "INFO")
+    LOG_FILE: str = _env("LOG_FILE", "logs/agents.log")
     
     # Project paths
-    PROJECT_ROOT: Path = Path(__file__).parent.parent
-    DATA_DIR: Path = PROJECT_ROOT / "data"
-    LOGS_DIR: Path = PROJECT_ROOT / "logs"
+    PROJECT_ROOT: Path = _PROJECT_ROOT
+    DATA_DIR: Path = _PROJECT_ROOT / "data"
+    LOGS_DIR: Path = _PROJECT_ROOT / "logs"
+    PDF_CACHE_DIR: Path = _PROJECT_ROOT / "data" / "pdf_cache"
     
-    def __init__(self):
-        """Initialize settings and create necessary directories."""
+    def ensure_dirs(self) -> None:
+        """
+        Create the data and logs directories.
+        
+        Called by the components that write there (logger, session
+        store), rather than on every settings import.
+        """
+        global _dirs_ready
+        
+        if _dirs_ready:
+            return
         self.DATA_DIR.mkdir(exist_ok=True)
         self.LOGS_DIR.mkdir(exist_ok=True)
+        _dirs_ready = True
     
     def validate(self) -> bool:
         """
@@ -61,8 +153,12 @@ class Settings:
             bool: True if configuration is valid, False otherwise.
         """
         if not self.GOOGLE_API_KEY:
-            print("❌ Error: GOOGLE_API_KEY not found in environment variables.")
-            print("   Please create a .env file and add your API key.")
+            # Imported here: the logger itself depends on these settings
+            from observability.logger import get_logger
+            get_logger("Settings").error(
+                "GOOGLE_API_KEY not found in environment variables; "
+                "create a .env file and add your API key"
+            )
             return False
         
         return True
@@ -79,10 +175,7 @@ class Settings:
         )
 
 
-# Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get the global settings instance.
@@ -90,7 +183,7 @@ def get_settings() -> Settings:
     Returns:
         Settings: The global settings object.
     """
-    return settings
+    return Settings()
 
 
 if __name__ == "__main__":
@@ -6,10 +6,11 @@ This is the command-line interface for the GitHub Enterprise AI Agents system.
 It provides access to all agent capabilities through simple commands.
 
 Usage:
-    python main.py review-pr <repo> <pr_number>
-    python main.py triage-issue <repo> <issue_number>
-    python main.py update-docs <content>
+    python main.py review-pr <repo> <pr_number> [--post-comments]
+    python main.py triage-issue <repo> <issue_number>... [--apply-labels]
+    python main.py update-docs <content> [--context TEXT] [--output PATH]
     python main.py interactive
+    python main.py <command> --help
 
 Examples:
     python main.py review-pr RamaswamyGCP/KaggleAgentTestRepo 1
@@ -17,29 +18,31 @@ Examples:
     python main.py interactive
 """
 
+import os
 import sys
 import asyncio
-import argparse
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from config.settings import get_settings
-from observability.logger import get_logger
-from agents.coordinator import get_coordinator_runner
-from agents.pr_review import review_pull_request
-from agents.issue_triage import triage_issue, triage_multiple_issues
-from agents.docs_agent import improve_documentation
+try:
+    import uvloop  # optional, faster event loop (not available on Windows)
+except ImportError:
+    uvloop = None
 
-settings = get_settings()
-logger = get_logger("MainCLI")
+# Settings, logging and the agent modules (and with them ADK / google-genai)
+# are imported once a command is about to run, so `--help` and argument
+# errors return immediately.
 
+# Top-level help: the Usage/Examples part of this docstring
+_USAGE = __doc__[__doc__.index("Usage:"):]
 
-def print_banner():
-    """Print the application banner."""
-    banner = """
+
+_BANNER = """
 ╔════════════════════════════════════════════════════════════╗
 ║                                                            ║
 ║     GitHub Enterprise AI Agents                            ║
@@ -49,8 +52,26 @@ def print_banner():
 ║     Powered by Google Agent Development Kit (ADK)          ║
 ║                                                            ║
 ╚════════════════════════════════════════════════════════════╝
+
 """
-    print(banner)
+
+_RULE = "=" * 60
+
+
+def emit(*lines: object) -> None:
+    """
+    Write lines to stdout as one buffered write (one lock, one flush).
+    
+    Args:
+        *lines: Lines to print, joined by newlines like `print` would
+    """
+    sys.stdout.write("\n".join(map(str, lines)) + "\n")
+    sys.stdout.flush()
+
+
+def print_banner():
+    """Print the application banner."""
+    sys.stdout.write(_BANNER)
 
 
 async def cmd_review_pr(args):
@@ -60,8 +81,9 @@ async def cmd_review_pr(args):
     Args:
         args: Parsed arguments containing repo and pr_number
     """
-    print(f"\n🔍 Reviewing PR #{args.pr_number} in {args.repo}...")
-    print("=" * 60)
+    from agents.pr_review import review_pull_request
+    
+    emit(f"\n🔍 Reviewing PR #{args.pr_number} in {args.repo}...", _RULE)
     
     result = await review_pull_request(
         repo=args.repo,
@@ -70,18 +92,13 @@ async def cmd_review_pr(args):
     )
     
     if result["status"] == "success":
-        print("\n✅ PR Review Complete!")
-        print("\n" + "=" * 60)
-        print("REVIEW:")
-        print("=" * 60)
         review_text = result.get("review", "No review generated")
-        print(review_text)
-        print("=" * 60)
-        
+        lines = ["\n✅ PR Review Complete!", "\n" + _RULE, "REVIEW:", _RULE, review_text, _RULE]
         if result.get("comments_posted"):
-            print("\n📝 Comments posted to GitHub")
+            lines.append("\n📝 Comments posted to GitHub")
+        emit(*lines)
     else:
-        print(f"\n❌ Review failed: {result['error_message']}")
+        emit(f"\n❌ Review failed: {result['error_message']}")
         sys.exit(1)
 
 
@@ -92,56 +109,54 @@ async def cmd_triage_issue(args):
     Args:
         args: Parsed arguments containing repo and issue_numbers
     """
+    from agents.issue_triage import triage_issue, triage_multiple_issues
+    
     issue_numbers = args.issue_numbers
     
     if len(issue_numbers) == 1:
-        print(f"\n🏷️  Triaging issue #{issue_numbers[0]} in {args.repo}...")
-        print("=" * 60)
-        
+        emit(f"\n🏷️  Triaging issue #{issue_numbers[0]} in {args.repo}...", _RULE)
         result = await triage_issue(
             repo=args.repo,
             issue_number=issue_numbers[0],
             apply_labels=args.apply_labels
         )
-        
         if result["status"] == "success":
-            print("\n✅ Issue Triage Complete!")
-            print("\n" + "=" * 60)
-            print("TRIAGE RESULT:")
-            print("=" * 60)
             triage_result = result.get("triage_result", "No result generated")
-            print(triage_result)
-            print("=" * 60)
-            
+            lines = [
+                "\n✅ Issue Triage Complete!", "\n" + _RULE, "TRIAGE RESULT:", _RULE,
+                triage_result, _RULE
+            ]
             if result.get("labels_applied"):
-                print("\n🏷️  Labels applied to GitHub issue")
+                lines.append("\n🏷️  Labels applied to GitHub issue")
+            emit(*lines)
         else:
-            print(f"\n❌ Triage failed: {result['error_message']}")
+            emit(f"\n❌ Triage failed: {result['error_message']}")
             sys.exit(1)
-    else:
-        print(f"\n🏷️  Triaging {len(issue_numbers)} issues in parallel...")
-        print("=" * 60)
-        
-        results = await triage_multiple_issues(
-            repo=args.repo,
-            issue_numbers=issue_numbers,
-            apply_labels=args.apply_labels
-        )
-        
-        successful = sum(1 for r in results if r.get("status") == "success")
-        
-        print(f"\n✅ Triage Complete: {successful}/{len(results)} successful")
-        
-        for i, result in enumerate(results, 1):
-            print(f"\nIssue #{result.get('issue_number', issue_numbers[i-1])}:")
-            if result.get("status") == "success":
-                print("  Status: ✅ Success")
-                triage_result = result.get("triage_result", "")
-                # Show first 100 chars
-                preview = triage_result[:100] + "..." if len(triage_result) > 100 else triage_result
-                print(f"  Result: {preview}")
-            else:
-                print(f"  Status: ❌ Failed - {result.get('error_message', 'Unknown error')}")
+        return
+    
+    emit(f"\n🏷️  Triaging {len(issue_numbers)} issues in parallel...", _RULE)
+    
+    results = await triage_multiple_issues(
+        repo=args.repo,
+        issue_numbers=issue_numbers,
+        apply_labels=args.apply_labels
+    )
+    
+    successful = sum(1 for r in results if r.get("status") == "success")
+    lines = [f"\n✅ Triage Complete: {successful}/{len(results)} successful"]
+    
+    for i, result in enumerate(results, 1):
+        lines.append(f"\nIssue #{result.get('issue_number', issue_numbers[i-1])}:")
+        if result.get("status") == "success":
+            lines.append("  Status: ✅ Success")
+            triage_result = str(result.get("triage_result", ""))
+            # Show first 100 chars
+            preview = triage_result[:100] + "..." if len(triage_result) > 100 else triage_result
+            lines.append(f"  Result: {preview}")
+        else:
+            lines.append(f"  Status: ❌ Failed - {result.get('error_message', 'Unknown error')}")
+    
+    emit(*lines)
 
 
 async def cmd_update_docs(args):
@@ -151,14 +166,15 @@ async def cmd_update_docs(args):
     Args:
         args: Parsed arguments containing content
     """
-    print("\n📝 Improving documentation...")
-    print("=" * 60)
+    from agents.docs_agent import improve_documentation
+    
+    emit("\n📝 Improving documentation...", _RULE)
     
     # Check if content is a file path
     content_path = Path(args.content)
     if content_path.exists() and content_path.is_file():
-        print(f"Reading from file: {content_path}")
-        content = content_path.read_text()
+        emit(f"Reading from file: {content_path}")
+        content = content_path.read_text(encoding="utf-8")
     else:
         content = args.content
     
@@ -168,21 +184,27 @@ async def cmd_update_docs(args):
     )
     
     if result["status"] == "success":
-        print("\n✅ Documentation Improved!")
-        print("\n" + "=" * 60)
-        print("IMPROVED DOCUMENTATION:")
-        print("=" * 60)
         improved_docs = result.get("improved_documentation", "No documentation generated")
-        print(improved_docs)
-        print("=" * 60)
+        emit(
+            "\n✅ Documentation Improved!", "\n" + _RULE, "IMPROVED DOCUMENTATION:", _RULE,
+            improved_docs, _RULE
+        )
         
-        # Optionally save to file
+        # Optionally save to file (possibly the input file itself): write a
+        # sibling temp file and move it into place, so an interrupted write
+        # never leaves a truncated document (or a stray temp file) behind
         if args.output:
             output_path = Path(args.output)
-            output_path.write_text(improved_docs)
-            print(f"\n💾 Saved to: {output_path}")
+            tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(improved_docs)
+                os.replace(tmp_path, output_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            emit(f"\n💾 Saved to: {output_path}")
     else:
-        print(f"\n❌ Documentation improvement failed: {result['error_message']}")
+        emit(f"\n❌ Documentation improvement failed: {result['error_message']}")
         sys.exit(1)
 
 
@@ -193,44 +215,14 @@ async def cmd_interactive(args):
     Args:
         args: Parsed arguments (not used for interactive mode)
     """
+    from agents.coordinator import get_coordinator_runner
+    
     coordinator = get_coordinator_runner()
     await coordinator.run_interactive()
 
 
-def main():
-    """Main entry point for the CLI."""
-    # Validate configuration first
-    if not settings.validate():
-        print("\n❌ Configuration error. Please check your .env file.")
-        print("   Copy .env.example to .env and add your GOOGLE_API_KEY")
-        sys.exit(1)
-    
-    # Parse command-line arguments
-    parser = argparse.ArgumentParser(
-        description="GitHub Enterprise AI Agents - Multi-Agent System",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  Review a pull request:
-    python main.py review-pr RamaswamyGCP/KaggleAgentTestRepo 1
-  
-  Triage an issue:
-    python main.py triage-issue RamaswamyGCP/KaggleAgentTestRepo 1
-  
-  Triage multiple issues:
-    python main.py triage-issue RamaswamyGCP/KaggleAgentTestRepo 1 2 3
-  
-  Improve documentation:
-    python main.py update-docs README.md
-  
-  Interactive mode:
-    python main.py interactive
-        """
-    )
-    
-    subparsers = parser.add_subparsers(dest="command", help="Command to run")
-    
-    # Review PR command
+def _add_review_parser(subparsers) -> None:
+    """Add the review-pr subcommand."""
     review_parser = subparsers.add_parser(
         "review-pr",
         help="Review a pull request"
@@ -242,8 +234,10 @@ Examples:
         action="store_true",
         help="Post comments to GitHub"
     )
-    
-    # Triage issue command
+
+
+def _add_triage_parser(subparsers) -> None:
+    """Add the triage-issue subcommand."""
     triage_parser = subparsers.add_parser(
         "triage-issue",
         help="Triage one or more GitHub issues"
@@ -260,8 +254,10 @@ Examples:
         action="store_true",
         help="Apply labels to GitHub issues"
     )
-    
-    # Update docs command
+
+
+def _add_docs_parser(subparsers) -> None:
+    """Add the update-docs subcommand."""
     docs_parser = subparsers.add_parser(
         "update-docs",
         help="Improve documentation"
@@ -279,47 +275,277 @@ Examples:
         "--output",
         help="Output file path"
     )
-    
-    # Interactive mode
-    interactive_parser = subparsers.add_parser(
+
+
+def _add_interactive_parser(subparsers) -> None:
+    """Add the interactive subcommand."""
+    subparsers.add_parser(
         "interactive",
         help="Run in interactive mode"
     )
+
+
+SUBPARSERS = {
+    "review-pr": _add_review_parser,
+    "triage-issue": _add_triage_parser,
+    "update-docs": _add_docs_parser,
+    "interactive": _add_interactive_parser,
+}
+
+
+COMMANDS = {
+    "review-pr": cmd_review_pr,
+    "triage-issue": cmd_triage_issue,
+    "update-docs": cmd_update_docs,
+    "interactive": cmd_interactive,
+}
+
+
+def _split_args(
+    argv: List[str],
+    flags: Tuple[str, ...] = (),
+    options: Tuple[str, ...] = ()
+) -> Optional[Tuple[List[str], Dict[str, object]]]:
+    """
+    Split subcommand arguments into positionals and option values.
     
-    # Parse arguments
-    args = parser.parse_args()
+    Returns None for anything outside the simple grammar (unknown or
+    abbreviated options, a missing or dash-prefixed option value, "--",
+    positionals interrupted by an option), so the caller can defer to
+    argparse for it.
+    """
+    positionals = []
+    values: Dict[str, object] = {flag: False for flag in flags}
+    values.update({option: None for option in options})
     
-    # Show banner
-    print_banner()
+    i = 0
+    run_ended = False  # argparse fills each positional from one run
+    while i < len(argv):
+        arg = argv[i]
+        if not arg.startswith("-"):
+            if run_ended:
+                return None
+            positionals.append(arg)
+            i += 1
+            continue
+        run_ended = bool(positionals)
+        if arg in flags:
+            values[arg] = True
+        elif arg in options:
+            if i + 1 >= len(argv) or argv[i + 1].startswith("-"):
+                return None
+            i += 1
+            values[arg] = argv[i]
+        elif "=" in arg and arg.split("=", 1)[0] in options:
+            name, value = arg.split("=", 1)
+            values[name] = value
+        else:
+            return None
+        i += 1
+    return positionals, values
+
+
+def parse_cli(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the command line without argparse.
+    
+    The four subcommands have fixed, simple schemas, so common invocations
+    are parsed directly. Help requests, malformed arguments and anything
+    else unusual return None and go through `build_parser()`, which
+    produces the help text and error messages.
+    
+    Args:
+        argv: Arguments after the program name
+        
+    Returns:
+        Parsed arguments, or None to fall back to argparse
+    """
+    if not argv or argv[0] not in COMMANDS or "-h" in argv or "--help" in argv:
+        return None
+    command, rest = argv[0], argv[1:]
+    
+    try:
+        if command == "review-pr":
+            split = _split_args(rest, flags=("--post-comments",))
+            if split is None or len(split[0]) != 2:
+                return None
+            (repo, pr_number), values = split
+            return SimpleNamespace(
+                command=command,
+                repo=repo,
+                pr_number=int(pr_number),
+                post_comments=values["--post-comments"]
+            )
+        
+        if command == "triage-issue":
+            split = _split_args(rest, flags=("--apply-labels",))
+            if split is None or len(split[0]) < 2:
+                return None
+            (repo, *issue_numbers), values = split
+            return SimpleNamespace(
+                command=command,
+                repo=repo,
+                issue_numbers=[int(number) for number in issue_numbers],
+                apply_labels=values["--apply-labels"]
+            )
+        
+        if command == "update-docs":
+            split = _split_args(rest, options=("--context", "--output"))
+            if split is None or len(split[0]) != 1:
+                return None
+            (content,), values = split
+            return SimpleNamespace(
+                command=command,
+                content=content,
+                context=values["--context"] or "",
+                output=values["--output"]
+            )
+    except ValueError:
+        return None
+    
+    # interactive
+    return SimpleNamespace(command=command) if not rest else None
+
+
+def build_parser():
+    """
+    Build the full argparse parser (help output and error reporting).
+    
+    Returns:
+        argparse.ArgumentParser for the CLI
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="GitHub Enterprise AI Agents - Multi-Agent System",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  Review a pull request:
+    python main.py review-pr RamaswamyGCP/KaggleAgentTestRepo 1
+  
+  Triage an issue:
+    python main.py triage-issue RamaswamyGCP/KaggleAgentTestRepo 1
+  
+  Triage multiple issues:
+    python main.py triage-issue RamaswamyGCP/KaggleAgentTestRepo 1 2 3
+  
+  Improve documentation:
+    python main.py update-docs README.md
+  
+  Interactive mode:
+    python main.py interactive
+        """
+    )
+    
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+    
+    # Only the requested subcommand needs its parser; help and unknown
+    # commands get all of them, for the command listing
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in SUBPARSERS:
+        SUBPARSERS[command](subparsers)
+    else:
+        for add_parser in SUBPARSERS.values():
+            add_parser(subparsers)
+    
+    return parser
+
+
+# Event loop shared by every command run in this process
+_loop = None
+
+
+def run_async(coro):
+    """
+    Run a coroutine on the process-wide event loop.
+    
+    Async singletons (the pooled GitHub HTTP client, the Gemini aio
+    client, rate-limiter locks) are bound to the loop that first used
+    them, so scripts running several commands reuse one loop instead of
+    creating one per `asyncio.run` call. The loop is a uvloop loop when
+    uvloop is installed.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    global _loop
+    
+    if _loop is None or _loop.is_closed():
+        _loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+def close_loop() -> None:
+    """Cancel leftover tasks, close shared clients and close the loop."""
+    global _loop
     
-    # Handle no command
-    if not args.command:
-        parser.print_help()
+    if _loop is None or _loop.is_closed():
+        return
+    
+    pending = asyncio.all_tasks(_loop)
+    for task in pending:
+        task.cancel()
+    if pending:
+        _loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    
+    if "tools._github_http" in sys.modules:
+        _loop.run_until_complete(sys.modules["tools._github_http"].close_github_http())
+    
+    _loop.run_until_complete(_loop.shutdown_asyncgens())
+    _loop.close()
+    _loop = None
+
+
+def main():
+    """Main entry point for the CLI."""
+    argv = sys.argv[1:]
+    
+    # Top-level help needs neither settings nor argparse
+    if not argv or argv[0] in ("-h", "--help"):
+        print_banner()
+        sys.stdout.write(_USAGE)
         sys.exit(0)
     
+    # Parse command-line arguments (argparse exits on help or errors)
+    args = parse_cli(argv)
+    if args is None:
+        args = build_parser().parse_args()
+    
+    # Validate configuration before running anything
+    from config.settings import get_settings
+    from observability.logger import get_logger
+    
+    if not get_settings().validate():
+        emit(
+            "\n❌ Configuration error. Please check your .env file.",
+            "   Copy .env.example to .env and add your GOOGLE_API_KEY"
+        )
+        sys.exit(1)
+    
+    # Show banner
+    print_banner()
+    
     # Route to appropriate command handler
+    handler = COMMANDS[args.command]
+    
     try:
-        if args.command == "review-pr":
-            asyncio.run(cmd_review_pr(args))
-        elif args.command == "triage-issue":
-            asyncio.run(cmd_triage_issue(args))
-        elif args.command == "update-docs":
-            asyncio.run(cmd_update_docs(args))
-        elif args.command == "interactive":
-            asyncio.run(cmd_interactive(args))
-        else:
-            parser.print_help()
-            sys.exit(1)
+        run_async(handler(args))
     
     except KeyboardInterrupt:
-        print("\n\n👋 Interrupted. Goodbye!")
+        emit("\n\n👋 Interrupted. Goodbye!")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Command failed: {e}", error=e, command=args.command)
-        print(f"\n❌ Error: {e}")
+        get_logger("MainCLI").error(f"Command failed: {e}", error=e, command=args.command)
+        emit(f"\n❌ Error: {e}")
         sys.exit(1)
+    finally:
+        close_loop()
 
 
 if __name__ == "__main__":
     main()
-
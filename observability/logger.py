@@ -9,45 +9,123 @@ This module provides structured logging capabilities to track:
 - Errors and warnings
 """
 
+import atexit
 import logging
+import logging.handlers
 import json
-from datetime import datetime
+import queue
+import sys
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
-from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
 
 from config.settings import get_settings
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
 settings = get_settings()
 
 
-class LogLevel(Enum):
-    """Log level enumeration."""
-    DEBUG = "DEBUG"
-    INFO = "INFO"
-    WARNING = "WARNING"
-    ERROR = "ERROR"
-    CRITICAL = "CRITICAL"
+# (second, "YYYY-MM-DDTHH:MM:SS") of the last timestamp formatted
+_ts_cache = [0, ""]
 
 
-class AgentLogger:
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp; the date/time part is formatted once a second."""
+    now = time.time()
+    sec = int(now)
+    if sec != _ts_cache[0]:
+        _ts_cache[0] = sec
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+    return f"{_ts_cache[1]}.{int((now - sec) * 1e6):06d}"
+
+
+_MAX_LOGGED_RESULT = 500  # approximate characters
+
+
+def _budget_left(value: Any, budget: int = _MAX_LOGGED_RESULT) -> int:
     """
-    Structured logger for agent activities with support for
-    real-time dashboard updates and file logging.
+    Estimate whether `value` serializes to fewer than `budget` characters.
+    
+    Walks containers and stops as soon as the budget is spent, so large
+    tool results are rejected without being converted to a string.
+    
+    Returns:
+        Remaining budget, or -1 if `value` is too large
     """
+    if isinstance(value, (str, bytes)):
+        budget -= len(value) + 2
+    elif isinstance(value, dict):
+        budget -= 2
+        for key, item in value.items():
+            if budget < 0:
+                return -1
+            budget = _budget_left(item, budget - len(str(key)) - 4)
+    elif isinstance(value, (list, tuple)):
+        budget -= 2
+        for item in value:
+            if budget < 0:
+                return -1
+            budget = _budget_left(item, budget - 2)
+    else:
+        budget -= 8  # numbers, booleans, None
+    return budget if budget >= 0 else -1
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """Serialize structured log data (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, default=str)
+
+
+class _StructuredFormatter(logging.Formatter):
+    """
+    Formats AgentLogger records as "time - name - LEVEL - message | {json}".
     
-    def __init__(self, name: str = "GitHubAgents"):
-        """
-        Initialize the agent logger.
-        
-        Args:
-            name: Logger name
-        """
-        self.name = name
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, settings.LOG_LEVEL))
+    AgentLogger records carry their JSON-encoded fields in
+    `record.structured` and are rendered with one f-string; the date part
+    is formatted once per second. Other records use the standard
+    %-style format.
+    """
+    
+    def __init__(self):
+        super().__init__(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        self._time_cache = (-1, "")
+    
+    def format(self, record: logging.LogRecord) -> str:
+        structured = getattr(record, "structured", None)
+        if structured is None:
+            return super().format(record)
         
+        sec = int(record.created)
+        if sec != self._time_cache[0]:
+            self._time_cache = (sec, time.strftime(self.datefmt, self.converter(sec)))
+        return (
+            f"{self._time_cache[1]} - {record.name} - {record.levelname} - "
+            f"{record.msg} | {structured}"
+        )
+
+
+# Handler shared by every AgentLogger. Records are queued in memory and
+# written to the log file and console by a QueueListener thread, so logging
+# never blocks the event loop on a write().
+_handlers = None
+
+
+def _get_handlers() -> List[logging.Handler]:
+    """Create the shared handlers (and start the writer thread) on first use."""
+    global _handlers
+    
+    if _handlers is None:
         # Create logs directory if it doesn't exist
+        settings.ensure_dirs()
         log_path = Path(settings.LOG_FILE)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -60,56 +138,191 @@ class AgentLogger:
         console_handler.setLevel(logging.INFO)
         
         # Formatter for structured logs
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        formatter = _StructuredFormatter()
         
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        # Add handlers
+        log_queue: queue.Queue = queue.Queue(-1)
+        listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)  # drains the queue before exit
+        
+        _handlers = [logging.handlers.QueueHandler(log_queue)]
+    
+    return _handlers
+
+
+# Callbacks receiving every structured entry (e.g. a live dashboard)
+_subscribers: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def subscribe(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Receive every structured log entry from now on.
+    
+    Entries are only built while at least one subscriber is attached.
+    
+    Args:
+        callback: Called with each entry dict (timestamp, level, logger,
+            message and the event fields)
+    """
+    _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Stop delivering entries to a subscriber.
+    
+    Args:
+        callback: Callback passed to `subscribe`
+    """
+    if callback in _subscribers:
+        _subscribers.remove(callback)
+
+
+def _interpolate(message: str, args: tuple) -> str:
+    """
+    %-format `args` into `message` like LogRecord.getMessage, but never raise.
+    
+    A message whose placeholders do not match its args is returned as is,
+    followed by the args.
+    """
+    if not args:
+        return message
+    try:
+        return message % args
+    except (TypeError, ValueError):
+        return f"{message} {args!r}"
+
+
+def _publish(entry: Dict[str, Any]) -> None:
+    for callback in list(_subscribers):
+        try:
+            callback(entry)
+        except Exception:
+            pass  # a broken subscriber must not break logging
+
+
+class AgentLogger:
+    """
+    Structured logger for agent activities with support for
+    real-time dashboard updates and file logging.
+    """
+    
+    def __init__(self, name: str = "GitHubAgents"):
+        """
+        Initialize the agent logger.
+        
+        Args:
+            name: Logger name
+        """
+        self.name = sys.intern(name)  # copied into every entry
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(getattr(logging, settings.LOG_LEVEL))
+        # logging.getLogger caches by name: attach handlers only once
         if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+            for handler in _get_handlers():
+                self.logger.addHandler(handler)
+    
+    def _emit(
+        self, level: int, message: str, data: Dict[str, Any], args: tuple = ()
+    ) -> None:
+        """
+        Hand a record straight to the handlers.
+        
+        Building the record with makeRecord skips Logger._log's caller
+        lookup (a stack walk per call); the fields are encoded here, on
+        the calling thread, so later mutation of `data` cannot leak in.
+        `args` are %-interpolated into `message` by the handler.
+        """
+        record = self.logger.makeRecord(
+            self.name, level, "", 0, message, args, None,
+            extra={"structured": _dumps(data)}
+        )
+        self.logger.handle(record)
+    
+    def _entry(
+        self, level: str, message: str, data: Dict[str, Any], args: tuple = ()
+    ) -> Dict[str, Any]:
+        """Build the structured entry handed to subscribers."""
+        return {
+            "timestamp": _utc_timestamp(),
+            "level": level,
+            "logger": self.name,
+            "message": _interpolate(message, args),
+            **data
+        }
+    
+    # Per-level fast paths used by the helpers below: the level is fixed,
+    # so there is no enum lookup, and encoding (and %-interpolation of
+    # `args`) is skipped when filtered out
+    
+    def _debug(self, message: str, data: Dict[str, Any], args: tuple = ()) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._emit(logging.DEBUG, message, data, args)
+        if _subscribers:
+            _publish(self._entry("DEBUG", message, data, args))
+    
+    def _info(self, message: str, data: Dict[str, Any], args: tuple = ()) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, message, data, args)
+        if _subscribers:
+            _publish(self._entry("INFO", message, data, args))
+    
+    def _warning(self, message: str, data: Dict[str, Any], args: tuple = ()) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, message, data, args)
+        if _subscribers:
+            _publish(self._entry("WARNING", message, data, args))
+    
+    def _error(self, message: str, data: Dict[str, Any], args: tuple = ()) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, message, data, args)
+        if _subscribers:
+            _publish(self._entry("ERROR", message, data, args))
+    
+    def is_enabled(self, level: int = logging.INFO) -> bool:
+        """
+        Check whether an entry at `level` would be recorded anywhere.
+        
+        Lets callers skip building expensive log data up front.
+        
+        Args:
+            level: Standard logging level
+            
+        Returns:
+            True if a handler or a subscriber would receive the entry
+        """
+        return bool(_subscribers) or self.logger.isEnabledFor(level)
     
     def _log_structured(
         self, 
-        level: LogLevel, 
+        level: int, 
         message: str, 
         **kwargs: Any
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
-        Create structured log entry.
+        Log a structured entry at any level.
         
         Args:
-            level: Log level
+            level: Standard logging level (logging.INFO, ...)
             message: Log message
             **kwargs: Additional structured data
-            
-        Returns:
-            Dict containing the structured log entry
         """
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": level.value,
-            "logger": self.name,
-            "message": message,
-            **kwargs
-        }
-        
-        # Log to file/console
-        log_method = getattr(self.logger, level.value.lower())
-        log_method(f"{message} | {json.dumps(kwargs)}")
-        
-        return log_entry
+        if self.logger.isEnabledFor(level):
+            self._emit(level, message, kwargs)
+        if _subscribers:
+            _publish(self._entry(logging.getLevelName(level), message, kwargs))
     
     def agent_started(
         self, 
         agent_name: str, 
         agent_type: str, 
         **kwargs: Any
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
         Log agent start event.
         
@@ -117,17 +330,15 @@ class AgentLogger:
             agent_name: Name of the agent
             agent_type: Type of agent (Sequential, Parallel, Loop, etc.)
             **kwargs: Additional context
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.INFO,
+        self._info(
             f"Agent started: {agent_name}",
-            event_type="agent_started",
-            agent_name=agent_name,
-            agent_type=agent_type,
-            **kwargs
+            {
+                "event_type": "agent_started",
+                "agent_name": agent_name,
+                "agent_type": agent_type,
+                **kwargs
+            }
         )
     
     def agent_completed(
@@ -135,7 +346,7 @@ class AgentLogger:
         agent_name: str, 
         duration: float, 
         **kwargs: Any
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
         Log agent completion event.
         
@@ -143,17 +354,15 @@ class AgentLogger:
             agent_name: Name of the agent
             duration: Execution duration in seconds
             **kwargs: Additional context
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.INFO,
+        self._info(
             f"Agent completed: {agent_name}",
-            event_type="agent_completed",
-            agent_name=agent_name,
-            duration_seconds=duration,
-            **kwargs
+            {
+                "event_type": "agent_completed",
+                "agent_name": agent_name,
+                "duration_seconds": duration,
+                **kwargs
+            }
         )
     
     def tool_called(
@@ -161,7 +370,7 @@ class AgentLogger:
         tool_name: str, 
         parameters: Dict[str, Any],
         agent_name: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
         Log tool call event.
         
@@ -169,17 +378,15 @@ class AgentLogger:
             tool_name: Name of the tool being called
             parameters: Tool parameters
             agent_name: Name of the calling agent
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.INFO,
+        self._info(
             f"Tool called: {tool_name}",
-            event_type="tool_called",
-            tool_name=tool_name,
-            parameters=parameters,
-            agent_name=agent_name
+            {
+                "event_type": "tool_called",
+                "tool_name": tool_name,
+                "parameters": parameters,
+                "agent_name": agent_name
+            }
         )
     
     def tool_response(
@@ -188,7 +395,7 @@ class AgentLogger:
         status: str,
         duration: float,
         result: Optional[Any] = None
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
         Log tool response event.
         
@@ -197,9 +404,6 @@ class AgentLogger:
             status: Response status (success/error)
             duration: Call duration in seconds
             result: Tool result (optional, may be large)
-            
-        Returns:
-            Structured log entry
         """
         log_data = {
             "event_type": "tool_response",
@@ -208,14 +412,10 @@ class AgentLogger:
             "duration_seconds": duration
         }
         
-        if result is not None and len(str(result)) < 500:
+        if result is not None and _budget_left(result) >= 0:
             log_data["result"] = result
         
-        return self._log_structured(
-            LogLevel.INFO,
-            f"Tool response: {tool_name} ({status})",
-            **log_data
-        )
+        self._info(f"Tool response: {tool_name} ({status})", log_data)
     
     def a2a_request(
         self, 
@@ -223,7 +423,7 @@ class AgentLogger:
         target_service: str,
         endpoint: str,
         payload: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
         Log A2A protocol request.
         
@@ -232,18 +432,16 @@ class AgentLogger:
             target_service: Target service name
             endpoint: API endpoint
             payload: Request payload
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.INFO,
+        self._info(
             f"A2A Request: {source_service} → {target_service}",
-            event_type="a2a_request",
-            source_service=source_service,
-            target_service=target_service,
-            endpoint=endpoint,
-            payload=payload
+            {
+                "event_type": "a2a_request",
+                "source_service": source_service,
+                "target_service": target_service,
+                "endpoint": endpoint,
+                "payload": payload
+            }
         )
     
     def a2a_response(
@@ -252,7 +450,7 @@ class AgentLogger:
         target_service: str,
         status_code: int,
         duration: float
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
         Log A2A protocol response.
         
@@ -261,18 +459,16 @@ class AgentLogger:
             target_service: Target service name
             status_code: HTTP status code
             duration: Request duration in seconds
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.INFO,
+        self._info(
             f"A2A Response: {target_service} → {source_service} ({status_code})",
-            event_type="a2a_response",
-            source_service=source_service,
-            target_service=target_service,
-            status_code=status_code,
-            duration_seconds=duration
+            {
+                "event_type": "a2a_response",
+                "source_service": source_service,
+                "target_service": target_service,
+                "status_code": status_code,
+                "duration_seconds": duration
+            }
         )
     
     def memory_access(
@@ -281,7 +477,7 @@ class AgentLogger:
         key: str,
         service: str = "DatabaseSessionService",
         **kwargs: Any
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
         Log memory access event.
         
@@ -290,36 +486,34 @@ class AgentLogger:
             key: Memory key accessed
             service: Memory service name
             **kwargs: Additional context
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.DEBUG,
+        self._debug(
             f"Memory {operation}: {key}",
-            event_type="memory_access",
-            operation=operation,
-            key=key,
-            service=service,
-            **kwargs
+            {
+                "event_type": "memory_access",
+                "operation": operation,
+                "key": key,
+                "service": service,
+                **kwargs
+            }
         )
     
     def error(
         self, 
         message: str, 
+        *args: Any,
         error: Optional[Exception] = None,
         **kwargs: Any
-    ) -> Dict[str, Any]:
+    ) -> None:
         """
         Log error event.
         
         Args:
-            message: Error message
-            error: Exception object
+            message: Error message, optionally with %-style placeholders
+            *args: Values for the placeholders, interpolated only if the
+                entry is recorded
+            error: Exception object (keyword-only)
             **kwargs: Additional context
-            
-        Returns:
-            Structured log entry
         """
         error_data = {"event_type": "error", **kwargs}
         
@@ -327,84 +521,92 @@ class AgentLogger:
             error_data["error_type"] = type(error).__name__
             error_data["error_message"] = str(error)
         
-        return self._log_structured(
-            LogLevel.ERROR,
-            message,
-            **error_data
-        )
+        self._error(message, error_data, args)
     
-    def warning(self, message: str, **kwargs: Any) -> Dict[str, Any]:
+    def warning(self, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log warning event.
         
         Args:
-            message: Warning message
+            message: Warning message, optionally with %-style placeholders
+            *args: Values for the placeholders, interpolated only if the
+                entry is recorded
             **kwargs: Additional context
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.WARNING,
+        self._warning(
             message,
-            event_type="warning",
-            **kwargs
+            {
+                "event_type": "warning",
+                **kwargs
+            },
+            args
         )
     
-    def debug(self, message: str, **kwargs: Any) -> Dict[str, Any]:
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log debug event.
         
         Args:
-            message: Debug message
+            message: Debug message, optionally with %-style placeholders
+            *args: Values for the placeholders, interpolated only if the
+                entry is recorded
             **kwargs: Additional context
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.DEBUG,
+        self._debug(
             message,
-            event_type="debug",
-            **kwargs
+            {
+                "event_type": "debug",
+                **kwargs
+            },
+            args
         )
     
-    def info(self, message: str, **kwargs: Any) -> Dict[str, Any]:
+    def info(self, message: str, *args: Any, **kwargs: Any) -> None:
         """
         Log info event.
         
         Args:
-            message: Info message
+            message: Info message, optionally with %-style placeholders
+            *args: Values for the placeholders, interpolated only if the
+                entry is recorded
             **kwargs: Additional context
-            
-        Returns:
-            Structured log entry
         """
-        return self._log_structured(
-            LogLevel.INFO,
+        self._info(
             message,
-            event_type="info",
-            **kwargs
+            {
+                "event_type": "info",
+                **kwargs
+            },
+            args
         )
 
 
 # Global logger instance
 logger = AgentLogger("GitHubAgents")
 
+# One AgentLogger per name
+_instances: Dict[str, AgentLogger] = {"GitHubAgents": logger}
+
 
 def get_logger(name: Optional[str] = None) -> AgentLogger:
     """
     Get a logger instance.
     
+    Repeated calls with the same name return the same instance.
+    
     Args:
         name: Optional logger name
         
     Returns:
         AgentLogger instance
     """
-    if name:
-        return AgentLogger(name)
-    return logger
+    if not name:
+        return logger
+    
+    instance = _instances.get(name)
+    if instance is None:
+        instance = _instances[name] = AgentLogger(name)
+    return instance
 
 
 if __name__ == "__main__":
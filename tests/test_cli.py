@@ -0,0 +1,107 @@
+"""
+Tests for the argparse-free command line fast path in main.py.
+
+`parse_cli` must either produce exactly what `build_parser().parse_args`
+would, or return None so that argparse handles the arguments.
+"""
+
+import io
+import itertools
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import main
+
+
+def argparse_result(argv):
+    """Parse `argv` with the full parser; None if argparse rejects it."""
+    # build_parser() only adds the subparser named in sys.argv[1]
+    with mock.patch.object(sys, "argv", ["main.py", *argv]), \
+            redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        try:
+            return vars(main.build_parser().parse_args(argv))
+        except SystemExit:
+            return None
+
+
+def fast_result(argv):
+    parsed = main.parse_cli(argv)
+    return vars(parsed) if parsed is not None else None
+
+
+# Tokens each subcommand is fuzzed with: valid values, malformed values,
+# abbreviations, "--" and help
+_TOKENS = {
+    "review-pr": ["o/r", "1", "x", "-1", "--post-comments", "--post", "--", "-h"],
+    "triage-issue": ["o/r", "1", "2", "x", "-3", "--apply-labels", "--apply", "--"],
+    "update-docs": [
+        "text", "-x", "--context", "ctx", "--context=", "--context=a=b",
+        "--output", "out.md", "--out", "--"
+    ],
+    "interactive": ["x", "-h", "--", "--help"],
+}
+
+
+def _argvs(command, max_len=4):
+    for length in range(max_len + 1):
+        for rest in itertools.product(_TOKENS[command], repeat=length):
+            yield [command, *rest]
+
+
+@pytest.mark.parametrize("command", sorted(_TOKENS))
+def test_parse_cli_agrees_with_argparse(command):
+    for argv in _argvs(command):
+        fast = fast_result(argv)
+        if fast is None:
+            continue  # argparse handles it
+        assert fast == argparse_result(argv), argv
+
+
+@pytest.mark.parametrize("argv", [
+    ["review-pr", "o/r", "1"],
+    ["review-pr", "o/r", "1", "--post-comments"],
+    ["review-pr", "--post-comments", "o/r", "1"],
+    ["triage-issue", "o/r", "1"],
+    ["triage-issue", "o/r", "1", "2", "3", "--apply-labels"],
+    ["triage-issue", "--apply-labels", "o/r", "1", "2"],
+    ["update-docs", "README.md"],
+    ["update-docs", "README.md", "--context", "setup", "--output", "out.md"],
+    ["update-docs", "--context=setup", "README.md"],
+    ["interactive"],
+])
+def test_common_invocations_skip_argparse(argv):
+    fast = fast_result(argv)
+    assert fast is not None
+    assert fast == argparse_result(argv)
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["unknown"],
+    ["review-pr", "--help"],
+    ["review-pr", "o/r"],
+    ["review-pr", "o/r", "one"],
+    ["triage-issue", "o/r"],
+    ["triage-issue", "o/r", "1", "--apply-labels", "2"],
+    ["update-docs"],
+    ["update-docs", "README.md", "--context"],
+    ["update-docs", "README.md", "--context", "--output"],
+    ["interactive", "extra"],
+])
+def test_unusual_invocations_fall_back(argv):
+    assert main.parse_cli(argv) is None
+
+
+def test_rejected_invocations_never_parse():
+    for command in _TOKENS:
+        for argv in _argvs(command):
+            if argparse_result(argv) is None:
+                assert fast_result(argv) is None, argv
@@ -0,0 +1,98 @@
+"""
+Tests for the diff reduction done by get_pr_diff_compact.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import tools.custom_tools as custom_tools
+from tools.custom_tools import _split_hunks, get_pr_diff_compact
+
+_PATCH = """@@ -1,2 +1,3 @@
+ import os
++import sys
+@@ -10,3 +11,4 @@ def main():
+-    run()
++    password = os.environ["PASSWORD"]
++    run(password)"""
+
+
+def _diff_file(filename, patch=_PATCH):
+    return {
+        "filename": filename,
+        "status": "modified",
+        "additions": 3,
+        "deletions": 1,
+        "patch": patch
+    }
+
+
+def _compact(files, **kwargs):
+    async def fake_get_pr_diff(repo, pr_number):
+        return {"status": "success", "files": files}
+
+    with mock.patch.object(custom_tools, "get_pr_diff", fake_get_pr_diff):
+        return asyncio.run(get_pr_diff_compact("o/r", 1, **kwargs))
+
+
+def test_split_hunks():
+    hunks = _split_hunks(_PATCH)
+    assert [h["start_line"] for h in hunks] == [1, 11]
+    assert hunks[0]["patch"] == "@@ -1,2 +1,3 @@\n import os\n+import sys"
+    assert hunks[1]["patch"].endswith("run(password)")
+
+
+def test_split_hunks_without_headers():
+    assert _split_hunks("") == []
+    assert _split_hunks("Binary files differ") == []
+
+
+def test_compact_skips_lockfiles_and_generated_files():
+    result = _compact([
+        _diff_file("src/app.py"),
+        _diff_file("poetry.lock"),
+        _diff_file("dist/app.min.js"),
+    ])
+    assert result["status"] == "success"
+    assert [f["file"] for f in result["files"]] == ["src/app.py"]
+    assert result["skipped_files"] == ["poetry.lock", "dist/app.min.js"]
+
+
+def test_compact_custom_skip_patterns():
+    result = _compact([_diff_file("src/app.py"), _diff_file("poetry.lock")],
+                      skip_patterns=["src/*"])
+    assert [f["file"] for f in result["files"]] == ["poetry.lock"]
+
+
+def test_compact_truncates_per_file():
+    result = _compact([_diff_file("src/app.py")], max_lines_per_file=5)
+    (compact,) = result["files"]
+    assert compact["truncated"] is True
+    assert [h["start_line"] for h in compact["hunks"]] == [1, 11]
+    assert compact["hunks"][1]["patch"] == "@@ -10,3 +11,4 @@ def main():\n-    run()"
+
+
+def test_compact_security_only():
+    result = _compact(
+        [_diff_file("src/app.py"), _diff_file("README.md", "@@ -1 +1 @@\n-a\n+b")],
+        security_only=True
+    )
+    (compact,) = result["files"]
+    assert compact["file"] == "src/app.py"
+    assert [h["start_line"] for h in compact["hunks"]] == [11]
+    assert compact["truncated"] is False
+
+
+def test_compact_passes_errors_through():
+    async def failing_get_pr_diff(repo, pr_number):
+        return {"status": "error", "error_message": "boom"}
+
+    with mock.patch.object(custom_tools, "get_pr_diff", failing_get_pr_diff):
+        result = asyncio.run(get_pr_diff_compact("o/r", 1))
+    assert result == {"status": "error", "error_message": "boom"}
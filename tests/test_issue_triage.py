@@ -0,0 +1,108 @@
+"""
+Tests for the model-free parts of the issue triage pipeline.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.issue_triage import (
+    CATEGORIES,
+    _parse_batch_triage,
+    build_labels,
+    fast_classify
+)
+
+
+@pytest.mark.parametrize("title, category", [
+    ("[BUG] Login fails", "bug"),
+    ("[Feature Request] Dark mode", "feature"),
+    ("[enhancement] Faster search", "enhancement"),
+    ("[Docs] Typo in README", "docs"),
+    ("[documentation] Add API guide", "docs"),
+    ("[Security] Token leak", "security"),
+])
+def test_fast_classify_title_tag(title, category):
+    result = fast_classify(title, "")
+    assert result["category"] == category
+    assert result["confidence"] == 0.95
+    assert result["labels"] == [category, result["priority"]]
+
+
+def test_fast_classify_uses_the_classifier_vocabulary():
+    for tag in ("bug", "feature", "enhancement", "doc", "docs", "documentation",
+                "question", "security", "performance"):
+        assert fast_classify(f"[{tag}] x", "")["category"] in CATEGORIES
+
+
+def test_fast_classify_body_templates():
+    bug = fast_classify("Crash on save", "## Steps to Reproduce\n1. Save")
+    assert bug["category"] == "bug"
+    assert bug["priority"] == "high"  # "crash" is urgent
+    assert bug["confidence"] == 0.9
+
+    feature = fast_classify("Export", "It would be nice to export CSV")
+    assert feature["category"] == "feature"
+    assert feature["priority"] == "medium"
+
+
+def test_fast_classify_default_priorities():
+    assert fast_classify("[docs] Typo", "")["priority"] == "low"
+    assert fast_classify("[security] XSS", "")["priority"] == "high"
+
+
+@pytest.mark.parametrize("title, body", [
+    ("Something is off", "Not sure what happens"),
+    # Both bug and feature templates: ambiguous
+    ("Export", "## Steps to Reproduce\nfeature request"),
+])
+def test_fast_classify_leaves_the_rest_to_the_agents(title, body):
+    assert fast_classify(title, body) is None
+
+
+def test_build_labels_merges_and_deduplicates():
+    category = {"primary_category": "bug", "secondary": ["backend", "bug"], "reasoning": "r"}
+    priority = {"priority": "high", "urgency_labels": ["backend", "regression"],
+                "recommendation": "fix"}
+    result = build_labels(category, priority)
+    assert result == {
+        "category": "bug",
+        "priority": "high",
+        "labels": ["bug", "high", "backend", "regression"],
+        "reasoning": "r",
+        "recommendation": "fix"
+    }
+
+
+def test_build_labels_accepts_json_text_and_garbage():
+    result = build_labels(json.dumps({"primary_category": "docs"}), "not json")
+    assert result["category"] == "docs"
+    assert result["priority"] is None
+    assert result["labels"] == ["docs"]
+
+
+def test_parse_batch_triage_orders_by_request():
+    answer = json.dumps([
+        {"issue_number": 2, "labels": ["bug"]},
+        {"issue_number": 1, "labels": ["docs"]},
+    ])
+    parsed = _parse_batch_triage(answer, [1, 2])
+    assert [item["issue_number"] for item in parsed] == [1, 2]
+
+
+@pytest.mark.parametrize("answer", [
+    "not json",
+    json.dumps({"issue_number": 1}),
+    json.dumps([{"issue_number": 1}]),  # issue 2 missing
+    json.dumps([{"issue_number": 1}, {"issue_number": 2}, {"issue_number": 3}]),
+    json.dumps([{"issue_number": "1"}, {"issue_number": 2}]),
+    None,
+])
+def test_parse_batch_triage_rejects_unusable_answers(answer):
+    assert _parse_batch_triage(answer, [1, 2]) is None
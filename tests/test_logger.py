@@ -0,0 +1,42 @@
+"""
+Tests for the structured entries AgentLogger hands to subscribers.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from observability.logger import get_logger, subscribe, unsubscribe
+
+
+@pytest.fixture
+def entries():
+    received = []
+    subscribe(received.append)
+    yield received
+    unsubscribe(received.append)
+
+
+def test_args_are_interpolated(entries):
+    get_logger("TestLogger").debug("Fetched %s items from %s", 3, "cache")
+    assert entries[-1]["message"] == "Fetched 3 items from cache"
+
+
+def test_message_without_args_is_left_alone(entries):
+    get_logger("TestLogger").debug("100% done")
+    assert entries[-1]["message"] == "100% done"
+
+
+@pytest.mark.parametrize("message, args, expected", [
+    ("no placeholder", (1,), "no placeholder (1,)"),
+    ("%d items", ("x",), "%d items ('x',)"),
+    ("100%", (1,), "100% (1,)"),
+])
+def test_mismatched_args_fall_back_to_the_raw_message(entries, message, args, expected):
+    get_logger("TestLogger").debug(message, *args)
+    assert entries[-1]["message"] == expected
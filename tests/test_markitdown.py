@@ -0,0 +1,97 @@
+"""
+Tests for the markdown section splitter and the section-based document
+tools built on it.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools.markitdown_mcp import MarkitdownMCPClient, split_sections
+
+
+def test_splits_on_top_level_headings():
+    markdown = "# Title\n\nIntro\n\n## Setup\n\nSteps\n\n### Detail\n\nMore\n\n## Usage\n"
+    assert split_sections(markdown) == (
+        ("Title", "Intro"),
+        ("Setup", "Steps\n\n### Detail\n\nMore"),
+        ("Usage", ""),
+    )
+
+
+def test_text_before_the_first_heading():
+    assert split_sections("Preamble\n# Title\nBody") == (
+        ("", "Preamble"),
+        ("Title", "Body"),
+    )
+
+
+def test_heading_text_is_trimmed():
+    assert split_sections("##   Spaced   \nx") == (("Spaced", "x"),)
+
+
+def test_not_headings():
+    markdown = "#NoSpace\n    # indented code\ntext # inline"
+    assert split_sections(markdown) == (("", markdown),)
+
+
+def test_empty():
+    assert split_sections("") == ()
+    assert split_sections("\n\n") == ()
+
+
+_DOC = """
+# Design
+
+## Technology Stack
+
+### Backend
+- **Language**: Go 1.22
+- **Database**: SQLite
+
+### Why SQLite?
+1. **Embedded**: No server to run
+2. **Portable**: One file
+
+## Security
+
+- Tokens expire after 1 hour
+- **Secrets**: kept in a vault
+
+## Roadmap
+
+Nothing about authentication here.
+"""
+
+
+def test_extract_key_information_walks_sections():
+    client = MarkitdownMCPClient()
+    key_info = client.extract_key_information(_DOC, split_sections(_DOC))
+    assert key_info["sections"] == ["Design", "Technology Stack", "Security", "Roadmap"]
+    assert key_info["technologies"] == {"language": "Go 1.22", "database": "SQLite"}
+    assert key_info["key_decisions"] == [{
+        "topic": "Why SQLite?",
+        "decision": "SQLite",
+        "reasons": ["Embedded", "Portable"]
+    }]
+    assert key_info["security_guidelines"] == [
+        "Tokens expire after 1 hour",
+        "Secrets: kept in a vault"
+    ]
+
+
+def test_answer_names_the_matching_section():
+    client = MarkitdownMCPClient()
+    result = client.answer_question_from_document(_DOC, "What about authentication?")
+    assert result["section"] == "Roadmap"
+    assert "JWT" in result["answer"]
+
+
+def test_answer_skips_topics_missing_from_the_document():
+    client = MarkitdownMCPClient()
+    result = client.answer_question_from_document(_DOC, "What is the API design?")
+    assert result["section"] is None
+    assert result["answer"] == "Information not found in document."
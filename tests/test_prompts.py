@@ -0,0 +1,53 @@
+"""
+Tests for the pre-compiled `{state_key}` instruction templates.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.prompts import PROMPTS_DIR, compile_instruction, load_instruction, load_prompt
+
+
+def _context(**state):
+    return SimpleNamespace(state=state)
+
+
+def test_fills_required_and_optional_keys():
+    provider = compile_instruction("Doc: {doc}\nCritique: {critique?}.")
+    assert provider(_context(doc="text", critique="ok")) == "Doc: text\nCritique: ok."
+    assert provider(_context(doc="text")) == "Doc: text\nCritique: ."
+
+
+def test_missing_required_key_raises():
+    provider = compile_instruction("Doc: {doc}")
+    with pytest.raises(KeyError):
+        provider(_context())
+
+
+def test_non_placeholder_braces_are_kept():
+    template = 'Answer as {"key": 1} or { spaced } or {1abc}; {x}{x}'
+    assert compile_instruction(template)(_context(x=2)) == (
+        'Answer as {"key": 1} or { spaced } or {1abc}; 22'
+    )
+
+
+def test_values_are_stringified():
+    assert compile_instruction("{n} items")(_context(n=3)) == "3 items"
+
+
+def test_template_without_placeholders():
+    assert compile_instruction("static")(_context()) == "static"
+
+
+def test_every_prompt_file_loads():
+    for path in PROMPTS_DIR.glob("*.md"):
+        text = load_prompt(path.stem)
+        assert text and not text.endswith("\n")
+        load_instruction(path.stem)
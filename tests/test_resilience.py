@@ -0,0 +1,168 @@
+"""
+Tests for the circuit breaker, rate limiter and single-flight helpers.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import agents._resilience as resilience
+from agents._cache import SingleFlight
+from agents._resilience import CircuitBreaker, CircuitOpenError, TokenBucket, guarded_call
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with mock.patch.object(resilience.time, "monotonic", fake):
+        yield fake
+
+
+def test_circuit_opens_at_threshold(clock):
+    breaker = CircuitBreaker("test", fail_threshold=3, reset_after=10)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("test", fail_threshold=2, reset_after=10)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow()
+
+
+def test_half_open_admits_a_single_probe(clock):
+    breaker = CircuitBreaker("test", fail_threshold=1, reset_after=10)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()       # the probe
+    assert not breaker.allow()   # everyone else waits for it
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("test", fail_threshold=1, reset_after=10)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    clock.now += 9
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_silent_probe_is_replaced_after_the_window(clock):
+    breaker = CircuitBreaker("test", fail_threshold=1, reset_after=10)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    clock.now += 10
+    assert breaker.allow()
+
+
+def test_guarded_call_counts_only_call_failures():
+    breaker = CircuitBreaker("test", fail_threshold=1, reset_after=60)
+
+    async def fail():
+        raise ValueError("boom")
+
+    async def succeed():
+        return "ok"
+
+    async def scenario():
+        assert await guarded_call(succeed) == "ok"
+        with pytest.raises(ValueError):
+            await guarded_call(fail)
+        with pytest.raises(CircuitOpenError):
+            await guarded_call(succeed)
+
+    with mock.patch.object(resilience, "gemini_circuit", breaker), \
+            mock.patch.object(resilience, "gemini_rate_limit", TokenBucket(0)):
+        asyncio.run(scenario())
+
+
+def test_token_bucket_limits_the_rate():
+    async def scenario():
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # One token up front, then one every 50ms
+    assert 0.08 <= asyncio.run(scenario()) < 0.5
+
+
+def test_single_flight_shares_one_call():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        again = await flight.do("key", work)
+        return results, again
+
+    results, again = asyncio.run(scenario())
+    assert results == ["result"] * 5
+    assert again == "result"
+    assert len(calls) == 2  # the later call is not coalesced with the finished one
+
+
+def test_single_flight_propagates_errors_to_all_waiters():
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            *(flight.do("key", work) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_single_flight_cancelled_waiter_keeps_the_call():
+    async def work():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def scenario():
+        flight = SingleFlight()
+        owner = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await owner
+
+    assert asyncio.run(scenario()) == "result"
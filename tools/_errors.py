@@ -0,0 +1,60 @@
+"""
+Error handling shared by the tool functions.
+
+Tools never raise into the agent: a failure is logged and returned as
+{"status": "error", "error_message": ...} so the model can read it.
+`tool_errors` applies that contract once per tool instead of each body
+carrying its own try/except.
+"""
+
+import asyncio
+import functools
+from typing import Any, Callable, Dict, TypeVar
+
+from observability.logger import AgentLogger
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _error_result(logger: AgentLogger, message: str, error: Exception) -> Dict[str, Any]:
+    logger.error(f"{message}: {error}", error=error)
+    return {
+        "status": "error",
+        "error_message": f"{message}: {str(error)}"
+    }
+
+
+def tool_errors(logger: AgentLogger, message: str) -> Callable[[F], F]:
+    """
+    Turn exceptions raised by a tool into an error result.
+
+    Works for sync and async functions and methods. The wrapper keeps the
+    tool's name, docstring and signature, which ADK reads to build the
+    function declaration.
+
+    Args:
+        logger: Logger of the tool's module
+        message: Error message prefix, e.g. "Failed to get PR details"
+
+    Returns:
+        Decorator
+    """
+    def decorate(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    return _error_result(logger, message, e)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return _error_result(logger, message, e)
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
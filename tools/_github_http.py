@@ -0,0 +1,157 @@
+"""
+Shared HTTP client for the GitHub REST API.
+
+All live GitHub calls made by the tools go through one keep-alive
+`httpx.AsyncClient`, so concurrent tool calls (e.g. the parallel triage
+analyzers, or a batch of triages) reuse pooled connections instead of
+each opening its own TLS session. GET responses are additionally held
+for GITHUB_CACHE_TTL_S seconds, so sibling agents asking for the same
+issue or diff within one run share a single request. The cache is a
+bounded LRU (GITHUB_CACHE_MAXSIZE entries); tools that change GitHub
+state call `invalidate_github_cache` so later reads are not stale.
+
+Live calls are only made when GITHUB_LIVE_API is enabled; otherwise the
+tools keep returning their mock data.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from config.settings import get_settings
+
+settings = get_settings()
+
+
+_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# (path, sorted params) -> (expires_at, payload)
+_response_cache: Dict[Tuple[str, Tuple], Tuple[float, Any]] = {}
+
+
+def _build_client() -> httpx.AsyncClient:
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if settings.GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {settings.GITHUB_TOKEN}"
+
+    return httpx.AsyncClient(
+        base_url=settings.GITHUB_API_URL,
+        headers=headers,
+        limits=_POOL_LIMITS,
+        timeout=30
+    )
+
+
+# Global client instance
+_github_http = None
+
+
+def get_github_http() -> httpx.AsyncClient:
+    """
+    Get or create the shared GitHub HTTP client.
+
+    Returns:
+        httpx.AsyncClient bound to GITHUB_API_URL
+    """
+    global _github_http
+
+    if _github_http is None or _github_http.is_closed:
+        _github_http = _build_client()
+
+    return _github_http
+
+
+async def github_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET a GitHub API path and return the decoded JSON body.
+
+    Args:
+        path: API path, e.g. "/repos/owner/repo/issues/1"
+        params: Optional query parameters
+
+    Returns:
+        Decoded JSON response
+
+    Raises:
+        httpx.HTTPError: On transport errors or non-2xx responses
+    """
+    key = (path, tuple(sorted((params or {}).items())))
+    now = time.monotonic()
+
+    hit = _response_cache.pop(key, None)
+    if hit and hit[0] > now:
+        _response_cache[key] = hit  # re-insert as most recently used
+        return hit[1]
+
+    response = await get_github_http().get(path, params=params)
+    response.raise_for_status()
+    payload = response.json()
+
+    while len(_response_cache) >= settings.GITHUB_CACHE_MAXSIZE:
+        del _response_cache[next(iter(_response_cache))]
+    _response_cache[key] = (now + settings.GITHUB_CACHE_TTL_S, payload)
+    return payload
+
+
+def invalidate_github_cache(path: Optional[str] = None) -> int:
+    """
+    Drop cached GET responses.
+
+    Args:
+        path: Only drop this path and its sub-resources
+            (e.g. "/repos/owner/repo/issues/1"); None drops everything
+
+    Returns:
+        Number of entries dropped
+    """
+    if path is None:
+        count = len(_response_cache)
+        _response_cache.clear()
+        return count
+
+    prefix = path.rstrip("/") + "/"
+    stale = [
+        key for key in _response_cache
+        if key[0] == path or key[0].startswith(prefix)
+    ]
+    for key in stale:
+        del _response_cache[key]
+    return len(stale)
+
+
+async def github_graphql(query: str, variables: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Run a GraphQL query or mutation (never cached).
+
+    Args:
+        query: GraphQL document
+        variables: Query variables
+
+    Returns:
+        The response's `data` member
+
+    Raises:
+        httpx.HTTPError: On transport errors or non-2xx responses
+        RuntimeError: If GitHub reports GraphQL errors
+    """
+    response = await get_github_http().post(
+        "/graphql", json={"query": query, "variables": variables or {}}
+    )
+    response.raise_for_status()
+    payload = response.json()
+    if payload.get("errors"):
+        raise RuntimeError(payload["errors"][0].get("message", "GraphQL error"))
+    return payload["data"]
+
+
+async def close_github_http() -> None:
+    """Close the shared client (e.g. on application shutdown)."""
+    global _github_http
+
+    if _github_http is not None:
+        await _github_http.aclose()
+        _github_http = None
@@ -0,0 +1,42 @@
+"""
+JSON encoding for tool results handed back to the model.
+
+Results that the agents serialize themselves (issue payloads embedded in
+prompts, cached answers, state written into events) go through `dumps`,
+which uses orjson when it is installed and the stdlib otherwise. orjson
+also encodes the records from tools/schemas.py directly, without an
+intermediate dict.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def dumps(obj: Any) -> str:
+    """
+    Encode a tool result as compact JSON.
+
+    Args:
+        obj: JSON-able value; dataclass records are encoded by field
+
+    Returns:
+        JSON text
+
+    Raises:
+        TypeError: If `obj` contains a value that cannot be encoded
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":"))
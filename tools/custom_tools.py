@@ -4,21 +4,149 @@ Custom GitHub operation tools.
 This module provides custom functions for GitHub operations that can be used
 as tools by the AI agents. These are simpler operations that don't require
 MCP integration.
+
+The read tools (`get_pr_details`, `get_pr_diff`, `get_issue_details`,
+`get_repository_info` and their batch variants) are async: with
+GITHUB_LIVE_API set they query the GitHub REST API through the shared
+pooled client in tools/_github_http.py, otherwise they return mock data
+like the others. The batch variants fan out with `asyncio.gather`, so N
+lookups cost one round trip of latency rather than N.
+
+Review comments can be buffered: inside `async with review_batch(repo,
+pr_number)`, `add_review_comment` only queues the comment, and all queued
+comments are posted as one pull request review (a single GraphQL
+mutation when live) on exit.
 """
 
-from typing import Dict, List, Any, Optional
+import asyncio
+import contextvars
+import re
+import sys
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from fnmatch import fnmatch
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, List, Any, Optional
+
+from config.settings import get_settings
 from observability.logger import get_logger
+from tools._errors import tool_errors
+from tools._github_http import (
+    close_github_http, github_get, github_graphql, invalidate_github_cache
+)
+from tools.schemas import IssueDetails, PRDetails, RepoInfo
 
+settings = get_settings()
 logger = get_logger("CustomTools")
 
 
-def get_pr_details(repo: str, pr_number: int) -> Dict[str, Any]:
+# Files whose diffs carry no reviewable signal (lockfiles, generated/vendored code)
+DEFAULT_DIFF_SKIP_PATTERNS = (
+    "*.lock", "*-lock.json", "*.min.js", "*.min.css", "*.map", "*.svg",
+    "dist/*", "build/*", "vendor/*", "node_modules/*",
+)
+
+# Indexed by "has a file path": inline comments are anchored to a file
+_COMMENT_TYPES = ("general", "inline")
+
+_HUNK_HEADER_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@", re.MULTILINE)
+
+# Hunks worth showing the security reviewer
+_SECURITY_RE = re.compile(
+    r"password|passwd|secret|token|api[_-]?key|credential|auth"
+    r"|exec|eval|subprocess|pickle|sql|query|innerhtml",
+    re.IGNORECASE
+)
+
+
+# Mock responses, built once. Per-call fields are filled in with
+# dataclasses.replace; nested diff entries are copied per call.
+_MOCK_PR = PRDetails(
+    pr_number=0,
+    repo="",
+    title="",
+    author="developer123",
+    state="open",
+    files_changed=5,
+    additions=150,
+    deletions=75,
+    commits=3,
+    description="This is a sample pull request for testing.",
+    branch="feature/new-feature",
+    base_branch="main",
+    created_at="2025-01-15T10:00:00Z",
+    updated_at="2025-01-15T14:30:00Z"
+)
+
+_MOCK_DIFF_FILES = (
+    MappingProxyType({
+        "filename": "src/app.py",
+        "status": "modified",
+        "additions": 50,
+        "deletions": 20,
+        "patch": """
+@@ -10,7 +10,7 @@ def authenticate(username, password):
+-    query = f"SELECT * FROM users WHERE name = '{username}'"
++    query = "SELECT * FROM users WHERE name = ?"
++    cursor.execute(query, (username,))
+"""
+    }),
+    MappingProxyType({
+        "filename": "src/auth.py",
+        "status": "modified",
+        "additions": 30,
+        "deletions": 15,
+        "patch": """
+@@ -5,7 +5,7 @@ import os
+-API_KEY = "sk_live_12345"
++API_KEY = os.getenv("API_KEY")
+"""
+    }),
+)
+
+_MOCK_ISSUE = IssueDetails(
+    issue_number=0,
+    repo="",
+    title="",
+    author="user456",
+    state="open",
+    labels=(),
+    description="The application crashes when clicking submit button.",
+    created_at="2025-01-14T09:00:00Z",
+    updated_at="2025-01-14T09:00:00Z",
+    comments=0
+)
+
+_MOCK_REPO = RepoInfo(
+    repo="",
+    name="",
+    owner="",
+    description="A sample repository for testing",
+    language="Python",
+    stars=42,
+    forks=10,
+    open_issues=5,
+    open_prs=3,
+    default_branch="main",
+    topics=("python", "api", "testing")
+)
+
+
+def _mock_issue(repo: str, issue_number: int) -> IssueDetails:
+    """Mock issue, shared by the single and batch lookups."""
+    return replace(
+        _MOCK_ISSUE,
+        issue_number=issue_number,
+        repo=repo,
+        title=f"Issue #{issue_number}: Sample bug"
+    )
+
+
+@tool_errors(logger, "Failed to get PR details")
+async def get_pr_details(repo: str, pr_number: int) -> Dict[str, Any]:
     """
     Get details about a pull request.
     
-    This is a mock implementation for demonstration. In production,
-    this would connect to GitHub API or use GitHub MCP.
-    
     Args:
         repo: Repository name in format "owner/repo"
         pr_number: Pull request number
@@ -28,38 +156,40 @@ def get_pr_details(repo: str, pr_number: int) -> Dict[str, Any]:
     """
     logger.tool_called("get_pr_details", {"repo": repo, "pr_number": pr_number})
     
-    try:
-        # Mock implementation - in production, use GitHub API
-        mock_pr = {
-            "status": "success",
-            "pr_number": pr_number,
-            "repo": repo,
-            "title": f"Sample PR #{pr_number}",
-            "author": "developer123",
-            "state": "open",
-            "files_changed": 5,
-            "additions": 150,
-            "deletions": 75,
-            "commits": 3,
-            "description": "This is a sample pull request for testing.",
-            "branch": "feature/new-feature",
-            "base_branch": "main",
-            "created_at": "2025-01-15T10:00:00Z",
-            "updated_at": "2025-01-15T14:30:00Z"
-        }
-        
+    if settings.GITHUB_LIVE_API:
+        pr = await github_get(f"/repos/{repo}/pulls/{pr_number}")
         logger.tool_response("get_pr_details", "success", 0.1)
-        return mock_pr
+        return {"status": "success", **PRDetails.from_api(repo, pr).to_dict()}
+
+    # Mock implementation
+    mock_pr = replace(
+        _MOCK_PR, pr_number=pr_number, repo=repo, title=f"Sample PR #{pr_number}"
+    )
     
-    except Exception as e:
-        logger.error(f"Error getting PR details: {e}", error=e)
-        return {
-            "status": "error",
-            "error_message": f"Failed to get PR details: {str(e)}"
-        }
+    logger.tool_response("get_pr_details", "success", 0.1)
+    return {"status": "success", **mock_pr.to_dict()}
+
+
+async def get_prs_details(repo: str, pr_numbers: List[int]) -> Dict[str, Any]:
+    """
+    Get details about several pull requests concurrently.
+    
+    Args:
+        repo: Repository name in format "owner/repo"
+        pr_numbers: Pull request numbers
+        
+    Returns:
+        Dictionary with the list of PR details (in input order; failed
+        lookups keep their error entry) or error message
+    """
+    pull_requests = await asyncio.gather(
+        *[get_pr_details(repo, pr_number) for pr_number in pr_numbers]
+    )
+    return {"status": "success", "repo": repo, "pull_requests": list(pull_requests)}
 
 
-def get_pr_diff(repo: str, pr_number: int) -> Dict[str, Any]:
+@tool_errors(logger, "Failed to get PR diff")
+async def get_pr_diff(repo: str, pr_number: int) -> Dict[str, Any]:
     """
     Get the code diff for a pull request.
     
@@ -72,48 +202,142 @@ def get_pr_diff(repo: str, pr_number: int) -> Dict[str, Any]:
     """
     logger.tool_called("get_pr_diff", {"repo": repo, "pr_number": pr_number})
     
-    try:
-        # Mock implementation
-        mock_diff = {
+    if settings.GITHUB_LIVE_API:
+        files = await github_get(
+            f"/repos/{repo}/pulls/{pr_number}/files", {"per_page": 100}
+        )
+        logger.tool_response("get_pr_diff", "success", 0.2)
+        return {
             "status": "success",
             "files": [
                 {
-                    "filename": "src/app.py",
-                    "status": "modified",
-                    "additions": 50,
-                    "deletions": 20,
-                    "patch": """
-@@ -10,7 +10,7 @@ def authenticate(username, password):
--    query = f"SELECT * FROM users WHERE name = '{username}'"
-+    query = "SELECT * FROM users WHERE name = ?"
-+    cursor.execute(query, (username,))
-"""
-                },
-                {
-                    "filename": "src/auth.py",
-                    "status": "modified",
-                    "additions": 30,
-                    "deletions": 15,
-                    "patch": """
-@@ -5,7 +5,7 @@ import os
--API_KEY = "sk_live_12345"
-+API_KEY = os.getenv("API_KEY")
-"""
+                    "filename": f["filename"],
+                    "status": sys.intern(f["status"]),
+                    "additions": f["additions"],
+                    "deletions": f["deletions"],
+                    "patch": f.get("patch", "")
                 }
+                for f in files
             ]
         }
+
+    # Mock implementation
+    mock_diff = {
+        "status": "success",
+        "files": [dict(f) for f in _MOCK_DIFF_FILES]
+    }
+    
+    logger.tool_response("get_pr_diff", "success", 0.2)
+    return mock_diff
+
+
+def _split_hunks(patch: str) -> List[Dict[str, Any]]:
+    """Split a unified-diff patch into hunks with their new-file start line."""
+    headers = list(_HUNK_HEADER_RE.finditer(patch))
+    hunks = []
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(patch)
+        hunks.append({
+            "start_line": int(header.group(1)),
+            "patch": patch[header.start():end].rstrip("\n")
+        })
+    return hunks
+
+
+async def get_pr_diff_compact(
+    repo: str,
+    pr_number: int,
+    max_lines_per_file: int = 200,
+    skip_patterns: Optional[List[str]] = None,
+    security_only: bool = False
+) -> Dict[str, Any]:
+    """
+    Get a reduced code diff for a pull request.
+    
+    Lockfiles and generated or vendored files are dropped, diffs are split
+    into hunks, and each file is cut off after `max_lines_per_file` patch
+    lines. This keeps large PRs from flooding the reviewers' context.
+    
+    Args:
+        repo: Repository name in format "owner/repo"
+        pr_number: Pull request number
+        max_lines_per_file: Maximum patch lines kept per file
+        skip_patterns: Glob patterns of files to drop
+            (defaults to DEFAULT_DIFF_SKIP_PATTERNS)
+        security_only: Keep only hunks that touch security-relevant code
+            (credentials, exec/eval, SQL, ...)
         
-        logger.tool_response("get_pr_diff", "success", 0.2)
-        return mock_diff
+    Returns:
+        Dictionary with per-file hunks or error message
+    """
+    logger.tool_called(
+        "get_pr_diff_compact",
+        {"repo": repo, "pr_number": pr_number, "security_only": security_only}
+    )
     
-    except Exception as e:
-        logger.error(f"Error getting PR diff: {e}", error=e)
-        return {
-            "status": "error",
-            "error_message": f"Failed to get PR diff: {str(e)}"
-        }
+    diff = await get_pr_diff(repo, pr_number)
+    if diff["status"] != "success":
+        return diff
+    
+    patterns = DEFAULT_DIFF_SKIP_PATTERNS if skip_patterns is None else skip_patterns
+    files = []
+    skipped = []
+    for f in diff["files"]:
+        filename = f["filename"]
+        if any(fnmatch(filename, pattern) for pattern in patterns):
+            skipped.append(filename)
+            continue
+        
+        hunks = _split_hunks(f.get("patch") or "")
+        if security_only:
+            hunks = [h for h in hunks if _SECURITY_RE.search(h["patch"])]
+            if not hunks:
+                continue
+        
+        kept = []
+        truncated = False
+        budget = max_lines_per_file
+        for hunk in hunks:
+            lines = hunk["patch"].split("\n")
+            if len(lines) > budget:
+                truncated = True
+                if budget > 1:
+                    kept.append({
+                        "start_line": hunk["start_line"],
+                        "patch": "\n".join(lines[:budget])
+                    })
+                break
+            kept.append(hunk)
+            budget -= len(lines)
+        
+        files.append({
+            "file": filename,
+            "status": f["status"],
+            "additions": f["additions"],
+            "deletions": f["deletions"],
+            "hunks": kept,
+            "truncated": truncated
+        })
+    
+    logger.tool_response("get_pr_diff_compact", "success", 0.1)
+    return {"status": "success", "files": files, "skipped_files": skipped}
 
 
+async def get_pr_security_diff(repo: str, pr_number: int) -> Dict[str, Any]:
+    """
+    Get only the security-relevant hunks of a pull request diff.
+    
+    Args:
+        repo: Repository name in format "owner/repo"
+        pr_number: Pull request number
+        
+    Returns:
+        Dictionary with per-file hunks or error message
+    """
+    return await get_pr_diff_compact(repo, pr_number, security_only=True)
+
+
+@tool_errors(logger, "Failed to add review comment")
 def add_review_comment(
     repo: str, 
     pr_number: int, 
@@ -134,6 +358,7 @@ def add_review_comment(
     Returns:
         Dictionary with success status or error message
     """
+    comment_type = _COMMENT_TYPES[bool(file_path)]
     logger.tool_called(
         "add_review_comment",
         {
@@ -144,33 +369,201 @@ def add_review_comment(
         }
     )
     
-    try:
-        # Mock implementation
-        result = {
+    batch = _current_batch.get()
+    if batch is not None and batch.matches(repo, pr_number):
+        batch.add(comment, file_path, line_number)
+        return {
             "status": "success",
-            "message": "Comment added successfully",
-            "comment_id": 12345,
-            "comment_type": "inline" if file_path else "general"
+            "message": "Comment queued for the pending review",
+            "queued": True,
+            "comment_type": comment_type
         }
+    
+    # Mock implementation
+    result = {
+        "status": "success",
+        "message": "Comment added successfully",
+        "comment_id": 12345,
+        "comment_type": comment_type
+    }
+    
+    invalidate_github_cache(f"/repos/{repo}/pulls/{pr_number}")
+    
+    logger.info(
+        "Review comment added to PR %s",
+        pr_number,
+        repo=repo,
+        comment_type=result["comment_type"]
+    )
+    logger.tool_response("add_review_comment", "success", 0.3)
+    
+    return result
+
+
+_ADD_REVIEW_MUTATION = """
+mutation($input: AddPullRequestReviewInput!) {
+  addPullRequestReview(input: $input) {
+    pullRequestReview { databaseId }
+  }
+}
+"""
+
+
+@tool_errors(logger, "Failed to add review comments")
+async def add_review_comments(
+    repo: str,
+    pr_number: int,
+    comments: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Add several review comments to a pull request as one review.
+    
+    Inline comments become review threads; general comments, and file
+    comments without a line number, are joined into the review body (a
+    thread needs a line inside the diff). Live, this is a single GraphQL
+    mutation instead of one REST call per comment.
+    
+    Args:
+        repo: Repository name in format "owner/repo"
+        pr_number: Pull request number
+        comments: Dicts with "comment" and optional "file_path" and
+            "line_number" keys, as taken by `add_review_comment`
         
-        logger.info(
-            f"Review comment added to PR {pr_number}",
-            repo=repo,
-            comment_type=result["comment_type"]
+    Returns:
+        Dictionary with success status or error message
+    """
+    logger.tool_called(
+        "add_review_comments",
+        {"repo": repo, "pr_number": pr_number, "count": len(comments)}
+    )
+    
+    threads = []
+    general = []
+    for c in comments:
+        if c.get("file_path") and c.get("line_number"):
+            threads.append(
+                {"path": c["file_path"], "line": c["line_number"], "body": c["comment"]}
+            )
+        elif c.get("file_path"):
+            general.append(f"`{c['file_path']}`: {c['comment']}")
+        else:
+            general.append(c["comment"])
+    
+    if settings.GITHUB_LIVE_API:
+        pr = await github_get(f"/repos/{repo}/pulls/{pr_number}")
+        data = await github_graphql(_ADD_REVIEW_MUTATION, {
+            "input": {
+                "pullRequestId": pr["node_id"],
+                "event": "COMMENT",
+                "body": "\n\n".join(general),
+                "threads": threads
+            }
+        })
+        review_id = data["addPullRequestReview"]["pullRequestReview"]["databaseId"]
+    else:
+        # Mock implementation
+        review_id = 12345
+    
+    invalidate_github_cache(f"/repos/{repo}/pulls/{pr_number}")
+    
+    logger.info(
+        "Review with %d comments added to PR %s",
+        len(comments),
+        pr_number,
+        repo=repo,
+        inline=len(threads)
+    )
+    logger.tool_response("add_review_comments", "success", 0.3)
+    
+    return {
+        "status": "success",
+        "message": f"{len(comments)} comments added in one review",
+        "review_id": review_id,
+        "inline_comments": len(threads),
+        "general_comments": len(general)
+    }
+
+
+class ReviewCommentBatch:
+    """
+    Review comments queued for one pull request.
+    """
+    
+    def __init__(self, repo: str, pr_number: int):
+        """
+        Initialize an empty batch.
+        
+        Args:
+            repo: Repository name in format "owner/repo"
+            pr_number: Pull request number
+        """
+        self.repo = repo
+        self.pr_number = pr_number
+        self._buf: List[Dict[str, Any]] = []
+    
+    def __len__(self) -> int:
+        return len(self._buf)
+    
+    def matches(self, repo: str, pr_number: int) -> bool:
+        """Check whether comments for this PR belong in the batch."""
+        return repo == self.repo and pr_number == self.pr_number
+    
+    def add(
+        self,
+        comment: str,
+        file_path: Optional[str] = None,
+        line_number: Optional[int] = None
+    ) -> None:
+        """Queue one comment."""
+        self._buf.append(
+            {"comment": comment, "file_path": file_path, "line_number": line_number}
         )
-        logger.tool_response("add_review_comment", "success", 0.3)
+    
+    async def flush(self) -> Optional[Dict[str, Any]]:
+        """
+        Post the queued comments as one review and empty the batch.
         
-        return result
+        Returns:
+            `add_review_comments` result, or None if nothing was queued
+        """
+        if not self._buf:
+            return None
+        comments, self._buf = self._buf, []
+        return await add_review_comments(self.repo, self.pr_number, comments)
+
+
+# Batch that add_review_comment queues into, if any
+_current_batch: contextvars.ContextVar[Optional[ReviewCommentBatch]] = contextvars.ContextVar(
+    "review_comment_batch", default=None
+)
+
+
+@asynccontextmanager
+async def review_batch(repo: str, pr_number: int) -> AsyncIterator[ReviewCommentBatch]:
+    """
+    Queue `add_review_comment` calls for one PR and post them together.
     
-    except Exception as e:
-        logger.error(f"Error adding review comment: {e}", error=e)
-        return {
-            "status": "error",
-            "error_message": f"Failed to add review comment: {str(e)}"
-        }
+    The comments are flushed on normal exit only; if the block raises,
+    they are dropped with it.
+    
+    Args:
+        repo: Repository name in format "owner/repo"
+        pr_number: Pull request number
+        
+    Yields:
+        The active ReviewCommentBatch
+    """
+    batch = ReviewCommentBatch(repo, pr_number)
+    token = _current_batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _current_batch.reset(token)
+    await batch.flush()
 
 
-def get_issue_details(repo: str, issue_number: int) -> Dict[str, Any]:
+@tool_errors(logger, "Failed to get issue details")
+async def get_issue_details(repo: str, issue_number: int) -> Dict[str, Any]:
     """
     Get details about a GitHub issue.
     
@@ -183,33 +576,56 @@ def get_issue_details(repo: str, issue_number: int) -> Dict[str, Any]:
     """
     logger.tool_called("get_issue_details", {"repo": repo, "issue_number": issue_number})
     
-    try:
-        # Mock implementation
-        mock_issue = {
-            "status": "success",
-            "issue_number": issue_number,
-            "repo": repo,
-            "title": f"Issue #{issue_number}: Sample bug",
-            "author": "user456",
-            "state": "open",
-            "labels": [],
-            "description": "The application crashes when clicking submit button.",
-            "created_at": "2025-01-14T09:00:00Z",
-            "updated_at": "2025-01-14T09:00:00Z",
-            "comments": 0
-        }
-        
+    if settings.GITHUB_LIVE_API:
+        issue = await github_get(f"/repos/{repo}/issues/{issue_number}")
         logger.tool_response("get_issue_details", "success", 0.1)
-        return mock_issue
+        return {"status": "success", **IssueDetails.from_api(repo, issue).to_dict()}
+
+    # Mock implementation
+    mock_issue = _mock_issue(repo, issue_number)
     
-    except Exception as e:
-        logger.error(f"Error getting issue details: {e}", error=e)
-        return {
-            "status": "error",
-            "error_message": f"Failed to get issue details: {str(e)}"
-        }
+    logger.tool_response("get_issue_details", "success", 0.1)
+    return {"status": "success", **mock_issue.to_dict()}
+
+
+@tool_errors(logger, "Failed to get issue details")
+async def get_issues_details(repo: str, issue_numbers: List[int]) -> Dict[str, Any]:
+    """
+    Get details about several GitHub issues at once.
+    
+    Live lookups run concurrently over the shared connection pool; the
+    mock answers the whole batch in one step.
+    
+    Args:
+        repo: Repository name in format "owner/repo"
+        issue_numbers: Issue numbers
+        
+    Returns:
+        Dictionary with the list of issue details or error message
+    """
+    logger.tool_called("get_issues_details", {"repo": repo, "count": len(issue_numbers)})
+    
+    if settings.GITHUB_LIVE_API:
+        issues = await asyncio.gather(
+            *[get_issue_details(repo, issue_number) for issue_number in issue_numbers]
+        )
+        failed = next((i for i in issues if i.get("status") != "success"), None)
+        if failed is not None:
+            return failed
+        logger.tool_response("get_issues_details", "success", 0.1)
+        return {"status": "success", "repo": repo, "issues": list(issues)}
 
+    # Mock implementation
+    issues = [
+        _mock_issue(repo, issue_number).to_dict()
+        for issue_number in issue_numbers
+    ]
+    
+    logger.tool_response("get_issues_details", "success", 0.1)
+    return {"status": "success", "repo": repo, "issues": issues}
 
+
+@tool_errors(logger, "Failed to update issue labels")
 def update_issue_labels(
     repo: str, 
     issue_number: int, 
@@ -231,33 +647,29 @@ def update_issue_labels(
         {"repo": repo, "issue_number": issue_number, "labels": labels}
     )
     
-    try:
-        # Mock implementation
-        result = {
-            "status": "success",
-            "message": f"Labels updated successfully: {', '.join(labels)}",
-            "issue_number": issue_number,
-            "labels_applied": labels
-        }
-        
-        logger.info(
-            f"Labels updated for issue {issue_number}",
-            repo=repo,
-            labels=labels
-        )
-        logger.tool_response("update_issue_labels", "success", 0.2)
-        
-        return result
+    # Mock implementation
+    result = {
+        "status": "success",
+        "message": f"Labels updated successfully: {', '.join(labels)}",
+        "issue_number": issue_number,
+        "labels_applied": labels
+    }
     
-    except Exception as e:
-        logger.error(f"Error updating issue labels: {e}", error=e)
-        return {
-            "status": "error",
-            "error_message": f"Failed to update issue labels: {str(e)}"
-        }
+    invalidate_github_cache(f"/repos/{repo}/issues/{issue_number}")
+    
+    logger.info(
+        "Labels updated for issue %s",
+        issue_number,
+        repo=repo,
+        labels=labels
+    )
+    logger.tool_response("update_issue_labels", "success", 0.2)
+    
+    return result
 
 
-def get_repository_info(repo: str) -> Dict[str, Any]:
+@tool_errors(logger, "Failed to get repository info")
+async def get_repository_info(repo: str) -> Dict[str, Any]:
     """
     Get general information about a repository.
     
@@ -269,60 +681,60 @@ def get_repository_info(repo: str) -> Dict[str, Any]:
     """
     logger.tool_called("get_repository_info", {"repo": repo})
     
-    try:
-        # Mock implementation
-        mock_repo = {
-            "status": "success",
-            "repo": repo,
-            "name": repo.split("/")[-1],
-            "owner": repo.split("/")[0],
-            "description": "A sample repository for testing",
-            "language": "Python",
-            "stars": 42,
-            "forks": 10,
-            "open_issues": 5,
-            "open_prs": 3,
-            "default_branch": "main",
-            "topics": ["python", "api", "testing"]
-        }
-        
+    if settings.GITHUB_LIVE_API:
+        info = await github_get(f"/repos/{repo}")
         logger.tool_response("get_repository_info", "success", 0.1)
-        return mock_repo
+        return {"status": "success", **RepoInfo.from_api(repo, info).to_dict()}
+
+    # Mock implementation
+    owner, _, name = repo.partition("/")
+    mock_repo = replace(_MOCK_REPO, repo=repo, name=name or owner, owner=owner)
     
-    except Exception as e:
-        logger.error(f"Error getting repository info: {e}", error=e)
-        return {
-            "status": "error",
-            "error_message": f"Failed to get repository info: {str(e)}"
-        }
+    logger.tool_response("get_repository_info", "success", 0.1)
+    return {"status": "success", **mock_repo.to_dict()}
 
 
 # Tool definitions for agent use
-CUSTOM_GITHUB_TOOLS = [
+CUSTOM_GITHUB_TOOLS = (
     get_pr_details,
     get_pr_diff,
+    get_pr_diff_compact,
     add_review_comment,
+    add_review_comments,
     get_issue_details,
     update_issue_labels,
     get_repository_info
-]
+)
+
+# Name -> tool, for dispatching a function call by name
+CUSTOM_GITHUB_TOOLS_BY_NAME = MappingProxyType(
+    {tool.__name__: tool for tool in CUSTOM_GITHUB_TOOLS}
+)
+
+
+async def _main():
+    """Self-test: fetch a PR and an issue, then update labels."""
+    try:
+        # Test PR details
+        pr = await get_pr_details("RamaswamyGCP/KaggleAgentTestRepo", 1)
+        print(f"PR Details: {pr['title']}")
+        
+        # Test issue details
+        issue = await get_issue_details("RamaswamyGCP/KaggleAgentTestRepo", 1)
+        print(f"Issue Details: {issue['title']}")
+        
+        # Test label update
+        result = update_issue_labels("RamaswamyGCP/KaggleAgentTestRepo", 1, ["bug", "urgent"])
+        print(f"Label Update: {result['message']}")
+    finally:
+        await close_github_http()
 
 
 if __name__ == "__main__":
     # Test the tools
     print("Testing custom GitHub tools...\n")
     
-    # Test PR details
-    pr = get_pr_details("RamaswamyGCP/KaggleAgentTestRepo", 1)
-    print(f"PR Details: {pr['title']}")
-    
-    # Test issue details
-    issue = get_issue_details("RamaswamyGCP/KaggleAgentTestRepo", 1)
-    print(f"Issue Details: {issue['title']}")
-    
-    # Test label update
-    result = update_issue_labels("RamaswamyGCP/KaggleAgentTestRepo", 1, ["bug", "urgent"])
-    print(f"Label Update: {result['message']}")
+    # One event loop for all tests: the shared GitHub client belongs to it
+    asyncio.run(_main())
     
     print("\n✅ All tools tested successfully!")
-
@@ -8,20 +8,82 @@ implementations that simulate MCP behavior.
 In production, this would use:
 - McpToolset from google.adk.tools.mcp_tool.mcp_toolset
 - StdioConnectionParams for connecting to actual GitHub MCP server
+
+The file and search methods are async. With GITHUB_LIVE_API set they go
+to the GitHub REST API over the shared pooled client in
+tools/_github_http.py; `get_files_contents` fetches several files
+concurrently so a review touching N files waits for one round trip, not N.
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import base64
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
+
+from config.settings import get_settings
 from observability.logger import get_logger
+from tools._errors import tool_errors
+from tools._github_http import github_get
+from tools.schemas import SecurityFinding
 
+settings = get_settings()
 logger = get_logger("GitHubMCP")
 
 
+# Mock responses, built once; each call copies them into a fresh result
+_MCP_TOOLS = (
+    "search_repositories",
+    "get_file_contents",
+    "create_or_update_file",
+    "push_files",
+    "create_issue",
+    "create_pull_request",
+)
+
+_MOCK_SEARCH_HIT = MappingProxyType({
+    "file": "src/app.py",
+    "line": 23,
+    "code": "query = f\"SELECT * FROM users WHERE name = '{username}'\"",
+    "match_type": "SQL injection vulnerability"
+})
+
+_MOCK_FILE_CONTENT = """
+def authenticate(username, password):
+    # SQL Injection vulnerability here!
+    query = f"SELECT * FROM users WHERE name = '{username}'"
+    cursor.execute(query)
+    return cursor.fetchone()
+"""
+
+_MOCK_VULNERABILITIES = (
+    SecurityFinding(
+        severity="critical",
+        type="SQL Injection",
+        line=23,
+        description="User input directly interpolated into SQL query",
+        recommendation="Use parameterized queries"
+    ),
+    SecurityFinding(
+        severity="high",
+        type="Hardcoded Credentials",
+        line=10,
+        description="API key hardcoded in source",
+        recommendation="Use environment variables"
+    ),
+)
+
+
 class GitHubMCPClient:
     """
     Client for interacting with GitHub via MCP protocol.
     
     This is a simplified implementation for demonstration purposes.
     In production, this would connect to an actual GitHub MCP server.
+    
+    Can be used as an async context manager (`async with client:`), which
+    connects on entry. The HTTP pool is shared process-wide and is closed
+    by `close_github_http`, not by the client.
     """
     
     def __init__(self, github_token: Optional[str] = None):
@@ -33,53 +95,58 @@ class GitHubMCPClient:
         """
         self.github_token = github_token
         self.connected = False
+        self._tools: Tuple[str, ...] = ()
         logger.info("GitHub MCP client initialized")
     
+    async def __aenter__(self) -> "GitHubMCPClient":
+        self.connect()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+    
+    @tool_errors(logger, "Connection failed")
     def connect(self) -> Dict[str, Any]:
         """
         Connect to GitHub MCP server.
         
+        Calling it again once connected is a no-op.
+        
         Returns:
             Connection status
         """
-        logger.info("Connecting to GitHub MCP server...")
-        
-        try:
-            # Mock connection - in production this would:
-            # mcptoolset = McpToolset(
-            #     connection_params=StdioConnectionParams(
-            #         server_params=StdioServerParameters(
-            #             command="npx",
-            #             args=["-y", "@modelcontextprotocol/server-github"],
-            #             env={"GITHUB_TOKEN": self.github_token}
-            #         )
-            #     )
-            # )
-            
-            self.connected = True
-            logger.info("✅ Connected to GitHub MCP server")
-            
+        if self.connected:
             return {
                 "status": "success",
-                "message": "Connected to GitHub MCP server",
-                "tools_available": [
-                    "search_repositories",
-                    "get_file_contents",
-                    "create_or_update_file",
-                    "push_files",
-                    "create_issue",
-                    "create_pull_request"
-                ]
+                "message": "Already connected to GitHub MCP server",
+                "tools_available": list(self._tools)
             }
         
-        except Exception as e:
-            logger.error(f"Failed to connect to GitHub MCP: {e}", error=e)
-            return {
-                "status": "error",
-                "error_message": f"Connection failed: {str(e)}"
-            }
+        logger.info("Connecting to GitHub MCP server...")
+        
+        # Mock connection - in production this would:
+        # mcptoolset = McpToolset(
+        #     connection_params=StdioConnectionParams(
+        #         server_params=StdioServerParameters(
+        #             command="npx",
+        #             args=["-y", "@modelcontextprotocol/server-github"],
+        #             env={"GITHUB_TOKEN": self.github_token}
+        #         )
+        #     )
+        # )
+        
+        self._tools = _MCP_TOOLS
+        self.connected = True
+        logger.info("✅ Connected to GitHub MCP server")
+        
+        return {
+            "status": "success",
+            "message": "Connected to GitHub MCP server",
+            "tools_available": list(self._tools)
+        }
     
-    def search_code(self, repo: str, query: str) -> Dict[str, Any]:
+    @tool_errors(logger, "Search failed")
+    async def search_code(self, repo: str, query: str) -> Dict[str, Any]:
         """
         Search code in a repository.
         
@@ -92,33 +159,35 @@ class GitHubMCPClient:
         """
         logger.tool_called("github_mcp.search_code", {"repo": repo, "query": query})
         
-        try:
-            # Mock implementation
-            results = {
+        if settings.GITHUB_LIVE_API:
+            found = await github_get(
+                "/search/code",
+                {"q": f"{query} repo:{repo}", "per_page": 30}
+            )
+            logger.tool_response("github_mcp.search_code", "success", 0.5)
+            return {
                 "status": "success",
                 "query": query,
                 "repo": repo,
                 "results": [
-                    {
-                        "file": "src/app.py",
-                        "line": 23,
-                        "code": "query = f\"SELECT * FROM users WHERE name = '{username}'\"",
-                        "match_type": "SQL injection vulnerability"
-                    }
+                    {"file": item["path"], "url": item["html_url"]}
+                    for item in found.get("items", [])
                 ]
             }
-            
-            logger.tool_response("github_mcp.search_code", "success", 0.5)
-            return results
+
+        # Mock implementation
+        results = {
+            "status": "success",
+            "query": query,
+            "repo": repo,
+            "results": [dict(_MOCK_SEARCH_HIT)]
+        }
         
-        except Exception as e:
-            logger.error(f"Error searching code: {e}", error=e)
-            return {
-                "status": "error",
-                "error_message": f"Search failed: {str(e)}"
-            }
+        logger.tool_response("github_mcp.search_code", "success", 0.5)
+        return results
     
-    def get_file_contents(self, repo: str, file_path: str) -> Dict[str, Any]:
+    @tool_errors(logger, "Failed to get file")
+    async def get_file_contents(self, repo: str, file_path: str) -> Dict[str, Any]:
         """
         Get contents of a file from repository.
         
@@ -134,34 +203,52 @@ class GitHubMCPClient:
             {"repo": repo, "file_path": file_path}
         )
         
-        try:
-            # Mock implementation
-            mock_contents = {
+        if settings.GITHUB_LIVE_API:
+            item = await github_get(f"/repos/{repo}/contents/{file_path}")
+            content = item.get("content", "")
+            if item.get("encoding") == "base64":
+                content = base64.b64decode(content).decode("utf-8", errors="replace")
+            logger.tool_response("github_mcp.get_file_contents", "success", 0.3)
+            return {
                 "status": "success",
                 "repo": repo,
                 "path": file_path,
-                "content": """
-def authenticate(username, password):
-    # SQL Injection vulnerability here!
-    query = f"SELECT * FROM users WHERE name = '{username}'"
-    cursor.execute(query)
-    return cursor.fetchone()
-""",
+                "content": content,
                 "encoding": "utf-8",
-                "size": 250
+                "size": item.get("size", len(content))
             }
-            
-            logger.tool_response("github_mcp.get_file_contents", "success", 0.3)
-            return mock_contents
+
+        # Mock implementation
+        mock_contents = {
+            "status": "success",
+            "repo": repo,
+            "path": file_path,
+            "content": _MOCK_FILE_CONTENT,
+            "encoding": "utf-8",
+            "size": 250
+        }
         
-        except Exception as e:
-            logger.error(f"Error getting file contents: {e}", error=e)
-            return {
-                "status": "error",
-                "error_message": f"Failed to get file: {str(e)}"
-            }
+        logger.tool_response("github_mcp.get_file_contents", "success", 0.3)
+        return mock_contents
     
-    def analyze_security(self, repo: str, file_path: str) -> Dict[str, Any]:
+    async def get_files_contents(self, repo: str, file_paths: List[str]) -> Dict[str, Any]:
+        """
+        Get contents of several files concurrently.
+        
+        Args:
+            repo: Repository name
+            file_paths: Paths to files
+            
+        Returns:
+            Dictionary with one `get_file_contents` result per path, in order
+        """
+        files = await asyncio.gather(
+            *[self.get_file_contents(repo, file_path) for file_path in file_paths]
+        )
+        return {"status": "success", "repo": repo, "files": list(files)}
+    
+    @tool_errors(logger, "Security analysis failed")
+    async def analyze_security(self, repo: str, file_path: str) -> Dict[str, Any]:
         """
         Analyze file for security vulnerabilities.
         
@@ -177,48 +264,28 @@ def authenticate(username, password):
             {"repo": repo, "file_path": file_path}
         )
         
-        try:
-            # Mock security analysis
-            analysis = {
-                "status": "success",
-                "file": file_path,
-                "vulnerabilities": [
-                    {
-                        "severity": "critical",
-                        "type": "SQL Injection",
-                        "line": 23,
-                        "description": "User input directly interpolated into SQL query",
-                        "recommendation": "Use parameterized queries"
-                    },
-                    {
-                        "severity": "high",
-                        "type": "Hardcoded Credentials",
-                        "line": 10,
-                        "description": "API key hardcoded in source",
-                        "recommendation": "Use environment variables"
-                    }
-                ],
-                "security_score": 35
-            }
-            
-            logger.info(
-                f"Security analysis complete: {len(analysis['vulnerabilities'])} issues found",
-                file=file_path
-            )
-            logger.tool_response("github_mcp.analyze_security", "success", 0.8)
-            
-            return analysis
+        # Mock security analysis
+        vulnerabilities = [v.to_dict() for v in _MOCK_VULNERABILITIES]
+        analysis = {
+            "status": "success",
+            "file": file_path,
+            "vulnerabilities": vulnerabilities,
+            "security_score": 35
+        }
         
-        except Exception as e:
-            logger.error(f"Error analyzing security: {e}", error=e)
-            return {
-                "status": "error",
-                "error_message": f"Security analysis failed: {str(e)}"
-            }
+        logger.info(
+            "Security analysis complete",
+            file=file_path,
+            issues_found=len(vulnerabilities)
+        )
+        logger.tool_response("github_mcp.analyze_security", "success", 0.8)
+        
+        return analysis
 
 
-# Global instance
+# Global instance; the lock makes sure only one thread connects it
 _github_mcp_client = None
+_github_mcp_client_lock = threading.Lock()
 
 
 def get_github_mcp_client(github_token: Optional[str] = None) -> GitHubMCPClient:
@@ -234,16 +301,16 @@ def get_github_mcp_client(github_token: Optional[str] = None) -> GitHubMCPClient
     global _github_mcp_client
     
     if _github_mcp_client is None:
-        _github_mcp_client = GitHubMCPClient(github_token)
-        _github_mcp_client.connect()
+        with _github_mcp_client_lock:
+            if _github_mcp_client is None:
+                client = GitHubMCPClient(github_token)
+                client.connect()
+                _github_mcp_client = client
     
     return _github_mcp_client
 
 
-if __name__ == "__main__":
-    # Test GitHub MCP
-    print("Testing GitHub MCP integration...\n")
-    
+async def _main() -> None:
     client = get_github_mcp_client()
     
     # Test connection
@@ -251,15 +318,21 @@ if __name__ == "__main__":
     print(f"Connection: {conn_result['message']}")
     
     # Test code search
-    search_result = client.search_code("RamaswamyGCP/KaggleAgentTestRepo", "SQL")
+    search_result = await client.search_code("RamaswamyGCP/KaggleAgentTestRepo", "SQL")
     print(f"Search: Found {len(search_result.get('results', []))} results")
     
     # Test security analysis
-    security_result = client.analyze_security(
+    security_result = await client.analyze_security(
         "RamaswamyGCP/KaggleAgentTestRepo",
         "src/app.py"
     )
     print(f"Security: {len(security_result.get('vulnerabilities', []))} issues found")
+
+
+if __name__ == "__main__":
+    # Test GitHub MCP
+    print("Testing GitHub MCP integration...\n")
+    
+    asyncio.run(_main())
     
     print("\n✅ GitHub MCP test complete!")
-
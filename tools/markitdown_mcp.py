@@ -8,14 +8,230 @@ to learn from PDF documentation.
 In production, this would use:
 - McpToolset from google.adk.tools.mcp_tool.mcp_toolset
 - Connection to actual Markitdown MCP server
+
+Conversion splits the markdown into sections once; key information
+extraction walks those sections in a single pass, dispatching each one on
+its heading. Document Q&A matches all known keywords in one pass over the
+question: with Hyperscan (python-hyperscan) installed the keywords are
+compiled into a single multi-pattern database, otherwise into one
+alternation regex. The answer is then looked up in a keyword -> section
+index built once per document.
 """
 
-from typing import Dict, Any, Optional
-from pathlib import Path
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
 from observability.logger import get_logger
 
+try:
+    import hyperscan
+except ImportError:  # optional dependency
+    hyperscan = None
+
 logger = get_logger("MarkitdownMCP")
 
+# (heading, body) pairs, in document order
+Section = Tuple[str, str]
+
+_HEADING_RE = re.compile(r"^#{1,2} +(.+?) *$", re.MULTILINE)
+_SUBHEADING_RE = re.compile(r"^### +(.+?) *$", re.MULTILINE)
+# "- item" or "1. item"; "**Label**: text" items carry a label
+_LIST_ITEM_RE = re.compile(r"^(?:[-*]|\d+\.) +(.+?) *$", re.MULTILINE)
+_LABELLED_RE = re.compile(r"^\*\*(.+?)\*\*:? *(.*)$")
+
+
+def _split(text: str, heading_re: "re.Pattern[str]") -> Tuple[Section, ...]:
+    sections = []
+    heading, start = "", 0
+    for match in heading_re.finditer(text):
+        body = text[start:match.start()].strip()
+        if heading or body:
+            sections.append((heading, body))
+        heading, start = match.group(1), match.end()
+    body = text[start:].strip()
+    if heading or body:
+        sections.append((heading, body))
+    return tuple(sections)
+
+
+def split_sections(markdown_content: str) -> Tuple[Section, ...]:
+    """
+    Split markdown into its top-level (# and ##) sections in one pass.
+    
+    Args:
+        markdown_content: Markdown text content
+        
+    Returns:
+        Tuple of (heading, body) pairs; text before the first heading is
+        returned under an empty heading
+    """
+    return _split(markdown_content, _HEADING_RE)
+
+
+def _list_items(body: str) -> List[Tuple[str, str]]:
+    """(label, text) of each list item; label is "" for unlabelled items."""
+    items = []
+    for item in _LIST_ITEM_RE.findall(body):
+        labelled = _LABELLED_RE.match(item)
+        items.append(labelled.groups() if labelled else ("", item))
+    return items
+
+
+def _extract_technologies(body: str, key_info: Dict[str, Any]) -> None:
+    for heading, sub_body in _split(body, _SUBHEADING_RE):
+        labels = [label for label, _ in _list_items(sub_body) if label]
+        if heading.lower().startswith("why ") and labels:
+            key_info["key_decisions"].append({
+                "topic": heading,
+                "decision": heading[4:].rstrip("?"),
+                "reasons": labels
+            })
+            continue
+        for label, text in _list_items(sub_body):
+            if label and text:
+                key_info["technologies"][label.lower()] = text
+
+
+def _extract_security(body: str, key_info: Dict[str, Any]) -> None:
+    for label, text in _list_items(body):
+        key_info["security_guidelines"].append(f"{label}: {text}" if label else text)
+
+
+# Heading keyword -> handler filling the key information from the section body
+_SECTION_HANDLERS: Dict[str, Callable[[str, Dict[str, Any]], None]] = {
+    "technolog": _extract_technologies,
+    "security": _extract_security,
+}
+
+
+# Mock conversion output
+_MOCK_MARKDOWN = """
+# System Architecture Documentation
+
+## Overview
+
+This document describes the architecture decisions for the TaskFlow application.
+
+## Technology Stack
+
+### Backend
+- **Language**: Python 3.9+
+- **Framework**: Flask 2.0
+- **Database**: PostgreSQL 12+
+
+### Why PostgreSQL?
+
+We chose PostgreSQL for the following reasons:
+
+1. **ACID Compliance**: Full transaction support for data integrity
+2. **JSON Support**: Native JSONB type for flexible schema
+3. **Performance**: Excellent query optimization
+4. **Reliability**: Proven track record in production environments
+
+## Security Considerations
+
+### Authentication
+- Use JWT tokens for stateless authentication
+- Token expiration: 24 hours
+- Refresh token mechanism for extended sessions
+
+### Data Protection
+- All passwords hashed with bcrypt
+- API keys stored in environment variables
+- No secrets in source code
+
+## API Design
+
+### RESTful Endpoints
+
+```
+GET    /api/tasks          - List all tasks
+POST   /api/tasks          - Create new task
+GET    /api/tasks/:id      - Get task details
+PUT    /api/tasks/:id      - Update task
+DELETE /api/tasks/:id      - Delete task
+```
+
+## Future Enhancements
+
+1. Add GraphQL API
+2. Implement caching with Redis
+3. Add full-text search with Elasticsearch
+"""
+
+_MOCK_SECTIONS = split_sections(_MOCK_MARKDOWN)
+
+_MARKITDOWN_TOOLS = ("convert_pdf", "convert_docx", "convert_pptx", "convert_xlsx")
+
+# Mock Q&A answers, checked in this order
+_ANSWERS_MAP = {
+    "why postgresql": "PostgreSQL was chosen for ACID compliance, native JSON support, excellent performance, and proven reliability in production environments.",
+    "authentication": "The system uses JWT tokens for stateless authentication with 24-hour expiration and refresh token mechanism for extended sessions.",
+    "security": "Security measures include bcrypt password hashing, environment variables for API keys, and a strict policy of no secrets in source code.",
+    "api design": "The API follows RESTful principles with standard CRUD endpoints: GET/POST for collections, GET/PUT/DELETE for individual resources."
+}
+_ANSWER_KEYWORDS = tuple(_ANSWERS_MAP)
+_ANSWER_RANK = {keyword: rank for rank, keyword in enumerate(_ANSWER_KEYWORDS)}
+
+# All keywords in one pattern, so a question is scanned once
+_ANSWERS_RE = re.compile("|".join(map(re.escape, _ANSWER_KEYWORDS)), re.IGNORECASE)
+
+
+def _compile_answer_db() -> Optional[Any]:
+    """Compile the keywords into a Hyperscan database (None without Hyperscan)."""
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(k).encode("utf-8") for k in _ANSWER_KEYWORDS],
+        ids=list(range(len(_ANSWER_KEYWORDS))),
+        elements=len(_ANSWER_KEYWORDS),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_ANSWER_KEYWORDS)
+    )
+    return db
+
+
+_ANSWERS_DB = _compile_answer_db()
+
+
+def _match_answer_keywords(question: str) -> List[str]:
+    """
+    Find the keywords occurring in a question.
+    
+    Args:
+        question: Question text
+        
+    Returns:
+        Matching `_ANSWERS_MAP` keys, highest-ranked first
+    """
+    if _ANSWERS_DB is not None:
+        hits: List[int] = []
+        _ANSWERS_DB.scan(
+            question.encode("utf-8"),
+            match_event_handler=lambda id, start, end, flags, context: hits.append(id)
+        )
+        return [_ANSWER_KEYWORDS[i] for i in sorted(set(hits))]
+    
+    matches = {m.lower() for m in _ANSWERS_RE.findall(question)}
+    return sorted(matches, key=_ANSWER_RANK.__getitem__)
+
+
+@lru_cache(maxsize=8)
+def _index_sections(sections: Tuple[Section, ...]) -> Dict[str, str]:
+    """
+    Map each keyword to the heading of the first section mentioning it.
+    
+    Cached per document, so repeated questions only pay for the dict
+    lookup (the section strings cache their hashes).
+    """
+    index: Dict[str, str] = {}
+    for heading, body in sections:
+        for match in _ANSWERS_RE.finditer(f"{heading}\n{body}"):
+            index.setdefault(match.group(0).lower(), heading)
+    return index
+
 
 class MarkitdownMCPClient:
     """
@@ -28,15 +244,25 @@ class MarkitdownMCPClient:
     def __init__(self):
         """Initialize Markitdown MCP client."""
         self.connected = False
+        self._tools: Tuple[str, ...] = ()
         logger.info("Markitdown MCP client initialized")
     
     def connect(self) -> Dict[str, Any]:
         """
         Connect to Markitdown MCP server.
         
+        Calling it again once connected is a no-op.
+        
         Returns:
             Connection status
         """
+        if self.connected:
+            return {
+                "status": "success",
+                "message": "Already connected to Markitdown MCP server",
+                "tools_available": list(self._tools)
+            }
+        
         logger.info("Connecting to Markitdown MCP server...")
         
         try:
@@ -50,18 +276,14 @@ class MarkitdownMCPClient:
             #     )
             # )
             
+            self._tools = _MARKITDOWN_TOOLS
             self.connected = True
             logger.info("✅ Connected to Markitdown MCP server")
             
             return {
                 "status": "success",
                 "message": "Connected to Markitdown MCP server",
-                "tools_available": [
-                    "convert_pdf",
-                    "convert_docx",
-                    "convert_pptx",
-                    "convert_xlsx"
-                ]
+                "tools_available": list(self._tools)
             }
         
         except Exception as e:
@@ -93,65 +315,13 @@ class MarkitdownMCPClient:
         
         try:
             # Mock conversion - simulate PDF content extraction
-            mock_markdown = """
-# System Architecture Documentation
-
-## Overview
-
-This document describes the architecture decisions for the TaskFlow application.
-
-## Technology Stack
-
-### Backend
-- **Language**: Python 3.9+
-- **Framework**: Flask 2.0
-- **Database**: PostgreSQL 12+
-
-### Why PostgreSQL?
-
-We chose PostgreSQL for the following reasons:
-
-1. **ACID Compliance**: Full transaction support for data integrity
-2. **JSON Support**: Native JSONB type for flexible schema
-3. **Performance**: Excellent query optimization
-4. **Reliability**: Proven track record in production environments
-
-## Security Considerations
-
-### Authentication
-- Use JWT tokens for stateless authentication
-- Token expiration: 24 hours
-- Refresh token mechanism for extended sessions
-
-### Data Protection
-- All passwords hashed with bcrypt
-- API keys stored in environment variables
-- No secrets in source code
-
-## API Design
-
-### RESTful Endpoints
-
-```
-GET    /api/tasks          - List all tasks
-POST   /api/tasks          - Create new task
-GET    /api/tasks/:id      - Get task details
-PUT    /api/tasks/:id      - Update task
-DELETE /api/tasks/:id      - Delete task
-```
-
-## Future Enhancements
-
-1. Add GraphQL API
-2. Implement caching with Redis
-3. Add full-text search with Elasticsearch
-"""
-            
+            page_count = 5
             result = {
                 "status": "success",
                 "source_file": pdf_path,
-                "markdown_content": mock_markdown,
-                "page_count": 5,
+                "markdown_content": _MOCK_MARKDOWN,
+                "sections": _MOCK_SECTIONS,
+                "page_count": page_count,
                 "word_count": 250,
                 "conversion_time": 1.2
             }
@@ -161,8 +331,9 @@ DELETE /api/tasks/:id      - Delete task
                 # In production, write to file here
             
             logger.info(
-                f"PDF converted successfully: {Path(pdf_path).name}",
-                page_count=result["page_count"]
+                "PDF converted successfully",
+                file=os.path.basename(pdf_path),
+                page_count=page_count
             )
             logger.tool_response("markitdown_mcp.convert_pdf", "success", 1.2)
             
@@ -175,12 +346,18 @@ DELETE /api/tasks/:id      - Delete task
                 "error_message": f"Conversion failed: {str(e)}"
             }
     
-    def extract_key_information(self, markdown_content: str) -> Dict[str, Any]:
+    def extract_key_information(
+        self,
+        markdown_content: str,
+        sections: Optional[Sequence[Section]] = None
+    ) -> Dict[str, Any]:
         """
         Extract key information from converted markdown content.
         
         Args:
             markdown_content: Markdown text content
+            sections: The `sections` of a `convert_pdf_to_markdown` result;
+                when given, the content is not split again
             
         Returns:
             Extracted key information
@@ -191,51 +368,32 @@ DELETE /api/tasks/:id      - Delete task
         )
         
         try:
-            # Mock extraction - simulate information extraction
+            if sections is None:
+                sections = split_sections(markdown_content)
+            
             key_info = {
                 "status": "success",
-                "sections": [
-                    "System Architecture Documentation",
-                    "Technology Stack",
-                    "Security Considerations",
-                    "API Design"
-                ],
-                "technologies": {
-                    "backend": "Python 3.9+ with Flask 2.0",
-                    "database": "PostgreSQL 12+",
-                    "authentication": "JWT tokens"
-                },
-                "key_decisions": [
-                    {
-                        "topic": "Database Choice",
-                        "decision": "PostgreSQL",
-                        "reasons": [
-                            "ACID compliance",
-                            "JSON support",
-                            "Performance",
-                            "Reliability"
-                        ]
-                    },
-                    {
-                        "topic": "Authentication",
-                        "decision": "JWT tokens",
-                        "reasons": [
-                            "Stateless authentication",
-                            "24-hour token expiration",
-                            "Refresh token mechanism"
-                        ]
-                    }
-                ],
-                "security_guidelines": [
-                    "Passwords hashed with bcrypt",
-                    "API keys in environment variables",
-                    "No secrets in source code"
-                ]
+                "sections": [],
+                "technologies": {},
+                "key_decisions": [],
+                "security_guidelines": []
             }
             
+            # One pass over the sections, each dispatched on its heading
+            for heading, body in sections:
+                if not heading:
+                    continue
+                key_info["sections"].append(heading)
+                lowered = heading.lower()
+                for keyword, handler in _SECTION_HANDLERS.items():
+                    if keyword in lowered:
+                        handler(body, key_info)
+                        break
+            
             logger.info(
-                f"Extracted {len(key_info['key_decisions'])} key decisions",
-                sections=len(key_info['sections'])
+                "Extracted key information",
+                key_decisions=len(key_info["key_decisions"]),
+                sections=len(key_info["sections"])
             )
             logger.tool_response("markitdown_mcp.extract_key_info", "success", 0.5)
             
@@ -251,14 +409,20 @@ DELETE /api/tasks/:id      - Delete task
     def answer_question_from_document(
         self, 
         markdown_content: str,
-        question: str
+        question: str,
+        sections: Optional[Sequence[Section]] = None
     ) -> Dict[str, Any]:
         """
         Answer a question based on document content.
         
+        Only topics that some section of the document mentions are
+        answered; the result names that section.
+        
         Args:
             markdown_content: Document content in markdown
             question: Question to answer
+            sections: The `sections` of a `convert_pdf_to_markdown` result;
+                when given, the content is not split again
             
         Returns:
             Answer based on document content
@@ -272,31 +436,29 @@ DELETE /api/tasks/:id      - Delete task
             # Mock Q&A - simulate document-based question answering
             # In production, this would use LLM with document context
             
-            answers_map = {
-                "why postgresql": "PostgreSQL was chosen for ACID compliance, native JSON support, excellent performance, and proven reliability in production environments.",
-                "authentication": "The system uses JWT tokens for stateless authentication with 24-hour expiration and refresh token mechanism for extended sessions.",
-                "security": "Security measures include bcrypt password hashing, environment variables for API keys, and a strict policy of no secrets in source code.",
-                "api design": "The API follows RESTful principles with standard CRUD endpoints: GET/POST for collections, GET/PUT/DELETE for individual resources."
-            }
-            
-            # Simple keyword matching for demo
-            question_lower = question.lower()
-            answer = "Information not found in document."
+            if sections is None:
+                sections = split_sections(markdown_content)
+            index = _index_sections(tuple(sections))
             
-            for keyword, ans in answers_map.items():
-                if keyword in question_lower:
-                    answer = ans
-                    break
+            # Simple keyword matching for demo; earlier keywords win
+            keyword = next(
+                (k for k in _match_answer_keywords(question) if k in index), None
+            )
+            if keyword is not None:
+                answer = _ANSWERS_MAP[keyword]
+            else:
+                answer = "Information not found in document."
             
             result = {
                 "status": "success",
                 "question": question,
                 "answer": answer,
+                "section": index.get(keyword),
                 "confidence": 0.85
             }
             
             logger.info(
-                f"Question answered from document",
+                "Question answered from document",
                 question=question,
                 confidence=result["confidence"]
             )
@@ -314,6 +476,7 @@ DELETE /api/tasks/:id      - Delete task
 
 # Global instance
 _markitdown_client = None
+_markitdown_client_lock = threading.Lock()  # serializes the first connect()
 
 
 def get_markitdown_client() -> MarkitdownMCPClient:
@@ -326,8 +489,11 @@ def get_markitdown_client() -> MarkitdownMCPClient:
     global _markitdown_client
     
     if _markitdown_client is None:
-        _markitdown_client = MarkitdownMCPClient()
-        _markitdown_client.connect()
+        with _markitdown_client_lock:
+            if _markitdown_client is None:
+                client = MarkitdownMCPClient()
+                client.connect()
+                _markitdown_client = client
     
     return _markitdown_client
 
@@ -349,14 +515,16 @@ if __name__ == "__main__":
         
         # Test information extraction
         key_info = client.extract_key_information(
-            conversion_result["markdown_content"]
+            conversion_result["markdown_content"],
+            conversion_result["sections"]
         )
         print(f"Extraction: {len(key_info.get('key_decisions', []))} decisions found")
         
         # Test Q&A
         qa_result = client.answer_question_from_document(
             conversion_result["markdown_content"],
-            "Why was PostgreSQL chosen?"
+            "Why was PostgreSQL chosen?",
+            conversion_result["sections"]
         )
         print(f"Q&A: {qa_result['answer'][:80]}...")
     
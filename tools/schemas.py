@@ -0,0 +1,186 @@
+"""
+Typed records for GitHub tool results.
+
+The tools build these frozen records (from the REST API payload or from
+the mock constants) and convert them with `to_dict()` at the tool
+boundary, since ADK function tools hand plain JSON-able dicts to the
+model. Keeping the field mapping here means the live and mock paths of a
+tool cannot drift apart.
+
+Enum-like values decoded from the API (states, label names) are interned,
+so the many cached results repeating them share one string object, like
+the literals in the mock path already do.
+"""
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Tuple
+
+# Fixed-layout instances without a per-object __dict__ (Python 3.10+)
+_RECORD_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+class _Record:
+    """Mixin giving records a JSON-able `to_dict`."""
+
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record to a plain dict.
+
+        Returns:
+            Field dict, with tuple fields as lists
+        """
+        data = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, tuple):
+                value = [v.to_dict() if isinstance(v, _Record) else v for v in value]
+            data[f.name] = value
+        return data
+
+
+@dataclass(frozen=True, **_RECORD_OPTIONS)
+class PRDetails(_Record):
+    """Pull request summary returned by `get_pr_details`."""
+
+    pr_number: int
+    repo: str
+    title: str
+    author: str
+    state: str
+    files_changed: int
+    additions: int
+    deletions: int
+    commits: int
+    description: str
+    branch: str
+    base_branch: str
+    created_at: str
+    updated_at: str
+    head_sha: Optional[str] = None
+
+    @classmethod
+    def from_api(cls, repo: str, pr: Dict[str, Any]) -> "PRDetails":
+        """
+        Build from a REST `GET /repos/{repo}/pulls/{number}` payload.
+
+        Args:
+            repo: Repository name in format "owner/repo"
+            pr: Decoded API response
+
+        Returns:
+            PRDetails instance
+        """
+        return cls(
+            pr_number=pr["number"],
+            repo=repo,
+            title=pr["title"],
+            author=pr["user"]["login"],
+            state=sys.intern(pr["state"]),
+            files_changed=pr["changed_files"],
+            additions=pr["additions"],
+            deletions=pr["deletions"],
+            commits=pr["commits"],
+            description=pr.get("body") or "",
+            branch=pr["head"]["ref"],
+            base_branch=pr["base"]["ref"],
+            created_at=pr["created_at"],
+            updated_at=pr["updated_at"],
+            head_sha=pr["head"]["sha"]
+        )
+
+
+@dataclass(frozen=True, **_RECORD_OPTIONS)
+class IssueDetails(_Record):
+    """Issue summary returned by `get_issue_details`."""
+
+    issue_number: int
+    repo: str
+    title: str
+    author: str
+    state: str
+    labels: Tuple[str, ...]
+    description: str
+    created_at: str
+    updated_at: str
+    comments: int
+
+    @classmethod
+    def from_api(cls, repo: str, issue: Dict[str, Any]) -> "IssueDetails":
+        """
+        Build from a REST `GET /repos/{repo}/issues/{number}` payload.
+
+        Args:
+            repo: Repository name in format "owner/repo"
+            issue: Decoded API response
+
+        Returns:
+            IssueDetails instance
+        """
+        return cls(
+            issue_number=issue["number"],
+            repo=repo,
+            title=issue["title"],
+            author=issue["user"]["login"],
+            state=sys.intern(issue["state"]),
+            labels=tuple(sys.intern(label["name"]) for label in issue["labels"]),
+            description=issue.get("body") or "",
+            created_at=issue["created_at"],
+            updated_at=issue["updated_at"],
+            comments=issue["comments"]
+        )
+
+
+@dataclass(frozen=True, **_RECORD_OPTIONS)
+class RepoInfo(_Record):
+    """Repository metadata returned by `get_repository_info`."""
+
+    repo: str
+    name: str
+    owner: str
+    description: str
+    language: Optional[str]
+    stars: int
+    forks: int
+    open_issues: int
+    default_branch: str
+    topics: Tuple[str, ...]
+    open_prs: Optional[int] = None
+
+    @classmethod
+    def from_api(cls, repo: str, info: Dict[str, Any]) -> "RepoInfo":
+        """
+        Build from a REST `GET /repos/{repo}` payload.
+
+        Args:
+            repo: Repository name in format "owner/repo"
+            info: Decoded API response
+
+        Returns:
+            RepoInfo instance
+        """
+        return cls(
+            repo=repo,
+            name=info["name"],
+            owner=info["owner"]["login"],
+            description=info.get("description") or "",
+            language=info.get("language"),
+            stars=info["stargazers_count"],
+            forks=info["forks_count"],
+            open_issues=info["open_issues_count"],
+            default_branch=info["default_branch"],
+            topics=tuple(info.get("topics", ()))
+        )
+
+
+@dataclass(frozen=True, **_RECORD_OPTIONS)
+class SecurityFinding(_Record):
+    """One vulnerability reported by `analyze_security`."""
+
+    severity: str
+    type: str
+    line: int
+    description: str
+    recommendation: str